@@ -20,7 +20,13 @@ class AuditController {
         $sku = Sku::findOrFail($sku_id);
 
         // Queue the audit job in Python worker
-        $queueResult = $this->pythonClient->queueAudit($sku_id);
+        $queueResult = $this->pythonClient->queueAudit(
+            $sku_id,
+            $sku->tier ?? null,
+            null,
+            null,
+            PythonWorkerClient::auditContentDigest($sku->title, $sku->long_description)
+        );
 
         if (!($queueResult['queued'] ?? false)) {
             Log::warning("Failed to queue audit for SKU {$sku_id}", $queueResult);
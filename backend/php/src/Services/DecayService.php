@@ -102,6 +102,8 @@ class DecayService
                 'json' => [
                     'sku_id' => $sku->id,
                     'title'  => $sku->title ?? $sku->sku_code ?? 'SKU',
+                    'tier'   => $sku->tier ?? null,
+                    'decay_status' => 'auto_brief',
                 ],
             ]);
             $body = json_decode($response->getBody()->getContents(), true);
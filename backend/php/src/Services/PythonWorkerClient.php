@@ -66,13 +66,127 @@ class PythonWorkerClient
     }
 
     /**
-     * Queue an AI audit job
+     * Validate many SKUs against their cluster vectors in one call.
+     * $items: list of ['sku_id' => ..., 'description' => ..., 'cluster_id' => ...].
+     * Returns one result per item, in the same order.
      */
-    public function queueAudit(int $skuId): array
+    public function validateVectorBatch(array $items): array
     {
+        $fallback = function (string $reason) use ($items): array {
+            return array_map(fn ($item) => [
+                'sku_id' => $item['sku_id'] ?? 'unknown',
+                'valid' => false,
+                'similarity' => 0.0,
+                'reason' => $reason
+            ], $items);
+        };
+
+        try {
+            $response = $this->client->post('/validate-vector/batch', [
+                'json' => [
+                    'items' => array_map(fn ($item) => [
+                        'description' => $item['description'] ?? null,
+                        'cluster_id' => $item['cluster_id'] ?? null,
+                        'sku_id' => $item['sku_id'] ?? 'unknown',
+                    ], $items)
+                ]
+            ]);
+
+            if ($response->getStatusCode() >= 400) {
+                Log::warning("Python batch validation returned {$response->getStatusCode()}", [
+                    'body' => $response->getBody()->getContents()
+                ]);
+                return $fallback('Validation service error');
+            }
+
+            $data = json_decode($response->getBody()->getContents(), true);
+            return $data['results'] ?? $fallback('Invalid response');
+        } catch (RequestException $e) {
+            Log::error("Python batch validation request failed: {$e->getMessage()}", [
+                'count' => count($items)
+            ]);
+            return $fallback('Service unavailable');
+        }
+    }
+
+    /**
+     * Top-k most similar clusters for a description (shown to editors when G1/G4 fail)
+     */
+    public function nearestClusters(string $description, int $k = 5): array
+    {
+        try {
+            $response = $this->client->post('/api/v1/sku/nearest-clusters', [
+                'json' => [
+                    'description' => $description,
+                    'k' => $k,
+                ]
+            ]);
+
+            if ($response->getStatusCode() >= 400) {
+                Log::warning("Python nearest-clusters returned {$response->getStatusCode()}");
+                return ['clusters' => [], 'status' => 'error'];
+            }
+
+            return json_decode($response->getBody()->getContents(), true) ?? [
+                'clusters' => [],
+                'status' => 'error'
+            ];
+        } catch (RequestException $e) {
+            Log::error("Python nearest-clusters request failed: {$e->getMessage()}");
+            return ['clusters' => [], 'status' => 'error'];
+        }
+    }
+
+    /**
+     * Near-duplicate SKUs: stored pairs for a SKU, or a lookup by description
+     */
+    public function nearDuplicates(?string $skuId, string $description = '', int $k = 10): array
+    {
+        try {
+            $response = $this->client->post('/api/v1/sku/near-duplicates', [
+                'json' => [
+                    'sku_id' => $skuId,
+                    'description' => $description,
+                    'k' => $k,
+                ]
+            ]);
+
+            if ($response->getStatusCode() >= 400) {
+                Log::warning("Python near-duplicates returned {$response->getStatusCode()}");
+                return ['duplicates' => [], 'status' => 'error'];
+            }
+
+            return json_decode($response->getBody()->getContents(), true) ?? [
+                'duplicates' => [],
+                'status' => 'error'
+            ];
+        } catch (RequestException $e) {
+            Log::error("Python near-duplicates request failed: {$e->getMessage()}");
+            return ['duplicates' => [], 'status' => 'error'];
+        }
+    }
+
+    /**
+     * Queue an AI audit job (tier / category pick the worker's priority lane and fair-share group;
+     * $callbackUrl, if given, receives the finished job as a POST; $contentDigest keys deduplication,
+     * see auditContentDigest — the worker looks the SKU up when it is omitted)
+     */
+    public function queueAudit(
+        int $skuId,
+        ?string $tier = null,
+        ?string $category = null,
+        ?string $callbackUrl = null,
+        ?string $contentDigest = null
+    ): array {
         try {
             $response = $this->client->post('/queue/audit', [
-                'json' => ['sku_id' => $skuId]
+                'json' => [
+                    'sku_id' => $skuId,
+                    'tier' => $tier,
+                    'category' => $category,
+                    'callback_url' => $callbackUrl,
+                    'content_digest' => $contentDigest
+                ]
             ]);
 
             if ($response->getStatusCode() !== 200 && $response->getStatusCode() !== 202) {
@@ -91,16 +205,34 @@ class PythonWorkerClient
     }
 
     /**
-     * Queue a brief generation job
+     * Digest of the SKU text an audit reads (same as the worker's audit_content_digest), so a
+     * re-audit is only deduplicated while title and long description are unchanged
      */
-    public function queueBriefGeneration(int $skuId, string $title, ?string $category = null): array
+    public static function auditContentDigest(?string $title, ?string $longDescription): string
     {
+        return hash('sha256', ($title ?? '') . "\0" . ($longDescription ?? ''));
+    }
+
+    /**
+     * Queue a brief generation job ($callbackUrl, if given, receives the finished job as a POST)
+     */
+    public function queueBriefGeneration(
+        int $skuId,
+        string $title,
+        ?string $category = null,
+        ?string $tier = null,
+        ?string $decayStatus = null,
+        ?string $callbackUrl = null
+    ): array {
         try {
             $response = $this->client->post('/queue/brief-generation', [
                 'json' => [
                     'sku_id' => $skuId,
                     'title' => $title,
-                    'category' => $category
+                    'category' => $category,
+                    'tier' => $tier,
+                    'decay_status' => $decayStatus,
+                    'callback_url' => $callbackUrl
                 ]
             ]);
 
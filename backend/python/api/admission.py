@@ -0,0 +1,128 @@
+"""
+Admission control for the worker API: per-route concurrency limits with a bounded wait queue.
+
+Each limited route admits up to `max_concurrent` requests at once; up to `max_queued` more wait
+(at most ADMISSION_MAX_WAIT_MS) for a slot. Anything beyond that is shed at once — before the
+body is read — with the route's shed response (fail-soft pending / degraded body, or 429) and a
+Retry-After header, so a burst costs callers a fast retry instead of an unbounded queue that runs
+into PHP's 30 s client timeout. AdmissionMiddleware is a plain ASGI middleware, so a streaming
+response holds its slot until the last chunk is sent or the client disconnects.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import Any, Callable, Optional
+
+from src.utils.metrics import ADMISSION_IN_FLIGHT, ADMISSION_SHED, ADMISSION_WAITING
+
+logger = logging.getLogger(__name__)
+
+ADMISSION_CONTROL = os.getenv("ADMISSION_CONTROL", "true").strip().lower() in ("1", "true", "yes")
+ADMISSION_MAX_WAIT_SECONDS = float(os.getenv("ADMISSION_MAX_WAIT_MS", "1000")) / 1000.0
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "2"))
+
+
+class RouteLimiter:
+    """Concurrency slots for one route plus a bounded number of waiters."""
+
+    def __init__(self, route: str, max_concurrent: int, max_queued: int, max_wait_seconds: float = ADMISSION_MAX_WAIT_SECONDS):
+        self.route = route
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queued = max(0, max_queued)
+        self.max_wait_seconds = max(0.0, max_wait_seconds)
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed = 0
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in the bounded queue if needed. False = shed the request."""
+        if self._slots.locked():
+            if self.waiting >= self.max_queued:
+                return self._reject("queue_full")
+            self.waiting += 1
+            ADMISSION_WAITING.labels(self.route).inc()
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.max_wait_seconds)
+            except asyncio.TimeoutError:
+                return self._reject("wait_timeout")
+            finally:
+                self.waiting -= 1
+                ADMISSION_WAITING.labels(self.route).dec()
+        else:
+            await self._slots.acquire()
+        self.in_flight += 1
+        self.admitted += 1
+        ADMISSION_IN_FLIGHT.labels(self.route).inc()
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        ADMISSION_IN_FLIGHT.labels(self.route).dec()
+        self._slots.release()
+
+    def _reject(self, reason: str) -> bool:
+        self.shed += 1
+        ADMISSION_SHED.labels(self.route, reason).inc()
+        return False
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
+
+
+def build_limiters(defaults: dict[str, tuple[int, int]], overrides: str = "") -> dict[str, RouteLimiter]:
+    """
+    One RouteLimiter per route from {route: (max_concurrent, max_queued)}; `overrides` is a
+    comma-separated "route=concurrent:queued" list (ADMISSION_ROUTE_LIMITS). Unknown routes are ignored.
+    """
+    limits = dict(defaults)
+    for entry in filter(None, (e.strip() for e in overrides.split(","))):
+        route, _, value = entry.partition("=")
+        route = route.strip()
+        concurrent, _, queued = value.partition(":")
+        if route not in limits:
+            logger.warning("ADMISSION_ROUTE_LIMITS: unknown route %s ignored", route)
+            continue
+        try:
+            limits[route] = (int(concurrent), int(queued or limits[route][1]))
+        except ValueError:
+            logger.warning("ADMISSION_ROUTE_LIMITS: invalid entry %r ignored", entry)
+    return {route: RouteLimiter(route, concurrent, queued) for route, (concurrent, queued) in limits.items()}
+
+
+class AdmissionMiddleware:
+    """ASGI middleware admitting requests to limited routes (POST, exact path) through their RouteLimiter."""
+
+    def __init__(self, app, limiters: dict[str, RouteLimiter], shed_response: Callable[[str], Any]):
+        self.app = app
+        self.limiters = limiters
+        self.shed_response = shed_response
+
+    async def __call__(self, scope, receive, send):
+        limiter: Optional[RouteLimiter] = None
+        if scope["type"] == "http" and scope.get("method") == "POST":
+            limiter = self.limiters.get(scope["path"])
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+        # Route label for request metrics on shed responses (they never reach the router)
+        scope["admission_route"] = limiter.route
+        if not await limiter.acquire():
+            response = self.shed_response(limiter.route)
+            response.headers["Retry-After"] = str(ADMISSION_RETRY_AFTER_SECONDS)
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
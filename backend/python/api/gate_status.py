@@ -0,0 +1,83 @@
+"""
+Stored gate outcomes for incremental validation (sku_gate_status, migration 038).
+
+The validate endpoint loads a SKU's rows before evaluating, hands them to
+gates_validate.evaluate_gates as `previous`, and writes back the gates it re-ran with their input
+fingerprints; gates not applicable to the tier are stored as not_applicable. Rows are keyed on the
+canonical sku_master.sku_id — SKUs without a canonical row are evaluated in full and not stored.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from .gates_validate import GATES, GateRun, applicable_gates
+
+logger = logging.getLogger(__name__)
+
+
+def load_gate_status(db, sku_id: str) -> dict[str, dict[str, Any]]:
+    """sku_gate_status rows for `sku_id` by gate_code (gates in GATES only)."""
+    cur = db.cursor()
+    try:
+        cur.execute(
+            f"""
+            SELECT gate_code, status, error_code, error_message, user_message, input_fingerprint
+            FROM sku_gate_status
+            WHERE sku_id = %s AND gate_code IN ({", ".join(["%s"] * len(GATES))})
+            """,
+            (sku_id, *[g.status_code for g in GATES]),
+        )
+        rows = cur.fetchall()
+    finally:
+        cur.close()
+    columns = ("status", "error_code", "error_message", "user_message", "input_fingerprint")
+    return {row[0]: dict(zip(columns, row[1:])) for row in rows}
+
+
+def save_gate_status(db, sku_id: str, tier: str | None, runs: list[GateRun]) -> None:
+    """Upsert the re-run gates' outcomes and mark gates suspended for the tier not_applicable."""
+    rows = [
+        (
+            sku_id,
+            run.gate.status_code,
+            "fail" if run.failure else "pass",
+            run.failure.error_code if run.failure else None,
+            run.failure.detail[:500] if run.failure else None,
+            run.failure.user_message[:500] if run.failure else None,
+            run.fingerprint,
+        )
+        for run in runs
+        if not run.skipped
+    ]
+    applicable = {g.code for g in applicable_gates(tier)}
+    rows += [
+        (sku_id, g.status_code, "not_applicable", None, None, None, None)
+        for g in GATES
+        if g.code not in applicable
+    ]
+    if not rows:
+        return
+    cur = db.cursor()
+    try:
+        cur.executemany(
+            """
+            INSERT INTO sku_gate_status
+                (sku_id, gate_code, status, error_code, error_message, user_message, input_fingerprint, checked_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, NOW())
+            ON DUPLICATE KEY UPDATE
+                status = VALUES(status),
+                error_code = VALUES(error_code),
+                error_message = VALUES(error_message),
+                user_message = VALUES(user_message),
+                input_fingerprint = VALUES(input_fingerprint),
+                checked_at = VALUES(checked_at)
+            """,
+            rows,
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cur.close()
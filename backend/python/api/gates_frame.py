@@ -0,0 +1,191 @@
+"""
+Columnar CIE v2.3.1 gate engine: the rules of gates_validate.run_all_gates applied to a whole
+pandas DataFrame of SKUs at once, for catalog-wide compliance reports.
+
+Input columns are the SkuValidateRequest fields (cluster_id, tier, primary_intent,
+secondary_intents, answer_block, best_for, not_for, expert_authority); list columns hold lists
+(or None). run_gates_frame returns a failure matrix — one column per gate in GATE_ORDER, the error
+code where the gate failed and None where it passed or does not apply to the SKU's tier.
+failure_codes(matrix) gives, per SKU, the error codes run_all_gates returns, in the same order;
+check_parity verifies that on any set of records.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+
+from .gates_validate import INTENT_KEYWORDS, run_all_gates
+from .schemas_validate import VALID_PRIMARY_INTENTS_NORM, SkuValidateRequest
+
+GATE_ORDER = ["G1", "G2", "G3", "G4", "G5", "G6", "G6.1", "G7"]
+FRAME_COLUMNS = [
+    "cluster_id", "tier", "primary_intent", "secondary_intents",
+    "answer_block", "best_for", "not_for", "expert_authority",
+]
+_VALID_TIERS = ["hero", "support", "harvest", "kill"]
+
+
+def _text(frame: pd.DataFrame, column: str) -> pd.Series:
+    return frame[column].fillna("").astype(str)
+
+
+def _norm_intent(s: pd.Series) -> pd.Series:
+    return s.str.strip().str.lower().str.replace(" ", "_", regex=False).str.replace("-", "_", regex=False)
+
+
+def _nonblank(lists: pd.Series) -> pd.Series:
+    """Exploded non-blank list entries (index = row position), as gates_validate filters them."""
+    items = lists.map(lambda v: v if isinstance(v, (list, tuple)) else []).explode()
+    items = items[items.notna()]
+    items = items.astype(str)
+    return items[items.str.strip() != ""]
+
+
+def _counts(items: pd.Series, n: int) -> np.ndarray:
+    return items.groupby(level=0).size().reindex(range(n), fill_value=0).to_numpy()
+
+
+def _codes(n: int, *rules: tuple[np.ndarray, str]) -> np.ndarray:
+    """First matching rule's code per row (rules in gate priority order), else None."""
+    out = np.full(n, None, dtype=object)
+    unset = np.ones(n, dtype=bool)
+    for mask, code in rules:
+        hit = unset & mask
+        out[hit] = code
+        unset &= ~hit
+    return out
+
+
+def run_gates_frame(frame: pd.DataFrame, master_cluster_ids: set[str]) -> pd.DataFrame:
+    """Failure matrix (index = frame.index, columns = GATE_ORDER) for every SKU in `frame`."""
+    df = frame.reset_index(drop=True)
+    n = len(df)
+
+    tier = _text(df, "tier").str.strip().str.lower()
+    is_kill = (tier == "kill").to_numpy()
+    is_harvest = (tier == "harvest").to_numpy()
+    is_hero = (tier == "hero").to_numpy()
+    is_support = (tier == "support").to_numpy()
+
+    primary_raw = _text(df, "primary_intent")
+    primary = _norm_intent(primary_raw)
+    primary_valid = primary.isin(VALID_PRIMARY_INTENTS_NORM).to_numpy()
+
+    # G1
+    cluster = _text(df, "cluster_id").str.strip()
+    cluster_missing = (cluster == "").to_numpy()
+    cluster_unknown = (~cluster.isin(master_cluster_ids)).to_numpy() if master_cluster_ids else np.zeros(n, bool)
+    g1 = _codes(n, (cluster_missing, "G1_CLUSTER_REQUIRED"), (cluster_unknown, "G1_CLUSTER_INVALID"))
+
+    # G2
+    g2 = _codes(
+        n,
+        ((primary_raw.str.strip() == "").to_numpy(), "G2_PRIMARY_INTENT_REQUIRED"),
+        (~primary_valid, "G2_INVALID_INTENT"),
+    )
+
+    # G3: the first offending secondary decides, then the tier's count limits
+    secondaries = _nonblank(df["secondary_intents"])
+    secondary_norm = _norm_intent(secondaries)
+    matches_primary = secondary_norm.to_numpy() == primary.to_numpy()[secondaries.index.to_numpy(dtype=int)]
+    element_codes = pd.Series(
+        np.where(matches_primary, "G3_SECONDARY_MATCHES_PRIMARY",
+                 np.where(secondary_norm.isin(VALID_PRIMARY_INTENTS_NORM), None, "G3_INVALID_SECONDARY_INTENT")),
+        index=secondaries.index,
+        dtype=object,
+    )
+    first_element_code = element_codes.dropna().groupby(level=0).first().reindex(range(n)).to_numpy(dtype=object)
+    n_secondary = _counts(secondaries, n)
+    g3 = _codes(
+        n,
+        (is_kill & (n_secondary > 0), "G3_KILL_NO_SECONDARIES"),
+        (is_harvest & (n_secondary > 1), "G3_HARVEST_MAX_ONE"),
+        ((is_hero | is_support) & (n_secondary < 1), "G3_MIN_SECONDARIES"),
+        (is_hero & (n_secondary > 3), "G3_HERO_MAX_THREE"),
+        (is_support & (n_secondary > 2), "G3_SUPPORT_MAX_TWO"),
+    )
+    has_element_code = pd.notna(first_element_code).astype(bool)
+    g3[has_element_code] = first_element_code[has_element_code]
+
+    # G4: length window, then the primary intent keyword
+    answer = _text(df, "answer_block").str.strip()
+    length = answer.str.len().to_numpy()
+    keyword = primary.map(INTENT_KEYWORDS).fillna(primary.str.replace("_", "", regex=False).str[:6])
+    answer_lower = answer.str.lower()
+    keyword_missing = np.zeros(n, dtype=bool)
+    for kw in keyword[keyword != ""].unique():
+        rows = (keyword == kw).to_numpy()
+        keyword_missing[rows] = ~answer_lower[rows].str.contains(kw, regex=False).to_numpy()
+    g4 = _codes(
+        n,
+        (length < 250, "G4_ANSWER_TOO_SHORT"),
+        (length > 300, "G4_ANSWER_TOO_LONG"),
+        (keyword_missing, "G4_KEYWORD_MISSING"),
+    )
+
+    # G5
+    g5 = _codes(
+        n,
+        (_counts(_nonblank(df["best_for"]), n) < 2, "G5_BEST_FOR_MIN"),
+        (_counts(_nonblank(df["not_for"]), n) < 1, "G5_NOT_FOR_MIN"),
+    )
+
+    # G6
+    g6 = _codes(n, (~tier.isin(_VALID_TIERS).to_numpy(), "G6_INVALID_TIER"))
+
+    # G6.1: Harvest only
+    g61 = _codes(
+        n,
+        (is_harvest & (primary != "specification").to_numpy(), "G61_HARVEST_SPEC_PRIMARY"),
+        (is_harvest & (n_secondary > 1), "G61_HARVEST_MAX_ONE_SECONDARY"),
+    )
+
+    # G7
+    expert_missing = (_text(df, "expert_authority").str.strip() == "").to_numpy()
+    g7 = _codes(n, ((is_hero | is_support) & expert_missing, "G7_EXPERT_REQUIRED"))
+
+    # Tier applicability, as run_all_gates: Kill runs only G1 + G6; Harvest skips G4, G5, G7
+    for codes in (g2, g3, g4, g5, g61, g7):
+        codes[is_kill] = None
+    for codes in (g4, g5, g7):
+        codes[is_harvest] = None
+
+    return pd.DataFrame(
+        dict(zip(GATE_ORDER, (g1, g2, g3, g4, g5, g6, g61, g7))),
+        index=frame.index,
+        dtype=object,
+    )
+
+
+def failure_codes(matrix: pd.DataFrame) -> list[list[str]]:
+    """Per SKU, the failed gates' error codes in gate order (what run_all_gates reports)."""
+    return [[code for code in row if code is not None] for row in matrix[GATE_ORDER].itertuples(index=False)]
+
+
+def error_code_counts(matrix: pd.DataFrame) -> dict[str, int]:
+    """Failing SKUs per error code across the matrix, most frequent first."""
+    counts = pd.Series(matrix[GATE_ORDER].to_numpy().ravel()).dropna().value_counts()
+    return {str(code): int(count) for code, count in counts.items()}
+
+
+def frame_from_records(records: Iterable[Any]) -> pd.DataFrame:
+    """DataFrame in FRAME_COLUMNS from validate request dicts or SkuValidateRequest models."""
+    rows = [r.model_dump() if isinstance(r, SkuValidateRequest) else r for r in records]
+    return pd.DataFrame.from_records(rows, columns=FRAME_COLUMNS)
+
+
+def check_parity(records: Iterable[Any], master_cluster_ids: set[str]) -> list[dict[str, Any]]:
+    """
+    Run `records` (validate request dicts) through both run_all_gates and run_gates_frame.
+    Returns one {index, expected, actual} entry per SKU whose error codes differ; [] means parity.
+    """
+    requests = [SkuValidateRequest.model_validate(r) for r in records]
+    expected = [[f.error_code for f in run_all_gates(r, master_cluster_ids)] for r in requests]
+    actual = failure_codes(run_gates_frame(frame_from_records(requests), master_cluster_ids))
+    return [
+        {"index": i, "expected": e, "actual": a}
+        for i, (e, a) in enumerate(zip(expected, actual))
+        if e != a
+    ]
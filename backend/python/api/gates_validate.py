@@ -2,10 +2,16 @@
 CIE v2.3.1 Gate validation for SKU validate endpoint.
 8 gates IN ORDER: G1, G2, G3, G4, G5, G6, G6.1, G7.
 Harvest: G4, G5, G7 SUSPENDED. Kill: only G1 and G6.
+Each gate declares the request fields it reads (GATES); evaluate_gates can skip gates whose inputs
+are unchanged since their stored sku_gate_status outcome (see gate_status.py).
 """
 from __future__ import annotations
 
-from typing import Any
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
 
 from .schemas_validate import (
     SkuValidateRequest,
@@ -249,53 +255,91 @@ def run_g7(data: SkuValidateRequest) -> FailureItem | None:
     return None
 
 
+@dataclass(frozen=True)
+class Gate:
+    """A gate, the request fields it reads, and its sku_gate_status.gate_code."""
+    code: str
+    status_code: str
+    inputs: tuple[str, ...]
+    check: Callable[[SkuValidateRequest, set[str]], FailureItem | None]
+
+
+# IN ORDER. A gate's outcome may depend only on its inputs (and, for G1, the master cluster list)
+GATES: tuple[Gate, ...] = (
+    Gate("G1", "G1", ("cluster_id",), run_g1),
+    Gate("G2", "G2", ("primary_intent",), lambda d, _: run_g2(d)),
+    Gate("G3", "G3", ("tier", "primary_intent", "secondary_intents"), lambda d, _: run_g3(d)),
+    Gate("G4", "G4", ("answer_block", "primary_intent"), lambda d, _: run_g4(d)),
+    Gate("G5", "G5", ("best_for", "not_for"), lambda d, _: run_g5(d)),
+    Gate("G6", "G6", ("tier",), lambda d, _: run_g6(d)),
+    Gate("G6.1", "G6_1", ("tier", "primary_intent", "secondary_intents"), lambda d, _: run_g61(d)),
+    Gate("G7", "G7", ("tier", "expert_authority"), lambda d, _: run_g7(d)),
+)
+GATES_BY_STATUS_CODE = {g.status_code: g for g in GATES}
+
+# Bump when any gate's rules change so stored fingerprints stop matching
+GATE_RULES_VERSION = 1
+
+
+def applicable_gates(tier: str | None) -> list[Gate]:
+    """Harvest: G4, G5, G7 suspended. Kill: only G1 and G6."""
+    t = (tier or "").strip().lower()
+    if t == "kill":
+        return [g for g in GATES if g.code in ("G1", "G6")]
+    if t == "harvest":
+        return [g for g in GATES if g.code not in ("G4", "G5", "G7")]
+    return list(GATES)
+
+
+def gate_fingerprint(gate: Gate, data: SkuValidateRequest, master_cluster_ids: set[str]) -> str:
+    """sha256 of everything `gate` reads: its input fields, the rules version and (G1) the master list."""
+    material: dict[str, Any] = {"v": GATE_RULES_VERSION, "gate": gate.code}
+    material["inputs"] = {name: getattr(data, name) for name in gate.inputs}
+    if gate.code == "G1":
+        material["master"] = sorted(master_cluster_ids)
+    return hashlib.sha256(json.dumps(material, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class GateRun:
+    """One gate's outcome for a request; skipped = reused from the stored outcome (inputs unchanged)."""
+    gate: Gate
+    failure: FailureItem | None
+    fingerprint: str | None = None
+    skipped: bool = False
+    seconds: float = 0.0
+
+
+def evaluate_gates(
+    data: SkuValidateRequest,
+    master_cluster_ids: set[str],
+    previous: dict[str, dict[str, Any]] | None = None,
+) -> list[GateRun]:
+    """
+    Run the gates that apply to the SKU's tier, in order. With `previous` (sku_gate_status rows by
+    gate_code: status, error_code, error_message, user_message, input_fingerprint), a gate whose
+    fingerprint is unchanged since a pass / fail outcome is not re-run; that outcome is reused.
+    """
+    runs: list[GateRun] = []
+    for gate in applicable_gates(data.tier):
+        stored = (previous or {}).get(gate.status_code)
+        fingerprint = gate_fingerprint(gate, data, master_cluster_ids) if previous is not None else None
+        if stored and stored.get("input_fingerprint") == fingerprint and stored.get("status") in ("pass", "fail"):
+            failure = None
+            if stored["status"] == "fail":
+                failure = FailureItem(
+                    error_code=stored.get("error_code") or "",
+                    detail=stored.get("error_message") or "",
+                    user_message=stored.get("user_message") or "",
+                )
+            runs.append(GateRun(gate, failure, fingerprint, skipped=True))
+            continue
+        started = time.perf_counter()
+        failure = gate.check(data, master_cluster_ids)
+        runs.append(GateRun(gate, failure, fingerprint, seconds=time.perf_counter() - started))
+    return runs
+
+
 def run_all_gates(data: SkuValidateRequest, master_cluster_ids: set[str]) -> list[FailureItem]:
     """Run gates IN ORDER. Harvest: skip G4, G5, G7. Kill: only G1 and G6. Return all failures."""
-    failures: list[FailureItem] = []
-    tier = (data.tier or "").strip().lower()
-    is_harvest = tier == "harvest"
-    is_kill = tier == "kill"
-
-    # G1: always (and for kill only G1 + G6)
-    f = run_g1(data, master_cluster_ids)
-    if f:
-        failures.append(f)
-    if is_kill:
-        f = run_g6(data)
-        if f:
-            failures.append(f)
-        return failures
-
-    # G2
-    f = run_g2(data)
-    if f:
-        failures.append(f)
-    # G3
-    f = run_g3(data)
-    if f:
-        failures.append(f)
-    # G4: suspended for harvest
-    if not is_harvest:
-        f = run_g4(data)
-        if f:
-            failures.append(f)
-    # G5: suspended for harvest
-    if not is_harvest:
-        f = run_g5(data)
-        if f:
-            failures.append(f)
-    # G6
-    f = run_g6(data)
-    if f:
-        failures.append(f)
-    # G6.1
-    f = run_g61(data)
-    if f:
-        failures.append(f)
-    # G7: suspended for harvest
-    if not is_harvest:
-        f = run_g7(data)
-        if f:
-            failures.append(f)
-
-    return failures
+    return [run.failure for run in evaluate_gates(data, master_cluster_ids) if run.failure]
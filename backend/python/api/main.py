@@ -1,13 +1,19 @@
 """
 CIE Python Worker API — FastAPI (replaces Flask).
 Embed + similarity with fail-soft: on embedding API failure, log and return degraded response so save is allowed (v2.3.2).
+I/O-bound handlers are async (AsyncOpenAI, asyncio Redis) so they hold no threadpool thread while waiting;
+provider calls are capped by EMBEDDING_MAX_CONCURRENCY and Redis connections by REDIS_MAX_CONNECTIONS.
 """
 from dotenv import load_dotenv
 load_dotenv()
 
+import asyncio
+import base64
+import json
 import logging
 import os
 import sys
+import time
 import uuid
 from typing import Any, Optional
 
@@ -16,11 +22,28 @@ logger = logging.getLogger(__name__)
 # Add parent to path for src imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
-
-from src.vector.validation import validate_cluster_match
-from src.vector.embedding import get_embedding
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from src.vector.validation import avalidate_cluster_match, avalidate_cluster_matches, anearest_clusters
+from src.vector.embedding import get_embedding_async, get_embeddings_async, get_provider, breaker as embedding_breaker, coalescer as embedding_coalescer
+from src.vector.embedding_cache import cache as embedding_cache
+from src.vector import codec as vector_codec
+from src.vector.centroid_store import store as centroid_store
+from src.vector.near_duplicates import NEAR_DUP_THRESHOLD, query_near_duplicates, stored_near_duplicates
+from src.utils.db import get_db, load_sku
+from src.utils.job_events import JobEvents
+from src.utils.job_queue import JobQueue, audit_content_digest, lane_for
+from src.utils.job_webhooks import callback_url_allowed
+from src.utils.redis_pool import async_redis_client
+from src.utils.metrics import (
+    FAIL_SOFT_RESPONSES,
+    GATE_DURATION_SECONDS,
+    GATE_OUTCOMES,
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUESTS,
+    JOB_QUEUE_DEPTH,
+)
 from src.title.validation import validate_title as validate_title_rules, suggest_title as suggest_title_from_attrs
 
 # -------- Request body models (same field names as Flask request.json) --------
@@ -37,19 +60,46 @@ class SimilarityRequest(BaseModel):
     cluster_id: str = ""
 
 
+class NearestClustersRequest(BaseModel):
+    description: str = ""
+    k: int = 5
+
+
+class NearDuplicatesRequest(BaseModel):
+    description: str = ""
+    sku_id: Optional[str] = None
+    k: int = 10
+
+
 class ValidateVectorRequest(BaseModel):
     description: Optional[str] = None
     cluster_id: Optional[str] = None
     sku_id: str = "unknown"
 
 
+class ValidateVectorBatchRequest(BaseModel):
+    items: list[ValidateVectorRequest] = []
+
+
 class QueueAuditRequest(BaseModel):
     sku_id: Optional[str] = None
+    # audit_content_digest(title, long_description); looked up from skus when omitted
+    content_digest: Optional[str] = None
+    # Scheduling hints (priority lane and fair-share category); all optional
+    tier: Optional[str] = None
+    decay_status: Optional[str] = None
+    category: Optional[str] = None
+    # POSTed the finished job (src/utils/job_webhooks.py)
+    callback_url: Optional[str] = None
 
 
 class QueueBriefRequest(BaseModel):
     sku_id: Optional[str] = None
     title: Optional[str] = None
+    tier: Optional[str] = None
+    decay_status: Optional[str] = None
+    category: Optional[str] = None
+    callback_url: Optional[str] = None
 
 
 class TitleValidateRequest(BaseModel):
@@ -64,7 +114,7 @@ class TitleSuggestRequest(BaseModel):
     attributes: dict[str, Any] = {}
 
 
-# -------- App and in-memory queues (unchanged behavior) --------
+# -------- App and job queue --------
 
 app = FastAPI(
     title="CIE Python Worker API",
@@ -72,20 +122,116 @@ app = FastAPI(
     description="Unified Python API: embed, similarity, validate, queue (replaces Flask).",
 )
 
-audit_queue: dict[str, Any] = {}
-brief_queue: dict[str, Any] = {}
+# Audit / brief jobs live in Redis (src/utils/job_queue.py), consumed by src.jobs.job_worker
+job_queue = JobQueue(async_redis_client())
+job_events = JobEvents(async_redis_client())
 
 # Load master cluster list once for validate endpoint
-from api.gates_validate import get_master_cluster_ids, run_all_gates
+from api.gates_validate import evaluate_gates, get_master_cluster_ids
+from api.gate_status import load_gate_status, save_gate_status
 from api.schemas_validate import SkuValidateRequest, SkuValidateResponsePass, SkuValidateResponseFail
+from api.validate_bulk import iter_json_records, validate_bulk_stream
+from api.admission import ADMISSION_CONTROL, ADMISSION_RETRY_AFTER_SECONDS, AdmissionMiddleware, build_limiters
 
 MASTER_CLUSTER_IDS = get_master_cluster_ids()
+# Reuse stored gate outcomes (sku_gate_status) for gates whose inputs did not change
+SKU_VALIDATE_INCREMENTAL = os.getenv("SKU_VALIDATE_INCREMENTAL", "true").strip().lower() in ("1", "true", "yes")
+
+
+# Admission control: (max concurrent, max queued) per route, overridable with ADMISSION_ROUTE_LIMITS.
+# Vector routes shed with their fail-soft body (save allowed); deterministic gates shed with 429.
+ADMISSION_ROUTE_DEFAULTS = {
+    "/api/v1/sku/embed": (32, 64),
+    "/api/v1/sku/similarity": (32, 64),
+    "/api/v1/sku/nearest-clusters": (32, 64),
+    "/api/v1/sku/near-duplicates": (16, 32),
+    "/validate-vector": (32, 64),
+    "/validate-vector/batch": (4, 8),
+    "/api/v1/sku/validate": (32, 64),
+    "/api/v1/sku/validate/bulk": (2, 0),
+    "/api/v1/title/validate": (32, 64),
+    "/api/v1/title/suggest": (32, 64),
+}
+OVER_CAPACITY_MESSAGE = "Worker over capacity; retry later."
+admission_limiters = (
+    build_limiters(ADMISSION_ROUTE_DEFAULTS, os.getenv("ADMISSION_ROUTE_LIMITS", "")) if ADMISSION_CONTROL else {}
+)
+
+
+def _shed_response(route: str) -> JSONResponse:
+    """Response for a request shed by admission control (Retry-After is added by the middleware)."""
+    if route in ("/api/v1/sku/similarity", "/api/v1/sku/nearest-clusters", "/api/v1/sku/near-duplicates"):
+        _fail_soft(route, "pending")
+        if route == "/api/v1/sku/similarity":
+            content = {"cosine_similarity": 0.0, "threshold": SIMILARITY_THRESHOLD}
+        elif route == "/api/v1/sku/nearest-clusters":
+            content = {"clusters": [], "threshold": SIMILARITY_THRESHOLD}
+        else:
+            content = {"duplicates": [], "threshold": NEAR_DUP_THRESHOLD}
+        content.update(status="pending", message=PENDING_MESSAGE, degraded_mode=True)
+        return JSONResponse(status_code=200, content=content)
+    if route == "/validate-vector":
+        _fail_soft(route, "degraded")
+        return JSONResponse(status_code=200, content={
+            "valid": False,
+            "similarity": 0.0,
+            "reason": "Vector validation temporarily unavailable. Save allowed, publish blocked.",
+            "degraded": True,
+            "error_message": OVER_CAPACITY_MESSAGE,
+        })
+    if route == "/api/v1/sku/embed":
+        _fail_soft(route, "degraded")
+        model, dims = EMBED_MODEL, EMBED_DIMENSIONS
+        try:
+            provider = get_provider()
+            model, dims = provider.model, provider.dimensions
+        except Exception:
+            pass
+        return JSONResponse(status_code=200, content={
+            "vector": None,
+            "model": model,
+            "dimensions": dims,
+            "degraded": True,
+            "error_message": OVER_CAPACITY_MESSAGE,
+        })
+    return JSONResponse(
+        status_code=429,
+        content={"error": OVER_CAPACITY_MESSAGE, "retry_after": ADMISSION_RETRY_AFTER_SECONDS},
+    )
+
+
+# Added before observe_request so request metrics (the outer middleware) include shed responses
+app.add_middleware(AdmissionMiddleware, limiters=admission_limiters, shed_response=_shed_response)
+
+
+@app.middleware("http")
+async def observe_request(request: Request, call_next):
+    """Per-route latency and status metrics, labelled by route template (not raw path)."""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = (
+            getattr(request.scope.get("route"), "path", None)
+            or request.scope.get("admission_route")
+            or "unmatched"
+        )
+        HTTP_REQUEST_SECONDS.labels(request.method, route).observe(time.perf_counter() - started)
+        HTTP_REQUESTS.labels(request.method, route, str(status)).inc()
+
+
+def _fail_soft(route: str, kind: str, count: int = 1) -> None:
+    """Count a fail-soft response: kind 'degraded' (result flagged degraded) or 'pending'."""
+    FAIL_SOFT_RESPONSES.labels(route, kind).inc(count)
 
 
 # -------- Routes (paths and response structure identical to Flask) --------
 
 @app.get("/")
-def index():
+async def index():
     """Root endpoint — same JSON as Flask."""
     return {
         "service": "CIE Python Worker API",
@@ -94,8 +240,11 @@ def index():
         "endpoints": [
             "/health",
             "/validate-vector",
+            "/validate-vector/batch",
             "/api/v1/sku/embed",
             "/api/v1/sku/similarity",
+            "/api/v1/sku/nearest-clusters",
+            "/api/v1/sku/near-duplicates",
             "/api/v1/sku/validate",
             "/api/v1/title/validate",
             "/api/v1/title/suggest",
@@ -106,12 +255,55 @@ def index():
 
 
 @app.get("/health")
-def health():
-    """Health check — same JSON as Flask."""
-    return {"status": "healthy", "service": "python-worker"}
+async def health():
+    """
+    Health check — same JSON as Flask, plus embedding cache, coalescer, provider circuit breaker,
+    centroid store and per-route admission state. The service stays "healthy" while the breaker is
+    open or requests are shed (both fail soft).
+    """
+    return {
+        "status": "healthy",
+        "service": "python-worker",
+        "embedding_cache": embedding_cache.stats(),
+        "embedding_coalescer": embedding_coalescer.stats(),
+        "embedding_breaker": embedding_breaker.stats(),
+        "admission": {route: limiter.stats() for route, limiter in admission_limiters.items()},
+        "centroid_store": centroid_store.stats(),
+    }
+
+
+# Job types whose queue depth /metrics reports (consumed by src.jobs.job_worker)
+METRICS_JOB_TYPES = ("audit", "brief")
+METRICS_QUEUE_DEPTH_TIMEOUT = 1.0
+
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Prometheus exposition: route latency, embedding provider latency / errors, fail-soft counts,
+    cluster cache lookups, gate timings and job queue depths (read from Redis at scrape time).
+    With PROMETHEUS_MULTIPROC_DIR set (several uvicorn workers), all processes are aggregated.
+    """
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+
+    try:
+        depths = await asyncio.wait_for(job_queue.lane_depths(METRICS_JOB_TYPES), METRICS_QUEUE_DEPTH_TIMEOUT)
+        for job_type, lanes in depths.items():
+            for lane, depth in lanes.items():
+                JOB_QUEUE_DEPTH.labels(job_type, lane).set(depth)
+    except Exception as e:
+        logger.warning("Queue depth unavailable for /metrics: %s", e)
 
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
 
-# OpenAI text-embedding-3-small dimension (v2.3.1 §8.1)
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+# OpenAI text-embedding-3-small dimension (v2.3.1 §8.1); other providers report their own
 EMBED_DIMENSIONS = 1536
 EMBED_MODEL = "text-embedding-3-small"
 SIMILARITY_THRESHOLD = 0.72
@@ -121,36 +313,82 @@ PENDING_MESSAGE = (
 )
 
 
+EMBED_OCTET_STREAM = "application/octet-stream"
+
+
+def _json_response(content: dict[str, Any]) -> Response:
+    """JSON body serialized in one json.dumps call (skips FastAPI's per-element jsonable_encoder pass)."""
+    return Response(content=json.dumps(content, separators=(",", ":")), media_type="application/json")
+
+
 @app.post("/api/v1/sku/embed")
-def sku_embed(body: EmbedRequest):
+async def sku_embed(
+    body: EmbedRequest,
+    request: Request,
+    encoding: str = Query("json"),
+    dtype: Optional[str] = Query(None),
+):
     """
-    POST /api/v1/sku/embed — generate embedding (OpenAI text-embedding-3-small, 1536 dims).
-    Fail-soft (v2.3.2): on API failure, log and return degraded response; do not hard-block saves.
+    POST /api/v1/sku/embed — generate embedding (EMBEDDING_PROVIDER; default OpenAI text-embedding-3-small, 1536 dims).
+    Vector encoding is negotiated:
+    - default: JSON list of floats;
+    - ?encoding=base64: JSON with `vector` as base64 of the vector blob;
+    - Accept: application/octet-stream: the vector blob as the raw body, model / dimensions / dtype
+      in X-Embedding-* headers.
+    The blob is the sku_vectors.vector_blob format (src/vector/codec.py: header + little-endian
+    values), so it can be stored as is; ?dtype=float32|float16 (default VECTOR_STORAGE_DTYPE).
+    Fail-soft (v2.3.2): on API failure, log and return degraded response (always JSON); do not hard-block saves.
     """
     text = (body.text or "").strip()
     if not text:
         return JSONResponse(status_code=400, content={"error": "text required"})
+    if encoding not in ("json", "base64"):
+        return JSONResponse(status_code=400, content={"error": "encoding must be json or base64"})
+    dtype = (dtype or vector_codec.STORAGE_DTYPE).strip().lower()
+    if dtype not in vector_codec.DTYPES:
+        return JSONResponse(status_code=400, content={"error": f"dtype must be one of {', '.join(vector_codec.DTYPES)}"})
+    model, default_dims = EMBED_MODEL, EMBED_DIMENSIONS
     try:
-        vector = get_embedding(text)
-        dims = len(vector) if isinstance(vector, (list, tuple)) else EMBED_DIMENSIONS
-        return {
+        provider = get_provider()
+        model, default_dims = provider.model, provider.dimensions
+        vector = await get_embedding_async(text)
+        if vector is None:
+            raise RuntimeError("embedding unavailable")
+        dims = len(vector)
+        if EMBED_OCTET_STREAM in request.headers.get("accept", "") or encoding == "base64":
+            blob = vector_codec.encode(vector, dtype)
+            if encoding == "base64":
+                return _json_response({
+                    "vector": base64.b64encode(blob).decode("ascii"),
+                    "encoding": "base64",
+                    "dtype": dtype,
+                    "model": model,
+                    "dimensions": dims,
+                })
+            return Response(
+                content=blob,
+                media_type=EMBED_OCTET_STREAM,
+                headers={"X-Embedding-Model": model, "X-Embedding-Dimensions": str(dims), "X-Embedding-Dtype": dtype},
+            )
+        return _json_response({
             "vector": vector if isinstance(vector, list) else list(vector),
-            "model": EMBED_MODEL,
+            "model": model,
             "dimensions": dims,
-        }
+        })
     except Exception as e:
         logger.warning("Embedding API unavailable (fail-soft): %s", e, exc_info=True)
+        _fail_soft("/api/v1/sku/embed", "degraded")
         return {
             "vector": None,
-            "model": EMBED_MODEL,
-            "dimensions": EMBED_DIMENSIONS,
+            "model": model,
+            "dimensions": default_dims,
             "degraded": True,
             "error_message": str(e),
         }
 
 
 @app.post("/api/v1/sku/similarity")
-def sku_similarity(body: SimilarityRequest):
+async def sku_similarity(body: SimilarityRequest):
     """
     POST /api/v1/sku/similarity — cosine similarity vs cluster centroid (cached in Redis).
     Fail-soft (v2.3.2): on embedding API or cluster cache failure, return status 'pending' so save is allowed; do not 500.
@@ -160,13 +398,14 @@ def sku_similarity(body: SimilarityRequest):
     if not description or not cluster_id:
         return JSONResponse(status_code=400, content={"error": "description and cluster_id required"})
     try:
-        sku_vector = get_embedding(description)
-        result = validate_cluster_match(sku_vector, cluster_id)
+        sku_vector = await get_embedding_async(description)
+        result = await avalidate_cluster_match(sku_vector, cluster_id)
         sim = result.get("similarity", 0.0)
         reason = result.get("reason") or ""
         # Cluster not in Redis = validation unavailable; fail-soft to pending so save is allowed
         if sim == 0.0 and "not initialized" in reason.lower():
             logger.warning("Similarity unavailable (cluster not in cache): cluster_id=%s", cluster_id)
+            _fail_soft("/api/v1/sku/similarity", "pending")
             return {
                 "cosine_similarity": 0.0,
                 "threshold": SIMILARITY_THRESHOLD,
@@ -185,6 +424,7 @@ def sku_similarity(body: SimilarityRequest):
             "Similarity validation unavailable (fail-soft): cluster_id=%s error=%s",
             cluster_id, e, exc_info=True,
         )
+        _fail_soft("/api/v1/sku/similarity", "pending")
         return {
             "cosine_similarity": 0.0,
             "threshold": SIMILARITY_THRESHOLD,
@@ -194,6 +434,100 @@ def sku_similarity(body: SimilarityRequest):
         }
 
 
+# Upper bound on k for /api/v1/sku/nearest-clusters
+NEAREST_CLUSTERS_MAX_K = 20
+
+
+@app.post("/api/v1/sku/nearest-clusters")
+async def sku_nearest_clusters(body: NearestClustersRequest):
+    """
+    POST /api/v1/sku/nearest-clusters — top-k clusters for a description, from one product against
+    the all-clusters centroid matrix. Lets editors see the right cluster when G1/G4 fail.
+    Fail-soft (v2.3.2): on embedding API or cluster cache failure, return status 'pending' with no clusters.
+    """
+    description = (body.description or "").strip()
+    if not description:
+        return JSONResponse(status_code=400, content={"error": "description required"})
+    k = max(1, min(body.k or 5, NEAREST_CLUSTERS_MAX_K))
+    try:
+        sku_vector = await get_embedding_async(description)
+        if sku_vector is None:
+            raise RuntimeError("embedding unavailable")
+        clusters = await anearest_clusters(sku_vector, k)
+        if not clusters:
+            _fail_soft("/api/v1/sku/nearest-clusters", "pending")
+        return {
+            "clusters": clusters,
+            "threshold": SIMILARITY_THRESHOLD,
+            "status": "ok" if clusters else "pending",
+            "message": None if clusters else PENDING_MESSAGE,
+        }
+    except Exception as e:
+        logger.warning("Nearest clusters unavailable (fail-soft): %s", e, exc_info=True)
+        _fail_soft("/api/v1/sku/nearest-clusters", "pending")
+        return {
+            "clusters": [],
+            "threshold": SIMILARITY_THRESHOLD,
+            "status": "pending",
+            "message": PENDING_MESSAGE,
+            "degraded_mode": True,
+        }
+
+
+# Upper bound on k for /api/v1/sku/near-duplicates
+NEAR_DUPLICATES_MAX_K = 50
+
+
+def _near_duplicates(sku_id: Optional[str], vector: Optional[list], k: int):
+    db = get_db()
+    try:
+        if vector is None:
+            return stored_near_duplicates(db, sku_id, k)
+        return query_near_duplicates(db, vector, k, exclude_sku_id=sku_id)
+    finally:
+        db.close()
+
+
+@app.post("/api/v1/sku/near-duplicates")
+async def sku_near_duplicates(body: NearDuplicatesRequest):
+    """
+    POST /api/v1/sku/near-duplicates — SKUs whose description is nearly identical (colour / length variants).
+    With sku_id only: pairs recorded by the nightly scan. With description: LSH lookup against the saved
+    index, scored against the stored vectors (excluding sku_id if given).
+    Fail-soft (v2.3.2): on embedding, index or DB failure, return status 'pending' with no duplicates.
+    """
+    description = (body.description or "").strip()
+    sku_id = (body.sku_id or "").strip() or None
+    if not description and not sku_id:
+        return JSONResponse(status_code=400, content={"error": "description or sku_id required"})
+    k = max(1, min(body.k or 10, NEAR_DUPLICATES_MAX_K))
+    try:
+        vector = None
+        if description:
+            vector = await get_embedding_async(description)
+            if vector is None:
+                raise RuntimeError("embedding unavailable")
+        duplicates = await asyncio.to_thread(_near_duplicates, sku_id, vector, k)
+        if duplicates is None:
+            _fail_soft("/api/v1/sku/near-duplicates", "pending")
+        return {
+            "duplicates": duplicates or [],
+            "threshold": NEAR_DUP_THRESHOLD,
+            "status": "ok" if duplicates is not None else "pending",
+            "message": None if duplicates is not None else "Near-duplicate index not built yet.",
+        }
+    except Exception as e:
+        logger.warning("Near-duplicate lookup unavailable (fail-soft): %s", e, exc_info=True)
+        _fail_soft("/api/v1/sku/near-duplicates", "pending")
+        return {
+            "duplicates": [],
+            "threshold": NEAR_DUP_THRESHOLD,
+            "status": "pending",
+            "message": "Near-duplicate lookup temporarily unavailable.",
+            "degraded_mode": True,
+        }
+
+
 @app.post("/api/v1/title/validate")
 def title_validate(body: TitleValidateRequest):
     """
@@ -214,12 +548,56 @@ def title_suggest(body: TitleSuggestRequest):
     return {"suggested_title": suggested, "max_length": 250}
 
 
+def _load_gate_status(sku_id: str) -> dict[str, dict[str, Any]]:
+    db = get_db()
+    try:
+        return load_gate_status(db, sku_id)
+    finally:
+        db.close()
+
+
+def _save_gate_status(sku_id: str, tier: Optional[str], runs: list) -> None:
+    db = get_db()
+    try:
+        save_gate_status(db, sku_id, tier, runs)
+    finally:
+        db.close()
+
+
+GATE_METRIC_TIERS = ("hero", "support", "harvest", "kill")
+
+
+def _observe_gates(runs: list, tier: Optional[str]) -> list[dict[str, Any]]:
+    """Record per-gate duration and outcome metrics; returns the per-gate debug entries."""
+    tier_label = (tier or "").strip().lower()
+    if tier_label not in GATE_METRIC_TIERS:
+        tier_label = "unknown"
+    entries = []
+    for run in runs:
+        outcome = "skip" if run.skipped else ("fail" if run.failure else "pass")
+        error_code = run.failure.error_code if run.failure else ""
+        GATE_OUTCOMES.labels(run.gate.code, tier_label, outcome, error_code).inc()
+        if not run.skipped:
+            GATE_DURATION_SECONDS.labels(run.gate.code, tier_label).observe(run.seconds)
+        entries.append({
+            "gate": run.gate.code,
+            "outcome": outcome,
+            "error_code": error_code or None,
+            "ms": round(run.seconds * 1000, 3),
+        })
+    return entries
+
+
 @app.post("/api/v1/sku/validate")
 async def sku_validate(request: Request):
     """
     Pre-publish validation (G1–G7 + G6.1). CIE v2.3.1 Section 7.2.
     200 + status:pass if all pass; 400 + status:fail for invalid body or gate failures.
+    With sku_id, gates whose inputs are unchanged since the stored outcome are not re-run
+    (listed in skipped_gates); if sku_gate_status is unreachable every gate runs.
+    ?debug=true adds per-gate outcome and timing plus stored-status load / save time.
     """
+    started = time.perf_counter()
     try:
         body = await request.json()
     except Exception as e:
@@ -246,23 +624,69 @@ async def sku_validate(request: Request):
                 "message": "Validation error.",
             },
         )
-    failures = run_all_gates(data, MASTER_CLUSTER_IDS)
+    sku_id = (data.sku_id or "").strip()
+    previous = None
+    loaded = saved = time.perf_counter()
+    if SKU_VALIDATE_INCREMENTAL and sku_id:
+        try:
+            previous = await asyncio.to_thread(_load_gate_status, sku_id)
+        except Exception as e:
+            logger.warning("Gate status unavailable for %s, running all gates: %s", sku_id, e)
+        loaded = time.perf_counter()
+    runs = evaluate_gates(data, MASTER_CLUSTER_IDS, previous)
+    evaluated = time.perf_counter()
+    if previous is not None and any(not run.skipped for run in runs):
+        try:
+            await asyncio.to_thread(_save_gate_status, sku_id, data.tier, runs)
+        except Exception as e:
+            # sku_gate_status is keyed on canonical sku_master; legacy-only SKUs have no row there
+            logger.warning("Could not write sku_gate_status for %s: %s", sku_id, e)
+    saved = time.perf_counter()
+    gate_entries = _observe_gates(runs, data.tier)
+    debug = None
+    if request.query_params.get("debug", "").strip().lower() in ("1", "true", "yes"):
+        debug = {
+            "gates": gate_entries,
+            "status_load_ms": round((loaded - started) * 1000, 3) if previous is not None else None,
+            "gates_ms": round((evaluated - loaded) * 1000, 3),
+            "status_save_ms": round((saved - evaluated) * 1000, 3),
+            "total_ms": round((saved - started) * 1000, 3),
+        }
+    failures = [run.failure for run in runs if run.failure]
+    skipped_gates = [run.gate.code for run in runs if run.skipped]
     if not failures:
         return JSONResponse(
             status_code=200,
-            content=SkuValidateResponsePass(message="All gates passed.").model_dump(),
+            content=SkuValidateResponsePass(
+                message="All gates passed.", skipped_gates=skipped_gates, debug=debug,
+            ).model_dump(exclude_none=True),
         )
     return JSONResponse(
         status_code=400,
         content=SkuValidateResponseFail(
             failures=failures,
             message="One or more gates failed.",
-        ).model_dump(),
+            skipped_gates=skipped_gates,
+            debug=debug,
+        ).model_dump(exclude_none=True),
+    )
+
+
+@app.post("/api/v1/sku/validate/bulk")
+async def sku_validate_bulk(request: Request):
+    """
+    Bulk pre-publish validation for compliance sweeps: NDJSON or JSON array of validate bodies in,
+    NDJSON out — one {index, sku_id, status, failures} line per SKU as it is validated, then a
+    {"summary": {total, passed, failed, error_codes}} line. Body is streamed; memory stays bounded.
+    """
+    return StreamingResponse(
+        validate_bulk_stream(iter_json_records(request.stream()), MASTER_CLUSTER_IDS),
+        media_type="application/x-ndjson",
     )
 
 
 @app.post("/validate-vector")
-def validate_vector(body: ValidateVectorRequest):
+async def validate_vector(body: ValidateVectorRequest):
     """Validate SKU description against cluster vectors. Fail-soft: return 200 with degraded on error (no 500)."""
     description = body.description or ""
     cluster_id = body.cluster_id or ""
@@ -273,11 +697,12 @@ def validate_vector(body: ValidateVectorRequest):
             content={"valid": False, "similarity": 0.0, "reason": "description and cluster_id required"},
         )
     try:
-        sku_vector = get_embedding(description)
-        result = validate_cluster_match(sku_vector, cluster_id)
+        sku_vector = await get_embedding_async(description)
+        result = await avalidate_cluster_match(sku_vector, cluster_id)
         return result
     except Exception as e:
         logger.warning("validate-vector fail-soft: %s", e)
+        _fail_soft("/validate-vector", "degraded")
         # Return 200 with degraded so clients don't treat as server error; save allowed, publish blocked
         return JSONResponse(
             status_code=200,
@@ -291,66 +716,246 @@ def validate_vector(body: ValidateVectorRequest):
         )
 
 
+# Upper bound on items per /validate-vector/batch call (embedding is chunked by EMBED_BATCH_SIZE)
+VECTOR_BATCH_MAX_ITEMS = int(os.environ.get("CIE_VECTOR_BATCH_MAX_ITEMS", "1000"))
+
+
+@app.post("/validate-vector/batch")
+async def validate_vector_batch(body: ValidateVectorBatchRequest):
+    """
+    Batch form of /validate-vector for bulk imports / re-publish. Embeds all descriptions in chunked
+    multi-input calls and scores them against their centroids in one pass.
+    Returns one result per item, in request order; per-item fail-soft semantics match /validate-vector.
+    """
+    items = body.items or []
+    if not items:
+        return JSONResponse(status_code=400, content={"error": "items required"})
+    if len(items) > VECTOR_BATCH_MAX_ITEMS:
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"at most {VECTOR_BATCH_MAX_ITEMS} items per batch"},
+        )
+
+    results: list[Optional[dict[str, Any]]] = [None] * len(items)
+    pending: list[int] = []
+    for i, item in enumerate(items):
+        if not item.description or not item.cluster_id:
+            results[i] = {
+                "sku_id": item.sku_id or "unknown",
+                "valid": False,
+                "similarity": 0.0,
+                "reason": "description and cluster_id required",
+            }
+        else:
+            pending.append(i)
+
+    if pending:
+        try:
+            vectors = await get_embeddings_async([items[i].description for i in pending])
+            matches = await avalidate_cluster_matches(vectors, [items[i].cluster_id for i in pending])
+            for i, match in zip(pending, matches):
+                results[i] = {"sku_id": items[i].sku_id or "unknown", **match}
+        except Exception as e:
+            logger.warning("validate-vector batch fail-soft: %s", e)
+            _fail_soft("/validate-vector/batch", "degraded", len(pending))
+            for i in pending:
+                results[i] = {
+                    "sku_id": items[i].sku_id or "unknown",
+                    "valid": False,
+                    "similarity": 0.0,
+                    "reason": "Vector validation temporarily unavailable. Save allowed, publish blocked.",
+                    "degraded": True,
+                    "error_message": str(e),
+                }
+
+    return {"results": results, "count": len(results)}
+
+
+def _job_response(job: dict[str, Any], id_field: str) -> dict[str, Any]:
+    """Job record in the shape the Flask queue endpoints returned, plus result / error once finished."""
+    response = {**job["payload"], "status": job["status"], id_field: job["id"], "attempts": job["attempts"]}
+    if "result" in job:
+        response["result"] = job["result"]
+    if job.get("error"):
+        response["error"] = job["error"]
+    return response
+
+
+async def _read_job(job_id: str) -> Optional[dict[str, Any]]:
+    try:
+        return await job_queue.get(job_id)
+    except Exception as e:
+        logger.warning("Job store unavailable reading %s: %s", job_id, e)
+        return None
+
+
+async def _get_job(job_id: str, job_type: str, id_field: str):
+    job = await _read_job(job_id)
+    if job is None or job.get("type") != job_type:
+        return JSONResponse(status_code=202, content={"status": "pending"})
+    return _job_response(job, id_field)
+
+
+async def _audit_content_digest(sku_id: str) -> str:
+    """Digest of the SKU text the audit reads; unique when the SKU cannot be read, so nothing is deduplicated against it."""
+    try:
+        sku = await asyncio.to_thread(load_sku, sku_id)
+    except Exception as e:
+        logger.warning("SKU lookup for audit digest failed for sku_id=%s: %s", sku_id, e)
+        sku = None
+    if sku is None:
+        return uuid.uuid4().hex
+    return audit_content_digest(sku["title"], sku["long_description"])
+
+
 @app.post("/queue/audit")
-def queue_audit(body: QueueAuditRequest):
-    """Queue an AI audit job — same JSON as Flask."""
+async def queue_audit(body: QueueAuditRequest):
+    """
+    Queue an AI audit job — same JSON as Flask; the job is stored in Redis for the worker pool.
+    Idempotent per SKU content: a duplicate enqueue (same title / long description, see
+    content_digest) returns the existing audit_id with duplicate=true.
+    Optional tier / decay_status pick the priority lane; category is the fair-share group.
+    Optional callback_url receives the finished job; /jobs/{audit_id}/events streams it.
+    """
     sku_id = body.sku_id
     if not sku_id:
         return JSONResponse(status_code=400, content={"error": "sku_id required"})
-    audit_id = str(uuid.uuid4())
-    audit_queue[audit_id] = {
-        "sku_id": sku_id,
-        "status": "queued",
-        "audit_id": audit_id,
-    }
+    if body.callback_url and not callback_url_allowed(body.callback_url):
+        return JSONResponse(status_code=400, content={"error": "callback_url not allowed"})
+    content_digest = body.content_digest or await _audit_content_digest(sku_id)
+    try:
+        audit_id, created = await job_queue.enqueue(
+            "audit", {"sku_id": sku_id}, sku_id=sku_id, content_digest=content_digest,
+            lane=lane_for(body.tier, body.decay_status), category=body.category, callback_url=body.callback_url,
+        )
+    except Exception as e:
+        logger.error("Audit enqueue failed for sku_id=%s: %s", sku_id, e)
+        return JSONResponse(status_code=503, content={"queued": False, "error": "Job queue unavailable"})
     return JSONResponse(
         status_code=202,
         content={
             "queued": True,
             "audit_id": audit_id,
-            "message": "Audit job queued",
+            "duplicate": not created,
+            "message": "Audit job queued" if created else "Audit already queued for this SKU",
         },
     )
 
 
 @app.post("/queue/brief-generation")
-def queue_brief_generation(body: QueueBriefRequest):
-    """Queue a brief generation job — same JSON as Flask."""
+async def queue_brief_generation(body: QueueBriefRequest):
+    """
+    Queue a brief generation job — same JSON as Flask; the job is stored in Redis for the worker pool.
+    Idempotent per SKU and title: a duplicate enqueue returns the existing brief_id with duplicate=true.
+    Optional tier / decay_status pick the priority lane; category is the fair-share group.
+    Optional callback_url receives the finished job; /jobs/{brief_id}/events streams it.
+    """
     sku_id = body.sku_id
     title = body.title
     if not sku_id or not title:
         return JSONResponse(status_code=400, content={"error": "sku_id and title required"})
-    brief_id = str(uuid.uuid4())
-    brief_queue[brief_id] = {
-        "sku_id": sku_id,
-        "title": title,
-        "status": "queued",
-        "brief_id": brief_id,
-    }
+    if body.callback_url and not callback_url_allowed(body.callback_url):
+        return JSONResponse(status_code=400, content={"error": "callback_url not allowed"})
+    try:
+        brief_id, created = await job_queue.enqueue(
+            "brief", {"sku_id": sku_id, "title": title}, sku_id=sku_id,
+            lane=lane_for(body.tier, body.decay_status), category=body.category, callback_url=body.callback_url,
+        )
+    except Exception as e:
+        logger.error("Brief enqueue failed for sku_id=%s: %s", sku_id, e)
+        return JSONResponse(status_code=503, content={"queued": False, "error": "Job queue unavailable"})
     return JSONResponse(
         status_code=202,
         content={
             "queued": True,
             "brief_id": brief_id,
-            "message": "Brief generation job queued",
+            "duplicate": not created,
+            "message": "Brief generation job queued" if created else "Brief generation already queued for this SKU",
         },
     )
 
 
 @app.get("/audits/{audit_id}")
-def get_audit_result(audit_id: str):
-    """Get audit result (polling) — same JSON as Flask."""
-    if audit_id in audit_queue:
-        return audit_queue[audit_id]
-    return JSONResponse(status_code=202, content={"status": "pending"})
+async def get_audit_result(audit_id: str):
+    """Get audit result (polling) — job status from the shared job store; 202 pending if unknown."""
+    return await _get_job(audit_id, "audit", "audit_id")
 
 
 @app.get("/briefs/{brief_id}")
-def get_brief_result(brief_id: str):
-    """Get brief generation result (polling) — same JSON as Flask."""
-    if brief_id in brief_queue:
-        return brief_queue[brief_id]
-    return JSONResponse(status_code=202, content={"status": "pending"})
+async def get_brief_result(brief_id: str):
+    """Get brief generation result (polling) — job status from the shared job store; 202 pending if unknown."""
+    return await _get_job(brief_id, "brief", "brief_id")
+
+
+# Server-Sent Events instead of polling /audits and /briefs
+JOB_EVENTS_HEARTBEAT_SECONDS = float(os.getenv("JOB_EVENTS_HEARTBEAT_SECONDS", "15"))
+JOB_EVENTS_MAX_SECONDS = float(os.getenv("JOB_EVENTS_MAX_SECONDS", "600"))
+JOB_EVENTS_MAX_IDS = 100
+JOB_ID_FIELDS = {"audit": "audit_id", "brief": "brief_id"}
+FINISHED_JOB_STATUSES = ("completed", "failed")
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _job_event_stream(job_ids: list[str]):
+    """
+    One SSE event per job as it finishes (event: completed / failed, data: the polling response),
+    then the stream ends. Stored status is re-read on each heartbeat; after JOB_EVENTS_MAX_SECONDS
+    a timeout event lists the jobs still pending so the client can reconnect or fall back to polling.
+    """
+    queue = job_events.subscribe(job_ids)
+    pending = set(job_ids)
+    deadline = asyncio.get_running_loop().time() + JOB_EVENTS_MAX_SECONDS
+    try:
+        yield f"retry: {int(JOB_EVENTS_HEARTBEAT_SECONDS * 1000)}\n\n"
+        check = list(pending)
+        while True:
+            for job_id in check:
+                job = await _read_job(job_id)
+                if job is not None and job["status"] in FINISHED_JOB_STATUSES and job_id in pending:
+                    pending.discard(job_id)
+                    yield _sse(job["status"], _job_response(job, JOB_ID_FIELDS.get(job["type"], "job_id")))
+            if not pending:
+                return
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                yield _sse("timeout", {"pending": sorted(pending)})
+                return
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=min(JOB_EVENTS_HEARTBEAT_SECONDS, remaining))
+                check = [event["id"]]
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                check = list(pending)
+    finally:
+        job_events.unsubscribe(job_ids, queue)
+
+
+def _event_stream_response(job_ids: list[str]) -> StreamingResponse:
+    return StreamingResponse(
+        _job_event_stream(job_ids),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events_stream(job_id: str):
+    """SSE stream that emits the job (audit_id or brief_id) once it completes or fails, then closes."""
+    return _event_stream_response([job_id])
+
+
+@app.get("/jobs/events")
+async def jobs_events_stream(ids: str = Query("")):
+    """SSE stream for a client's jobs (?ids=a,b,c): one event per job as it finishes; closes when all have."""
+    job_ids = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if not job_ids:
+        return JSONResponse(status_code=400, content={"error": "ids required"})
+    if len(job_ids) > JOB_EVENTS_MAX_IDS:
+        return JSONResponse(status_code=400, content={"error": f"at most {JOB_EVENTS_MAX_IDS} ids per stream"})
+    return _event_stream_response(job_ids)
 
 
 if __name__ == "__main__":
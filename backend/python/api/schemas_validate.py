@@ -1,7 +1,7 @@
 """
 Pydantic schemas for POST /api/v1/sku/validate (CIE v2.3.1 Section 7.2/7.3).
 """
-from typing import Literal
+from typing import Any, Literal
 from pydantic import BaseModel, Field
 
 
@@ -40,9 +40,15 @@ class FailureItem(BaseModel):
 class SkuValidateResponsePass(BaseModel):
     status: Literal["pass"] = "pass"
     message: str = "All gates passed."
+    # Gates whose inputs were unchanged since their stored outcome, which was reused
+    skipped_gates: list[str] = Field(default_factory=list)
+    # Per-gate outcome / timing, only with ?debug=true
+    debug: dict[str, Any] | None = None
 
 
 class SkuValidateResponseFail(BaseModel):
     status: Literal["fail"] = "fail"
     failures: list[FailureItem]
     message: str = "One or more gates failed."
+    skipped_gates: list[str] = Field(default_factory=list)
+    debug: dict[str, Any] | None = None
@@ -0,0 +1,166 @@
+"""
+Bulk gate validation for POST /api/v1/sku/validate/bulk.
+
+The request body is NDJSON (one SKU object per line) or a JSON array of SKU objects; it is read
+and decoded incrementally, so memory stays bounded by one chunk plus one record however large the
+sweep. Each SKU runs through run_all_gates and its result is written back as one NDJSON line as
+soon as it is produced; the last line carries pass / fail totals and counts per gate error code.
+"""
+from __future__ import annotations
+
+import codecs
+import json
+import os
+import time
+from collections import Counter
+from typing import Any, AsyncIterator, Optional
+
+from .gates_validate import run_all_gates
+from .schemas_validate import SkuValidateRequest
+
+BULK_MAX_RECORD_BYTES = int(os.environ.get("SKU_VALIDATE_BULK_MAX_RECORD_BYTES", str(1024 * 1024)))
+# Result lines are flushed to the client in groups of this many, or after this long
+BULK_FLUSH_RECORDS = 200
+BULK_FLUSH_SECONDS = 0.25
+
+_WHITESPACE = " \t\r\n"
+
+
+async def iter_json_records(
+    chunks: AsyncIterator[bytes], max_record_bytes: int = BULK_MAX_RECORD_BYTES
+) -> AsyncIterator[tuple[Any, Optional[str]]]:
+    """
+    Yield (record, None) for each record of an NDJSON or JSON-array body, or (None, error) for a
+    record that cannot be decoded. NDJSON resumes at the next line; a broken array ends the stream.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buf = ""
+    mode = None  # "array" or "ndjson"
+    eof = False
+    skipping_line = False
+    source = chunks.__aiter__()
+
+    async def more() -> bool:
+        nonlocal buf, eof
+        try:
+            chunk = await source.__anext__()
+        except StopAsyncIteration:
+            buf += utf8.decode(b"", final=True)
+            eof = True
+            return False
+        buf += utf8.decode(chunk)
+        return True
+
+    while mode is None:
+        buf = buf.lstrip(_WHITESPACE + "\ufeff")
+        if buf:
+            mode = "array" if buf[0] == "[" else "ndjson"
+            if mode == "array":
+                buf = buf[1:]
+        elif not await more():
+            return
+
+    if mode == "ndjson":
+        while True:
+            while "\n" in buf:
+                line, buf = buf.split("\n", 1)
+                if skipping_line:
+                    skipping_line = False
+                    continue
+                line = line.strip()
+                if line:
+                    yield _decode_line(line)
+            if len(buf) > max_record_bytes and not skipping_line:
+                yield None, f"Record exceeds {max_record_bytes} bytes."
+                skipping_line = True
+            if skipping_line:
+                buf = ""
+            if eof:
+                break
+            await more()
+        if buf.strip() and not skipping_line:
+            yield _decode_line(buf.strip())
+        return
+
+    pos = 0
+    while True:
+        while pos < len(buf) and (buf[pos] in _WHITESPACE or buf[pos] == ","):
+            pos += 1
+        if pos < len(buf) and buf[pos] == "]":
+            return
+        if pos < len(buf):
+            try:
+                record, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError as e:
+                if eof:
+                    yield None, f"Invalid JSON: {e}"
+                    return
+                if len(buf) - pos > max_record_bytes:
+                    yield None, f"Record exceeds {max_record_bytes} bytes."
+                    return
+            else:
+                yield record, None
+                buf, pos = buf[end:], 0
+                continue
+        elif eof:
+            yield None, "Unterminated JSON array."
+            return
+        buf, pos = buf[pos:], 0
+        await more()
+
+
+def _decode_line(line: str) -> tuple[Any, Optional[str]]:
+    try:
+        return json.loads(line), None
+    except ValueError as e:
+        return None, f"Invalid JSON: {e}"
+
+
+def validate_record(index: int, record: Any, error: Optional[str], master_cluster_ids: set[str]) -> dict[str, Any]:
+    """One result line: the same failures POST /api/v1/sku/validate would return for this record."""
+    sku_id = record.get("sku_id") if isinstance(record, dict) else None
+    if error is not None:
+        failures = [{"error_code": "INVALID_JSON", "detail": error, "user_message": "Record must be valid JSON."}]
+    else:
+        try:
+            data = SkuValidateRequest.model_validate(record)
+        except Exception as e:
+            failures = [{
+                "error_code": "VALIDATION_ERROR",
+                "detail": str(e),
+                "user_message": "Request fields did not match the required schema.",
+            }]
+        else:
+            failures = [f.model_dump() for f in run_all_gates(data, master_cluster_ids)]
+    result: dict[str, Any] = {"index": index, "sku_id": sku_id, "status": "fail" if failures else "pass"}
+    if failures:
+        result["failures"] = failures
+    return result
+
+
+async def validate_bulk_stream(
+    records: AsyncIterator[tuple[Any, Optional[str]]], master_cluster_ids: set[str]
+) -> AsyncIterator[str]:
+    """NDJSON result lines in input order, then {"summary": {total, passed, failed, error_codes}}."""
+    error_codes: Counter[str] = Counter()
+    passed = failed = 0
+    lines: list[str] = []
+    index = 0
+    flushed_at = time.monotonic()
+    async for record, error in records:
+        result = validate_record(index, record, error, master_cluster_ids)
+        index += 1
+        if result["status"] == "pass":
+            passed += 1
+        else:
+            failed += 1
+            error_codes.update(f["error_code"] for f in result["failures"])
+        lines.append(json.dumps(result, default=str))
+        if len(lines) >= BULK_FLUSH_RECORDS or time.monotonic() - flushed_at >= BULK_FLUSH_SECONDS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+            flushed_at = time.monotonic()
+    summary = {"total": index, "passed": passed, "failed": failed, "error_codes": dict(error_codes.most_common())}
+    lines.append(json.dumps({"summary": summary}))
+    yield "\n".join(lines) + "\n"
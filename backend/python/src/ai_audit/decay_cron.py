@@ -251,12 +251,22 @@ def default_brief_generate_hook(payload: Dict[str, Any]) -> None:
             return
         resp = requests.post(
             url,
-            json={"sku_id": sku_id, "title": title},
+            json={
+                "sku_id": sku_id,
+                "title": title,
+                # Hero SKUs in decay go to the urgent lane ahead of bulk re-audits
+                "tier": payload.get("tier"),
+                "decay_status": payload.get("decay_status"),
+                "category": payload.get("category"),
+            },
             timeout=5,
         )
         if resp.status_code in (200, 202):
             data = resp.json() or {}
-            logger.info("Auto-brief queued for sku_id=%s: %s", sku_id, data.get("brief_id"))
+            if data.get("duplicate"):
+                logger.info("Auto-brief already queued for sku_id=%s: %s", sku_id, data.get("brief_id"))
+            else:
+                logger.info("Auto-brief queued for sku_id=%s: %s", sku_id, data.get("brief_id"))
         else:
             logger.error("Auto-brief queue failed for sku_id=%s: %s %s", sku_id, resp.status_code, resp.text[:200])
     except Exception as e:
@@ -392,6 +402,8 @@ def run_decay_escalation(
                     failing_questions=failing_qs,
                     competitor_answers=competitor_answers,
                 )
+                payload["category"] = category
+                payload["decay_status"] = status
                 try:
                     brief_generate_hook(payload)
                     action["auto_brief_generated"] = True
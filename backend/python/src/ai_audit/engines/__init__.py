@@ -0,0 +1,6 @@
+# CIE — AI citation audit engines used by AuditEngine
+
+from .openai_engine import OpenAIEngine
+from .anthropic_engine import AnthropicEngine
+
+__all__ = ["OpenAIEngine", "AnthropicEngine"]
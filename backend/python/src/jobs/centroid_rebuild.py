@@ -0,0 +1,261 @@
+"""
+Centroid rebuild pipeline: cluster centroids derived from sku_vectors (v2.3.1 §8.2.1).
+
+- Streams SKU vectors per cluster from MySQL with a server-side cursor, ordered by cluster, so only
+  one cluster's running sum is held at a time.
+- Centroid = mean of the L2-normalized member vectors, accumulated as a running float64 sum.
+- Each flush of clusters gets one version stamp (shared with cluster_cache) and is written to
+  cluster_vectors and Redis together: the DB transaction commits only after the Redis MULTI/EXEC
+  (SET + invalidation PUBLISH) succeeds, and is rolled back otherwise.
+- Vectors are read and written through src.vector.codec: member rows may still carry the legacy JSON
+  column, centroids are always written to vector_blob (migration 036).
+- After the rebuild, the shared memory-mapped centroid file is re-exported (centroid_store_export) so
+  uvicorn workers on this host stop falling back to Redis for the rebuilt clusters.
+
+Modes:
+- full        — rebuild every cluster that has member vectors.
+- incremental — rebuild only clusters with no centroid yet, with member vectors or SKUs updated
+                since the cluster's built_at, or whose member count changed (SKUs moved or removed).
+
+Run from backend/python:  python -m src.jobs.centroid_rebuild [--mode full|incremental]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+STREAM_BATCH = int(os.environ.get("CENTROID_REBUILD_STREAM_BATCH", "1000"))
+FLUSH_CLUSTERS = int(os.environ.get("CENTROID_REBUILD_FLUSH_CLUSTERS", "100"))
+
+_MEMBERS_SQL = """
+    SELECT s.primary_cluster_id, sv.vector_blob, sv.vector
+    FROM sku_vectors sv
+    JOIN skus s ON s.id = sv.sku_id
+    WHERE s.primary_cluster_id IS NOT NULL {cluster_filter}
+    ORDER BY s.primary_cluster_id
+"""
+
+
+def stream_cluster_sums(reader, cluster_ids: Optional[Sequence[str]] = None) -> Iterator[Tuple[str, np.ndarray, int]]:
+    """
+    Yield (cluster_id, sum of normalized member vectors, member count) per cluster, reading
+    sku_vectors through the reader connection's server-side cursor in STREAM_BATCH chunks.
+    """
+    cluster_filter = ""
+    params: Tuple[Any, ...] = ()
+    if cluster_ids is not None:
+        if not cluster_ids:
+            return
+        cluster_filter = f"AND s.primary_cluster_id IN ({','.join(['%s'] * len(cluster_ids))})"
+        params = tuple(cluster_ids)
+
+    cur = reader.cursor()
+    cur.execute(_MEMBERS_SQL.format(cluster_filter=cluster_filter), params)
+    current: Optional[str] = None
+    total: Optional[np.ndarray] = None
+    count = 0
+    try:
+        while True:
+            rows = cur.fetchmany(STREAM_BATCH)
+            if not rows:
+                break
+            # Rows arrive ordered by cluster: sum each contiguous run as one matrix
+            start = 0
+            while start < len(rows):
+                cluster_id = rows[start][0]
+                end = start
+                while end < len(rows) and rows[end][0] == cluster_id:
+                    end += 1
+                if cluster_id != current:
+                    if current is not None and count:
+                        yield current, total, count
+                    current, total, count = cluster_id, None, 0
+                chunk_sum, chunk_count = _sum_normalized([r[1:] for r in rows[start:end]], current)
+                if chunk_count:
+                    total = chunk_sum if total is None else total + chunk_sum
+                    count += chunk_count
+                start = end
+        if current is not None and count:
+            yield current, total, count
+    finally:
+        cur.close()
+
+
+def _sum_normalized(raw_vectors: Sequence[Tuple[Any, Any]], cluster_id: str) -> Tuple[Optional[np.ndarray], int]:
+    from src.vector import codec
+
+    rows = []
+    for blob, legacy in raw_vectors:
+        try:
+            vector = codec.decode_row(blob, legacy)
+        except Exception as e:
+            logger.warning("Skipping unreadable SKU vector in cluster %s: %s", cluster_id, e)
+            continue
+        if vector is not None:
+            rows.append(vector.astype(np.float64))
+    if not rows:
+        return None, 0
+    dims = rows[0].shape[0]
+    kept = [v for v in rows if v.shape[0] == dims]
+    if len(kept) != len(rows):
+        logger.warning("Skipping %d SKU vectors with mismatched dims in cluster %s", len(rows) - len(kept), cluster_id)
+    matrix = np.vstack(kept)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix = matrix[norms[:, 0] > 0] / norms[norms[:, 0] > 0]
+    return matrix.sum(axis=0), matrix.shape[0]
+
+
+def changed_cluster_ids(db) -> List[str]:
+    """Clusters whose centroid is missing or stale relative to their member vectors (incremental mode)."""
+    cur = db.cursor()
+    cur.execute(
+        """
+        SELECT DISTINCT s.primary_cluster_id
+        FROM sku_vectors sv
+        JOIN skus s ON s.id = sv.sku_id
+        LEFT JOIN cluster_vectors cv ON cv.cluster_id = s.primary_cluster_id
+        WHERE s.primary_cluster_id IS NOT NULL
+          AND (cv.cluster_id IS NULL OR cv.built_at IS NULL
+               OR sv.updated_at > cv.built_at OR s.updated_at > cv.built_at)
+        """
+    )
+    changed = {row[0] for row in cur.fetchall()}
+    cur.execute(
+        """
+        SELECT cv.cluster_id
+        FROM cluster_vectors cv
+        LEFT JOIN (
+            SELECT s.primary_cluster_id AS cluster_id, COUNT(*) AS members
+            FROM sku_vectors sv
+            JOIN skus s ON s.id = sv.sku_id
+            WHERE s.primary_cluster_id IS NOT NULL
+            GROUP BY s.primary_cluster_id
+        ) m ON m.cluster_id = cv.cluster_id
+        WHERE COALESCE(m.members, 0) <> cv.member_count
+        """
+    )
+    changed.update(row[0] for row in cur.fetchall())
+    cur.close()
+    return sorted(changed)
+
+
+def _write_db(db, centroids: Dict[str, Tuple[np.ndarray, int]], version: int) -> None:
+    from src.vector import codec
+
+    cur = db.cursor()
+    for cluster_id, (centroid, members) in centroids.items():
+        blob = codec.encode(centroid)
+        cur.execute(
+            """
+            UPDATE cluster_vectors
+            SET vector_blob = %s, vector = NULL, version = %s, member_count = %s, built_at = NOW()
+            WHERE cluster_id = %s
+            """,
+            (blob, version, members, cluster_id),
+        )
+        if cur.rowcount == 0:
+            cur.execute(
+                """
+                INSERT INTO cluster_vectors (cluster_id, vector_blob, version, member_count, built_at)
+                VALUES (%s, %s, %s, %s, NOW())
+                """,
+                (cluster_id, blob, version, members),
+            )
+    cur.close()
+
+
+def _mark_emptied(db, cluster_ids: Sequence[str]) -> None:
+    """Clusters that lost all member vectors keep their last centroid but stop showing as changed."""
+    if not cluster_ids:
+        return
+    cur = db.cursor()
+    cur.execute(
+        f"""
+        UPDATE cluster_vectors
+        SET member_count = 0, built_at = NOW()
+        WHERE cluster_id IN ({','.join(['%s'] * len(cluster_ids))})
+        """,
+        tuple(cluster_ids),
+    )
+    cur.close()
+    db.commit()
+
+
+def _flush(db, pending: Dict[str, Tuple[np.ndarray, int]]) -> int:
+    """Write one group of centroids to cluster_vectors and Redis under a single version stamp."""
+    from src.vector import cluster_cache
+
+    version = cluster_cache.next_version()
+    try:
+        _write_db(db, pending, version)
+        cluster_cache.cache_cluster_vectors({cid: c for cid, (c, _) in pending.items()}, version)
+    except Exception:
+        db.rollback()
+        raise
+    db.commit()
+    logger.info("Wrote %d centroids at version %d", len(pending), version)
+    return len(pending)
+
+
+def _export_store(db) -> None:
+    from src.jobs.centroid_store_export import export
+    from src.vector.centroid_store import CENTROID_STORE_PATH
+
+    if not CENTROID_STORE_PATH:
+        return
+    try:
+        export(db)
+    except Exception as e:
+        # Centroids are already committed to MySQL and Redis; workers keep serving them from Redis
+        logger.warning("Centroid store export failed: %s", e)
+
+
+def run(mode: str = "full") -> Dict[str, Any]:
+    """Rebuild centroids in `mode` ('full' or 'incremental'). Returns counts for logging."""
+    import pymysql
+    from src.utils.db import get_db
+
+    if mode not in ("full", "incremental"):
+        raise ValueError(f"Unknown mode {mode!r}; expected 'full' or 'incremental'")
+
+    reader = get_db(cursorclass=pymysql.cursors.SSCursor)
+    writer = get_db()
+    built = 0
+    try:
+        cluster_ids = changed_cluster_ids(writer) if mode == "incremental" else None
+        if cluster_ids is not None:
+            logger.info("Incremental centroid rebuild: %d clusters changed", len(cluster_ids))
+        pending: Dict[str, Tuple[np.ndarray, int]] = {}
+        seen = set()
+        for cluster_id, total, count in stream_cluster_sums(reader, cluster_ids):
+            seen.add(cluster_id)
+            pending[cluster_id] = ((total / count).astype(np.float32), count)
+            if len(pending) >= FLUSH_CLUSTERS:
+                built += _flush(writer, pending)
+                pending = {}
+        if pending:
+            built += _flush(writer, pending)
+        if cluster_ids:
+            _mark_emptied(writer, [cid for cid in cluster_ids if cid not in seen])
+        _export_store(writer)
+    finally:
+        reader.close()
+        writer.close()
+    result = {"mode": mode, "clusters_built": built}
+    logger.info("Centroid rebuild complete: %s", result)
+    return result
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Rebuild cluster centroids from sku_vectors.")
+    parser.add_argument("--mode", choices=("full", "incremental"), default="incremental")
+    run(parser.parse_args().mode)
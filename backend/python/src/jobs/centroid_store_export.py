@@ -0,0 +1,78 @@
+"""
+Export cluster_vectors to the shared memory-mapped centroid file (src/vector/centroid_store.py).
+
+Reads every centroid with its version stamp, normalizes it, and atomically swaps CENTROID_STORE_PATH;
+running workers pick the new file up within CENTROID_STORE_CHECK_SECONDS. centroid_rebuild runs this
+after each rebuild; run it by hand after restoring cluster_vectors or pointing workers at a new host.
+
+Run from backend/python:  python -m src.jobs.centroid_store_export [--path PATH]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def export(db, path: Optional[str] = None) -> Dict[str, Any]:
+    """Write the centroid file from cluster_vectors over `db`. Returns counts for logging."""
+    from src.vector import centroid_store, codec
+
+    path = path or centroid_store.CENTROID_STORE_PATH
+    cur = db.cursor()
+    try:
+        cur.execute("SELECT cluster_id, vector_blob, vector, version FROM cluster_vectors ORDER BY cluster_id")
+        rows = cur.fetchall()
+    finally:
+        cur.close()
+
+    ids, vectors, versions = [], [], []
+    dims = None
+    for cluster_id, blob, legacy, version in rows:
+        try:
+            vector = codec.decode_row(blob, legacy)
+        except Exception as e:
+            logger.warning("Skipping unreadable centroid %s: %s", cluster_id, e)
+            continue
+        if vector is None:
+            continue
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            continue
+        if dims is None:
+            dims = vector.shape[0]
+        if vector.shape[0] != dims:
+            logger.warning("Skipping centroid %s: %d dims, expected %d", cluster_id, vector.shape[0], dims)
+            continue
+        ids.append(cluster_id)
+        vectors.append(vector / norm)
+        versions.append(int(version or 0))
+
+    matrix = np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+    centroid_store.write_store(path, ids, matrix, versions)
+    result = {"path": path, "clusters": len(ids), "version": max(versions) if versions else 0}
+    logger.info("Centroid store exported: %s", result)
+    return result
+
+
+def run(path: Optional[str] = None) -> Dict[str, Any]:
+    from src.utils.db import get_db
+
+    db = get_db()
+    try:
+        return export(db, path)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Export cluster_vectors to the shared centroid file.")
+    parser.add_argument("--path", default=None, help="target file (default CENTROID_STORE_PATH)")
+    run(parser.parse_args().path)
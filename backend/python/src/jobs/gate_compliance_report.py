@@ -0,0 +1,162 @@
+"""
+Nightly catalog-wide gate compliance report (G1–G7 + G6.1) with the columnar engine in api/gates_frame.py.
+
+- Loads every SKU from the canonical tables (sku_master, sku_content, sku_secondary_intents with
+  intent_taxonomy labels) into one DataFrame and evaluates all gates column-wise in a single pass.
+- Writes totals, failures per gate / error code / tier and the failing SKUs with their error codes
+  as JSON to --output (default CIE_DATA_DIR/reports/gate_compliance_<date>.json).
+- --parity also runs every SKU through api.gates_validate.run_all_gates and fails the run if any
+  SKU gets different error codes from the two engines.
+
+Run from backend/python:  python -m src.jobs.gate_compliance_report [--output PATH] [--parity]
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+REPORT_DIR = os.path.join(os.environ.get("CIE_DATA_DIR", "/var/lib/cie"), "reports")
+
+
+def _json_list(raw: Any) -> List[Any]:
+    if raw is None or raw == "":
+        return []
+    if isinstance(raw, (bytes, str)):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            return []
+    return list(raw) if isinstance(raw, (list, tuple)) else []
+
+
+def load_frame(db):
+    """DataFrame of every canonical SKU in api.gates_frame.FRAME_COLUMNS, indexed by sku_id."""
+    import pandas as pd
+    from api.gates_frame import FRAME_COLUMNS
+
+    cur = db.cursor()
+    try:
+        cur.execute(
+            """
+            SELECT m.sku_id, m.cluster_id, m.tier, it.label,
+                   c.answer_block, c.best_for, c.not_for, c.expert_authority
+            FROM sku_master m
+            LEFT JOIN intent_taxonomy it ON it.intent_id = m.primary_intent_id
+            LEFT JOIN sku_content c ON c.sku_id = m.sku_id
+            ORDER BY m.sku_id
+            """
+        )
+        rows = cur.fetchall()
+        cur.execute(
+            """
+            SELECT ssi.sku_id, it.label
+            FROM sku_secondary_intents ssi
+            JOIN intent_taxonomy it ON it.intent_id = ssi.intent_id
+            ORDER BY ssi.sku_id, ssi.ordinal
+            """
+        )
+        secondary_rows = cur.fetchall()
+    finally:
+        cur.close()
+
+    secondaries: Dict[str, List[str]] = {}
+    for sku_id, label in secondary_rows:
+        secondaries.setdefault(sku_id, []).append(label)
+
+    records = [
+        {
+            "cluster_id": cluster_id,
+            "tier": tier,
+            "primary_intent": primary,
+            "secondary_intents": secondaries.get(sku_id, []),
+            "answer_block": answer,
+            "best_for": _json_list(best_for),
+            "not_for": _json_list(not_for),
+            "expert_authority": expert,
+        }
+        for sku_id, cluster_id, tier, primary, answer, best_for, not_for, expert in rows
+    ]
+    return pd.DataFrame.from_records(records, columns=FRAME_COLUMNS, index=[r[0] for r in rows])
+
+
+def build_report(frame, master_cluster_ids: set) -> Dict[str, Any]:
+    from api.gates_frame import GATE_ORDER, error_code_counts, failure_codes, run_gates_frame
+
+    matrix = run_gates_frame(frame, master_cluster_ids)
+    codes = failure_codes(matrix)
+    failed_mask = matrix[GATE_ORDER].notna().any(axis=1)
+    tiers = frame["tier"].fillna("").astype(str).str.strip().str.lower()
+    by_tier = {
+        str(tier or "unknown"): {"total": int(group.size), "failed": int(failed_mask[group.index].sum())}
+        for tier, group in tiers.groupby(tiers)
+    }
+    return {
+        "generated_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "total": int(len(frame)),
+        "passed": int((~failed_mask).sum()),
+        "failed": int(failed_mask.sum()),
+        "by_gate": {gate: int(matrix[gate].notna().sum()) for gate in GATE_ORDER},
+        "by_error_code": error_code_counts(matrix),
+        "by_tier": by_tier,
+        "failing_skus": [
+            {"sku_id": str(sku_id), "error_codes": sku_codes}
+            for sku_id, sku_codes in zip(frame.index, codes)
+            if sku_codes
+        ],
+    }
+
+
+def run(output: Optional[str] = None, parity: bool = False) -> Dict[str, Any]:
+    """Build and write the compliance report. Returns the report summary (without failing_skus)."""
+    from api.gates_frame import FRAME_COLUMNS, check_parity
+    from api.gates_validate import get_master_cluster_ids
+    from src.utils.db import get_db
+
+    started = time.monotonic()
+    db = get_db()
+    try:
+        frame = load_frame(db)
+    finally:
+        db.close()
+    loaded = time.monotonic()
+
+    master_cluster_ids = get_master_cluster_ids()
+    report = build_report(frame, master_cluster_ids)
+    report["seconds"] = {"load": round(loaded - started, 3), "gates": round(time.monotonic() - loaded, 3)}
+
+    if parity:
+        mismatches = check_parity(frame[FRAME_COLUMNS].to_dict("records"), master_cluster_ids)
+        report["parity_mismatches"] = len(mismatches)
+        for mismatch in mismatches[:20]:
+            logger.error("Gate engine mismatch for %s: expected %s, got %s",
+                         frame.index[mismatch["index"]], mismatch["expected"], mismatch["actual"])
+
+    output = output or os.path.join(REPORT_DIR, f"gate_compliance_{dt.date.today():%Y%m%d}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    summary = {k: v for k, v in report.items() if k != "failing_skus"}
+    summary["output"] = output
+    logger.info("Gate compliance report: %s", summary)
+    return summary
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Catalog-wide gate compliance report.")
+    parser.add_argument("--output", default=None, help="report JSON path")
+    parser.add_argument("--parity", action="store_true", help="verify results against run_all_gates")
+    args = parser.parse_args()
+    result = run(args.output, args.parity)
+    sys.exit(1 if result.get("parity_mismatches") else 0)
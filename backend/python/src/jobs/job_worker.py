@@ -0,0 +1,179 @@
+"""
+Consumer pool for the durable job queue (src/utils/job_queue.py) behind /queue/audit and
+/queue/brief-generation.
+
+- Runs JOB_WORKER_CONCURRENCY consumers in one asyncio loop; each claims a job, runs its handler
+  (AuditEngine.audit_sku for 'audit', BriefGenerator.generate_decay_brief for 'brief') under the
+  visibility timeout, and acks the result. Failed handlers are retried up to JOB_MAX_ATTEMPTS.
+- A reaper task re-queues jobs whose consumer died without acking and refreshes the per-lane
+  depth gauge; per-lane wait time is observed at claim. Set JOB_WORKER_METRICS_PORT to expose them.
+- Claims follow the queue's priority lanes and per-category fair share (see job_queue).
+- Jobs enqueued with a callback_url are POSTed to it once they complete or finally fail
+  (src/utils/job_webhooks.py); delivery runs in the background and is awaited on shutdown.
+- Scale horizontally by running more processes (on any host) against the same Redis.
+
+Run from backend/python:  python -m src.jobs.job_worker [--concurrency N] [--types audit,brief]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+
+from src.utils.metrics import JOB_QUEUE_DEPTH, JOB_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+CONCURRENCY = int(os.environ.get("JOB_WORKER_CONCURRENCY", "8"))
+REAP_INTERVAL_SECONDS = float(os.environ.get("JOB_REAP_INTERVAL_SECONDS", "15"))
+METRICS_PORT = int(os.environ.get("JOB_WORKER_METRICS_PORT", "0"))
+IDLE_MIN_SECONDS = 0.1
+IDLE_MAX_SECONDS = 2.0
+
+
+class Handlers:
+    """Job type -> coroutine taking the job payload and returning a JSON-serializable result."""
+
+    def __init__(self):
+        self._audit_engine = None
+
+    def for_types(self, job_types: Sequence[str]) -> Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]]:
+        available = {"audit": self.audit, "brief": self.brief}
+        unknown = set(job_types) - set(available)
+        if unknown:
+            raise ValueError(f"Unknown job types: {sorted(unknown)}")
+        return {t: available[t] for t in job_types}
+
+    async def audit(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        from src.ai_audit.audit_engine import AuditEngine
+        from src.utils.db import load_sku
+
+        sku = await asyncio.to_thread(load_sku, payload["sku_id"])
+        if sku is None:
+            raise LookupError(f"SKU {payload['sku_id']} not found")
+        if self._audit_engine is None:
+            self._audit_engine = AuditEngine()
+        return await self._audit_engine.audit_sku(sku["title"] or "", sku["long_description"] or "")
+
+    async def brief(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._generate_brief, payload)
+
+    @staticmethod
+    def _generate_brief(payload: Dict[str, Any]) -> Dict[str, Any]:
+        from src.brief_generator.generator import BriefGenerator
+        from src.utils.db import get_db
+
+        db = get_db()
+        try:
+            return BriefGenerator(db).generate_decay_brief(
+                payload["sku_id"], payload.get("sku_code"), payload["title"]
+            )
+        finally:
+            db.close()
+
+
+async def _notify(client, job: Dict[str, Any], status: str, result: Any, error: Optional[str]) -> None:
+    from src.utils.job_webhooks import deliver, webhook_body
+
+    if not await deliver(client, job["callback_url"], webhook_body(job, status, result, error)):
+        logger.warning("Job %s webhook to %s was not delivered", job["id"], job["callback_url"])
+
+
+async def _consume(queue, handlers, worker: int, stop: asyncio.Event, webhooks=None, deliveries=None) -> None:
+    idle = IDLE_MIN_SECONDS
+    while not stop.is_set():
+        try:
+            job = await queue.claim(list(handlers))
+        except Exception as e:
+            logger.warning("Consumer %d could not claim a job: %s", worker, e)
+            job = None
+        if job is None:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=idle)
+            except asyncio.TimeoutError:
+                pass
+            idle = min(idle * 2, IDLE_MAX_SECONDS)
+            continue
+        idle = IDLE_MIN_SECONDS
+        JOB_WAIT_SECONDS.labels(job["type"], job.get("lane", "normal")).observe(
+            max(0.0, float(job.get("started_at") or 0) - float(job.get("created_at") or 0))
+        )
+        try:
+            result = await asyncio.wait_for(handlers[job["type"]](job["payload"]), timeout=queue.visibility_timeout)
+        except Exception as e:
+            logger.warning("Job %s (%s) attempt %d failed: %s", job["id"], job["type"], job["attempts"], e)
+            result, error = None, str(e) or type(e).__name__
+        else:
+            error = None
+        try:
+            if error is None:
+                status = "completed" if await queue.complete(job, result) else None
+                logger.info("Job %s (%s) completed", job["id"], job["type"])
+            else:
+                status = await queue.fail(job, error)
+        except Exception as e:
+            # The lease runs out and the reaper re-delivers the job
+            logger.warning("Job %s outcome could not be stored: %s", job["id"], e)
+            status = None
+        if status in ("completed", "failed") and job.get("callback_url") and webhooks is not None:
+            task = asyncio.create_task(_notify(webhooks, job, status, result, error))
+            deliveries.add(task)
+            task.add_done_callback(deliveries.discard)
+
+
+async def _reap(queue, job_types: Sequence[str], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        try:
+            requeued = await queue.requeue_expired()
+            if requeued:
+                logger.info("Re-queued %d expired jobs", requeued)
+            for job_type, lanes in (await queue.lane_depths(job_types)).items():
+                for lane, depth in lanes.items():
+                    JOB_QUEUE_DEPTH.labels(job_type, lane).set(depth)
+        except Exception as e:
+            logger.warning("Expired job sweep failed: %s", e)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=REAP_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run(concurrency: int = CONCURRENCY, job_types: Sequence[str] = ("audit", "brief")) -> None:
+    """Consume jobs until SIGINT / SIGTERM; in-flight jobs finish before exit."""
+    import httpx
+
+    from src.utils.job_queue import JobQueue
+    from src.utils.redis_pool import async_redis_client
+
+    queue = JobQueue(async_redis_client())
+    handlers = Handlers().for_types(job_types)
+    if METRICS_PORT:
+        from prometheus_client import start_http_server
+        start_http_server(METRICS_PORT)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    logger.info("Job worker consuming %s with %d consumers", list(handlers), concurrency)
+    deliveries = set()
+    async with httpx.AsyncClient(follow_redirects=False) as webhooks:
+        await asyncio.gather(
+            _reap(queue, list(handlers), stop),
+            *[_consume(queue, handlers, w, stop, webhooks, deliveries) for w in range(max(1, concurrency))],
+        )
+        if deliveries:
+            await asyncio.gather(*deliveries, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Consume audit / brief jobs from the Redis job queue.")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--types", default="audit,brief", help="comma-separated job types to consume")
+    args = parser.parse_args()
+    asyncio.run(run(args.concurrency, [t.strip() for t in args.types.split(",") if t.strip()]))
@@ -0,0 +1,95 @@
+"""
+Nightly near-duplicate scan over sku_vectors (src/vector/near_duplicates.py).
+
+- Streams every SKU vector through a server-side cursor and builds the random-projection LSH index.
+- Compares only SKUs sharing an LSH bucket and replaces sku_near_duplicates (migration 037) with the
+  pairs at or above NEAR_DUP_THRESHOLD in one transaction.
+- Saves the index to NEAR_DUP_INDEX_PATH so /api/v1/sku/near-duplicates can answer ad-hoc lookups.
+
+Run from backend/python:  python -m src.jobs.near_duplicate_scan [--threshold 0.95]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+STREAM_BATCH = int(os.environ.get("NEAR_DUP_STREAM_BATCH", "1000"))
+INSERT_BATCH = 1000
+
+
+def _replace_pairs(db, pairs: Sequence[Tuple[str, str, float]]) -> None:
+    cur = db.cursor()
+    try:
+        cur.execute("DELETE FROM sku_near_duplicates")
+        for start in range(0, len(pairs), INSERT_BATCH):
+            cur.executemany(
+                """
+                INSERT INTO sku_near_duplicates (sku_id, duplicate_sku_id, similarity, detected_at)
+                VALUES (%s, %s, %s, NOW())
+                """,
+                pairs[start:start + INSERT_BATCH],
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def run(threshold: Optional[float] = None, index_path: Optional[str] = None) -> Dict[str, Any]:
+    """Scan the catalog for near-duplicate pairs. Returns counts for logging."""
+    import pymysql
+    from src.utils.db import get_db
+    from src.vector import near_duplicates
+
+    threshold = near_duplicates.NEAR_DUP_THRESHOLD if threshold is None else threshold
+    index_path = index_path or near_duplicates.NEAR_DUP_INDEX_PATH
+    started = time.monotonic()
+
+    reader = get_db(cursorclass=pymysql.cursors.SSCursor)
+    try:
+        cur = reader.cursor()
+        ids, matrix = near_duplicates.load_sku_vectors(cur, STREAM_BATCH)
+        cur.close()
+    finally:
+        reader.close()
+    if not ids:
+        logger.info("No SKU vectors to scan")
+        return {"skus": 0, "pairs": 0}
+
+    index = near_duplicates.LSHIndex.create(matrix.shape[1]).build(ids, matrix)
+    pairs: List[Tuple[str, str, float]] = [
+        (ids[i], ids[j], round(sim, 4)) for i, j, sim in near_duplicates.find_pairs(index, matrix, threshold)
+    ]
+
+    writer = get_db()
+    try:
+        _replace_pairs(writer, pairs)
+    finally:
+        writer.close()
+    os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+    index.save(index_path)
+
+    result = {
+        "skus": len(ids),
+        "pairs": len(pairs),
+        "threshold": threshold,
+        "seconds": round(time.monotonic() - started, 1),
+    }
+    logger.info("Near-duplicate scan complete: %s", result)
+    return result
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Find near-duplicate SKU descriptions over sku_vectors.")
+    parser.add_argument("--threshold", type=float, default=None, help="cosine cut-off (default NEAR_DUP_THRESHOLD)")
+    run(parser.parse_args().threshold)
@@ -1,4 +1,242 @@
-def run():
-    print("Retrying vectors...")
+"""
+CIE v2.3.2 Fail-Soft — drain validation_retry_queue (migration 033) for the VECTOR gate.
+
+G4_VectorGate.php enqueues a row whenever the embedding API is unavailable on save. This job:
+- Claims due rows (next_retry_at <= NOW()) in batches with FOR UPDATE SKIP LOCKED and leases them
+  by pushing next_retry_at forward, so several drainers never process the same rows.
+- Loads each SKU's description + cluster, re-embeds the batch with chunked multi-input calls and
+  scores it against the cluster centroids in one pass.
+- Writes the gate outcome back (sku_gate_status VECTOR row, skus.ai_validation_pending) and deletes
+  the SKU's queue rows; rows that still cannot be validated get retry_count + 1 and exponential backoff.
+- Runs VECTOR_RETRY_CONCURRENCY drainers in parallel until no due rows remain.
+
+Run from backend/python:  python -m src.jobs.vector_retry_queue
+"""
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+GATE_CODE = "VECTOR"
+BATCH_SIZE = int(os.environ.get("VECTOR_RETRY_BATCH_SIZE", "200"))
+CONCURRENCY = int(os.environ.get("VECTOR_RETRY_CONCURRENCY", "4"))
+LEASE_SECONDS = int(os.environ.get("VECTOR_RETRY_LEASE_SECONDS", "600"))
+BACKOFF_BASE_SECONDS = int(os.environ.get("VECTOR_RETRY_BACKOFF_BASE_SECONDS", "300"))
+BACKOFF_MAX_SECONDS = int(os.environ.get("VECTOR_RETRY_BACKOFF_MAX_SECONDS", "86400"))
+MAX_RUNTIME_SECONDS = int(os.environ.get("VECTOR_RETRY_MAX_RUNTIME_SECONDS", "3000"))
+
+
+def backoff_seconds(retry_count: int) -> int:
+    """Delay before the next attempt: BACKOFF_BASE * 2^retry_count, capped at BACKOFF_MAX."""
+    return min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** max(0, retry_count)))
+
+
+def _claim_due_rows(db, limit: int) -> List[Tuple[str, str, int]]:
+    """
+    Claim up to `limit` due rows: (id, sku_id, retry_count). Claimed rows are leased for LEASE_SECONDS
+    so a crashed drainer's rows become due again instead of being lost.
+    """
+    cur = db.cursor()
+    cur.execute(
+        """
+        SELECT id, sku_id, retry_count
+        FROM validation_retry_queue
+        WHERE gate_code = %s AND next_retry_at <= NOW()
+        ORDER BY next_retry_at
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+        """,
+        (GATE_CODE, limit),
+    )
+    rows = [(r[0], r[1], int(r[2] or 0)) for r in cur.fetchall()]
+    if rows:
+        placeholders = ",".join(["%s"] * len(rows))
+        cur.execute(
+            f"""
+            UPDATE validation_retry_queue
+            SET next_retry_at = NOW() + INTERVAL %s SECOND
+            WHERE id IN ({placeholders})
+            """,
+            (LEASE_SECONDS, *[r[0] for r in rows]),
+        )
+    db.commit()
+    cur.close()
+    return rows
+
+
+def _load_skus(db, sku_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """Map queue sku_id (sku_code or skus.id, as written by G4_VectorGate.php) -> {id, sku_code, description, cluster_id}."""
+    if not sku_ids:
+        return {}
+    placeholders = ",".join(["%s"] * len(sku_ids))
+    cur = db.cursor()
+    cur.execute(
+        f"""
+        SELECT id, sku_code, long_description, primary_cluster_id
+        FROM skus
+        WHERE sku_code IN ({placeholders}) OR id IN ({placeholders})
+        """,
+        (*sku_ids, *sku_ids),
+    )
+    rows = cur.fetchall()
+    cur.close()
+    out: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        sku = {"id": row[0], "sku_code": row[1], "description": row[2] or "", "cluster_id": row[3] or ""}
+        out[row[1]] = sku
+        out[row[0]] = sku
+    return out
+
+
+def _record_outcome(db, sku_id: str, sku: Dict[str, Any], result: Dict[str, Any]) -> None:
+    """Write the VECTOR gate outcome and clear the SKU's degraded flag."""
+    passed = bool(result.get("valid"))
+    cur = db.cursor()
+    try:
+        cur.execute(
+            """
+            INSERT INTO sku_gate_status (sku_id, gate_code, status, error_code, error_message, checked_at)
+            VALUES (%s, %s, %s, %s, %s, NOW())
+            ON DUPLICATE KEY UPDATE
+                status = VALUES(status),
+                error_code = VALUES(error_code),
+                error_message = VALUES(error_message),
+                checked_at = VALUES(checked_at)
+            """,
+            (
+                sku_id,
+                GATE_CODE,
+                "pass" if passed else "fail",
+                None if passed else "CIE_VEC_SIMILARITY_LOW",
+                None if passed else (result.get("reason") or "")[:500],
+            ),
+        )
+    except Exception as e:
+        # sku_gate_status is keyed on canonical sku_master; legacy-only SKUs have no row there
+        logger.warning("Could not write sku_gate_status for %s: %s", sku_id, e)
+    # Kill-tier rows are locked by the prevent_kill_tier_update trigger (migration 034)
+    cur.execute(
+        "UPDATE skus SET ai_validation_pending = 0 WHERE id = %s AND UPPER(tier) <> 'KILL'",
+        (sku["id"],),
+    )
+    cur.close()
+
+
+def _delete_rows(db, ids: Sequence[str]) -> None:
+    if not ids:
+        return
+    placeholders = ",".join(["%s"] * len(ids))
+    cur = db.cursor()
+    cur.execute(f"DELETE FROM validation_retry_queue WHERE id IN ({placeholders})", tuple(ids))
+    cur.close()
+
+
+def _reschedule(db, rows: Sequence[Tuple[str, str, int]]) -> None:
+    cur = db.cursor()
+    for row_id, _, retry_count in rows:
+        cur.execute(
+            """
+            UPDATE validation_retry_queue
+            SET retry_count = retry_count + 1,
+                next_retry_at = NOW() + INTERVAL %s SECOND
+            WHERE id = %s
+            """,
+            (backoff_seconds(retry_count + 1), row_id),
+        )
+    cur.close()
+
+
+def _is_retryable(vector: Optional[list], result: Dict[str, Any]) -> bool:
+    """Embedding still unavailable, or centroid not cached yet: keep the row for a later attempt."""
+    if vector is None or result.get("similarity") is None:
+        return True
+    return "not initialized" in (result.get("reason") or "").lower()
+
+
+def process_batch(db, rows: Sequence[Tuple[str, str, int]]) -> Dict[str, int]:
+    """Re-validate one claimed batch. Returns counts of passed / failed / retried / dropped SKUs."""
+    from src.vector.embedding import get_embeddings
+    from src.vector.validation import validate_cluster_matches
+
+    counts = {"passed": 0, "failed": 0, "retried": 0, "dropped": 0}
+    rows_by_sku: Dict[str, List[Tuple[str, str, int]]] = {}
+    for row in rows:
+        rows_by_sku.setdefault(row[1], []).append(row)
+
+    skus = _load_skus(db, list(rows_by_sku))
+    work: List[str] = []
+    for sku_id, sku_rows in rows_by_sku.items():
+        sku = skus.get(sku_id)
+        if not sku or not sku["description"].strip() or not sku["cluster_id"]:
+            logger.warning("Dropping retry rows for %s: SKU, description or cluster missing", sku_id)
+            _delete_rows(db, [r[0] for r in sku_rows])
+            counts["dropped"] += 1
+        else:
+            work.append(sku_id)
+
+    if work:
+        vectors = get_embeddings([skus[s]["description"] for s in work])
+        results = validate_cluster_matches(vectors, [skus[s]["cluster_id"] for s in work])
+        for sku_id, vector, result in zip(work, vectors, results):
+            sku_rows = rows_by_sku[sku_id]
+            if _is_retryable(vector, result):
+                _reschedule(db, sku_rows)
+                counts["retried"] += 1
+                continue
+            _record_outcome(db, sku_id, skus[sku_id], result)
+            _delete_rows(db, [r[0] for r in sku_rows])
+            counts["passed" if result.get("valid") else "failed"] += 1
+
+    db.commit()
+    return counts
+
+
+def _drain(worker: int, deadline: float) -> Dict[str, int]:
+    from src.utils.db import get_db
+
+    totals = {"passed": 0, "failed": 0, "retried": 0, "dropped": 0, "batches": 0}
+    db = get_db()
+    try:
+        while time.monotonic() < deadline:
+            rows = _claim_due_rows(db, BATCH_SIZE)
+            if not rows:
+                break
+            try:
+                counts = process_batch(db, rows)
+            except Exception as e:
+                db.rollback()
+                logger.exception("Retry batch failed on drainer %d (rows stay leased): %s", worker, e)
+                continue
+            totals["batches"] += 1
+            for k, v in counts.items():
+                totals[k] += v
+            logger.info("Drainer %d batch: %s", worker, counts)
+    finally:
+        db.close()
+    return totals
+
+
+def run(concurrency: int = CONCURRENCY, max_runtime_seconds: int = MAX_RUNTIME_SECONDS) -> Dict[str, int]:
+    """Drain all due VECTOR retry rows with `concurrency` parallel drainers. Returns aggregate counts."""
+    started = dt.datetime.now()
+    deadline = time.monotonic() + max_runtime_seconds
+    totals = {"passed": 0, "failed": 0, "retried": 0, "dropped": 0, "batches": 0}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for result in pool.map(lambda w: _drain(w, deadline), range(max(1, concurrency))):
+            for k, v in result.items():
+                totals[k] += v
+    logger.info("Vector retry queue drained in %s: %s", dt.datetime.now() - started, totals)
+    return totals
+
+
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
     run()
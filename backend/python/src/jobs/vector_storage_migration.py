@@ -0,0 +1,91 @@
+"""
+Convert sku_vectors / cluster_vectors rows from JSON lists to the binary vector_blob column (migration 036).
+
+- Walks each table by primary key in MIGRATION_BATCH chunks (keyset pagination, no OFFSET rescans),
+  encoding with src.vector.codec and committing per chunk, so it can be stopped and re-run at any time.
+- Only rows with vector_blob IS NULL are touched; the JSON column is cleared unless --keep-json is given.
+- Run OPTIMIZE TABLE afterwards to hand the freed JSON pages back to the tablespace.
+
+Run from backend/python:  python -m src.jobs.vector_storage_migration [--dtype float32|float16] [--keep-json]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+TABLES = ("sku_vectors", "cluster_vectors")
+MIGRATION_BATCH = int(os.environ.get("VECTOR_STORAGE_MIGRATION_BATCH", "500"))
+
+
+def migrate_table(db, table: str, dtype: Optional[str] = None, keep_json: bool = False) -> Dict[str, int]:
+    """Convert one table. Returns counts of converted and unreadable rows."""
+    from src.vector import codec
+
+    if table not in TABLES:
+        raise ValueError(f"Unknown vector table {table!r}")
+    counts = {"converted": 0, "unreadable": 0}
+    last_id = ""  # ids are CHAR(36) UUIDs
+    cur = db.cursor()
+    try:
+        while True:
+            cur.execute(
+                f"""
+                SELECT id, vector FROM {table}
+                WHERE id > %s AND vector_blob IS NULL AND vector IS NOT NULL
+                ORDER BY id
+                LIMIT %s
+                """,
+                (last_id, MIGRATION_BATCH),
+            )
+            rows = cur.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            updates = []
+            for row_id, raw in rows:
+                try:
+                    updates.append((codec.encode(codec.decode(raw), dtype), row_id))
+                except Exception as e:
+                    logger.warning("Skipping unreadable vector %s.id=%s: %s", table, row_id, e)
+                    counts["unreadable"] += 1
+            if updates:
+                clear = "" if keep_json else ", vector = NULL"
+                cur.executemany(f"UPDATE {table} SET vector_blob = %s{clear} WHERE id = %s", updates)
+            db.commit()
+            counts["converted"] += len(updates)
+            logger.info("%s: %d rows converted (last id %s)", table, counts["converted"], last_id)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cur.close()
+    return counts
+
+
+def run(dtype: Optional[str] = None, keep_json: bool = False) -> Dict[str, Dict[str, int]]:
+    """Convert every vector table. Returns per-table counts."""
+    from src.utils.db import get_db
+
+    db = get_db()
+    try:
+        result = {table: migrate_table(db, table, dtype, keep_json) for table in TABLES}
+    finally:
+        db.close()
+    logger.info("Vector storage migration complete: %s", result)
+    return result
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Convert JSON vectors to the binary vector_blob column.")
+    parser.add_argument("--dtype", choices=("float32", "float16"), default=None,
+                        help="storage dtype (default: VECTOR_STORAGE_DTYPE, else float32)")
+    parser.add_argument("--keep-json", action="store_true", help="leave the JSON column populated for rollback")
+    args = parser.parse_args()
+    run(args.dtype, args.keep_json)
@@ -1,5 +1,5 @@
 # CIE v2.3.1 — Title validation and suggestion (Intent → Cluster → Attributes)
 
-from .validation import validate_title, suggest_title
+from .validation import validate_title, validate_titles, suggest_title
 
-__all__ = ["validate_title", "suggest_title"]
+__all__ = ["validate_title", "validate_titles", "suggest_title"]
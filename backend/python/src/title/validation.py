@@ -3,10 +3,13 @@ CIE v2.3.1 — Title validation and suggestion.
 NON-NEGOTIABLE: Intent → Cluster → Attributes. First segment = user intent/problem; after pipe = attributes.
 6.1 Title Formula: [INTENT_PHRASE] + ' | ' + [PRODUCT_CLASS] + ' ' + [KEY_ATTRIBUTES]; max 250 chars.
 G2: Text before '|' must NOT start with colour, material, or dimension; must contain intent-related word.
+
+The rules are compiled once (TitleRules: one alternation regex per intent, set lookups for brand and
+leading words) and recompiled when CIE_TITLE_BRAND_PREFIXES changes or reload_title_rules() is called.
 """
 import os
 import re
-from typing import Any
+from typing import Any, Iterable
 
 # 6.1 Max length (including separator). Rules block also allows 120; use 250 per Title Formula.
 MAX_TITLE_LEN = 250
@@ -47,25 +50,88 @@ def _norm_intent(primary_intent: str) -> str:
     return primary_intent.strip().lower().replace(" ", "_").replace("-", "_")
 
 
-def _get_intent_keywords(primary_intent: str) -> list[str]:
+def _resolve_intent_key(primary_intent: str) -> str | None:
+    """INTENT_TITLE_KEYWORDS key for a primary intent label, or None."""
     key = _norm_intent(primary_intent)
     if not key:
-        return []
+        return None
     # Allow label variants (e.g. "Problem-Solving" -> problem_solving)
-    for k, keywords in INTENT_TITLE_KEYWORDS.items():
+    for k in INTENT_TITLE_KEYWORDS:
         if k == key or k.replace("_", " ") in primary_intent.lower():
-            return keywords
-    return INTENT_TITLE_KEYWORDS.get(key, [])
+            return k
+    return key if key in INTENT_TITLE_KEYWORDS else None
 
 
-def _load_brand_prefixes() -> set[str]:
-    """Brand names that title must NOT start with. Load from env CIE_TITLE_BRAND_PREFIXES (comma-separated) or leave empty."""
-    raw = os.environ.get("CIE_TITLE_BRAND_PREFIXES", "")
+def _get_intent_keywords(primary_intent: str) -> list[str]:
+    key = _resolve_intent_key(primary_intent)
+    return INTENT_TITLE_KEYWORDS[key] if key else []
+
+
+def _parse_brand_prefixes(raw: str) -> set[str]:
     if not raw:
         return set()
     return {s.strip().lower() for s in raw.split(",") if s.strip()}
 
 
+def _load_brand_prefixes() -> set[str]:
+    """Brand names that title must NOT start with. Load from env CIE_TITLE_BRAND_PREFIXES (comma-separated) or leave empty."""
+    return _parse_brand_prefixes(os.environ.get("CIE_TITLE_BRAND_PREFIXES", ""))
+
+
+def _keyword_pattern(keywords: list[str]) -> re.Pattern[str] | None:
+    """One alternation regex matching wherever any keyword occurs (same result as any(kw in text))."""
+    if not keywords:
+        return None
+    return re.compile("|".join(re.escape(kw) for kw in dict.fromkeys(keywords)))
+
+
+class TitleRules:
+    """validate_title's rule tables compiled for matching; build via title_rules()."""
+
+    # Distinct primary intent labels remembered per compiled rule set
+    MAX_RESOLVED_INTENTS = 1024
+
+    def __init__(self, brand_prefixes_raw: str = ""):
+        self.brand_prefixes_raw = brand_prefixes_raw
+        self.brand_prefixes = frozenset(_parse_brand_prefixes(brand_prefixes_raw))
+        self.forbidden_leading_words = frozenset(FORBIDDEN_LEADING_WORDS)
+        self.intent_patterns = {k: _keyword_pattern(kws) for k, kws in INTENT_TITLE_KEYWORDS.items()}
+        self._resolved: dict[str, re.Pattern[str] | None] = {}
+
+    def intent_pattern(self, primary_intent: str) -> re.Pattern[str] | None:
+        """Keyword matcher for a primary intent label (None = no keyword requirement)."""
+        try:
+            return self._resolved[primary_intent]
+        except KeyError:
+            pass
+        key = _resolve_intent_key(primary_intent)
+        pattern = self.intent_patterns.get(key) if key else None
+        if len(self._resolved) >= self.MAX_RESOLVED_INTENTS:
+            self._resolved.clear()
+        self._resolved[primary_intent] = pattern
+        return pattern
+
+
+_rules: TitleRules | None = None
+
+
+def title_rules() -> TitleRules:
+    """Compiled rules for the current configuration; recompiled when CIE_TITLE_BRAND_PREFIXES changes."""
+    global _rules
+    raw = os.environ.get("CIE_TITLE_BRAND_PREFIXES", "")
+    rules = _rules
+    if rules is None or rules.brand_prefixes_raw != raw:
+        rules = _rules = TitleRules(raw)
+    return rules
+
+
+def reload_title_rules() -> TitleRules:
+    """Recompile the rules (after changing INTENT_TITLE_KEYWORDS / FORBIDDEN_LEADING_WORDS at runtime)."""
+    global _rules
+    _rules = None
+    return title_rules()
+
+
 def validate_title(
     title: str,
     primary_intent: str,
@@ -87,6 +153,30 @@ def validate_title(
     Returns:
         { "valid": bool, "issues": list[str], "suggested_fix": str | None }
     """
+    return _validate_title(title, primary_intent, title_rules(), brand_prefixes)
+
+
+def validate_titles(
+    items: Iterable[dict[str, Any]],
+    brand_prefixes: set[str] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    validate_title over a catalog list of {"title", "primary_intent", "cluster_id"} dicts with one
+    compiled rule set; returns one result per item, in order.
+    """
+    rules = title_rules()
+    return [
+        _validate_title(item.get("title") or "", item.get("primary_intent") or "", rules, brand_prefixes)
+        for item in items
+    ]
+
+
+def _validate_title(
+    title: str,
+    primary_intent: str,
+    rules: TitleRules,
+    brand_prefixes: set[str] | None,
+) -> dict[str, Any]:
     issues: list[str] = []
     title = (title or "").strip()
     primary_intent = (primary_intent or "").strip()
@@ -115,26 +205,26 @@ def validate_title(
 
     # Primary intent keyword (or synonym) must appear before the pipe
     if primary_intent:
-        keywords = _get_intent_keywords(primary_intent)
-        before_lower = before.lower()
-        if keywords and not any(kw in before_lower for kw in keywords):
+        pattern = rules.intent_pattern(primary_intent)
+        if pattern is not None and pattern.search(before.lower()) is None:
             issues.append(
                 "The primary intent keyword (or synonym) must appear in the part before the pipe. "
                 "First segment should address the user's intent/problem, not attributes."
             )
 
+    words = before.split(maxsplit=1)
+    first_word = words[0].lower() if words else ""
+
     # Title must not start with brand name
     if brand_prefixes is None:
-        brand_prefixes = _load_brand_prefixes()
+        brand_prefixes = rules.brand_prefixes
     if brand_prefixes and before:
-        first_word = before.split()[0].lower() if before.split() else ""
         if first_word in brand_prefixes:
             issues.append("Title must not start with a brand name. Lead with intent/problem instead.")
 
     # G2: Text before '|' must NOT start with colour, material, or dimension
     if before:
-        first_word = before.split()[0].lower() if before.split() else ""
-        if first_word in FORBIDDEN_LEADING_WORDS:
+        if first_word in rules.forbidden_leading_words:
             issues.append(
                 "Text before the pipe must not start with a colour, material, or dimension. "
                 "Lead with intent/problem (e.g. 'Warm Glare-Free Lighting for Living Rooms | ...')."
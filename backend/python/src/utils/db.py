@@ -0,0 +1,53 @@
+"""
+PEP-249 MySQL connections for Python jobs, from DATABASE_URL or DB_* env vars.
+"""
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def get_db(dict_rows=False, **kwargs):
+    """PEP-249 style connection from env (e.g. MySQL). dict_rows=True returns rows as dicts."""
+    try:
+        import pymysql
+        from urllib.parse import urlparse
+        if dict_rows:
+            kwargs.setdefault("cursorclass", pymysql.cursors.DictCursor)
+        url = os.environ.get("DATABASE_URL", "")
+        if url:
+            parsed = urlparse(url)
+            return pymysql.connect(
+                host=parsed.hostname or os.environ.get("DB_HOST", "localhost"),
+                port=parsed.port or 3306,
+                user=parsed.username or os.environ.get("DB_USER", "root"),
+                password=parsed.password or os.environ.get("DB_PASSWORD", ""),
+                database=(parsed.path or "").lstrip("/") or os.environ.get("DB_DATABASE", "cie"),
+                **kwargs,
+            )
+        return pymysql.connect(
+            host=os.environ.get("DB_HOST", "localhost"),
+            user=os.environ.get("DB_USER", "root"),
+            password=os.environ.get("DB_PASSWORD", ""),
+            database=os.environ.get("DB_DATABASE", "cie"),
+            **kwargs,
+        )
+    except Exception as e:
+        logger.error("DB connection failed: %s", e)
+        raise
+
+
+def load_sku(sku_id):
+    """skus row (id, sku_code, title, long_description) by id or sku_code (PHP sends either), or None."""
+    db = get_db(dict_rows=True)
+    try:
+        cur = db.cursor()
+        cur.execute(
+            "SELECT id, sku_code, title, long_description FROM skus WHERE id = %s OR sku_code = %s LIMIT 1",
+            (str(sku_id), str(sku_id)),
+        )
+        row = cur.fetchone()
+        cur.close()
+        return row
+    finally:
+        db.close()
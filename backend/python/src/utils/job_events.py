@@ -0,0 +1,74 @@
+"""
+Job completion notifications for the API process (see job_queue.JOB_EVENTS_CHANNEL).
+
+One Redis pub/sub subscription per process fans completion events out to every open stream, so
+a thousand clients waiting on jobs cost one Redis connection, not a thousand polling loops.
+Subscribers register before reading the job's stored status, so an event published in between
+is never lost; streams also re-read stored status on every heartbeat, which covers events missed
+while the subscription was reconnecting.
+"""
+import asyncio
+import json
+import logging
+
+from .job_queue import JOB_EVENTS_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_SECONDS = 1.0
+
+
+class JobEvents:
+    """Per-process fan-out of job completion events over a redis.asyncio client."""
+
+    def __init__(self, redis_client, channel=JOB_EVENTS_CHANNEL):
+        self.redis = redis_client
+        self.channel = channel
+        self._subscribers = {}  # job id -> set of asyncio.Queue
+        self._listener = None
+
+    def subscribe(self, job_ids):
+        """Register interest in `job_ids`; returns a queue receiving their events (dicts)."""
+        self._ensure_listener()
+        queue = asyncio.Queue()
+        for job_id in job_ids:
+            self._subscribers.setdefault(job_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job_ids, queue):
+        for job_id in job_ids:
+            queues = self._subscribers.get(job_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[job_id]
+
+    def _ensure_listener(self):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self):
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    self._dispatch(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Job event subscription lost: %s", e)
+            finally:
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
+            await asyncio.sleep(RECONNECT_SECONDS)
+
+    def _dispatch(self, data):
+        try:
+            event = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        for queue in self._subscribers.get(event.get("id"), ()):
+            queue.put_nowait(event)
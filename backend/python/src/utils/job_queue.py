@@ -0,0 +1,350 @@
+"""
+Redis-backed durable job queue for worker jobs (audits, briefs).
+
+- job:<id>                                hash: type, lane, category, status, payload, attempts,
+                                          result / error, timestamps
+- jobs:ready:<type>:<lane>:<category>     list of queued job ids, FIFO within one category
+- jobs:active:<type>:<lane>               zset of categories with queued jobs, scored by virtual time
+- jobs:inflight                           zset of claimed job ids scored by their visibility deadline
+
+A consumer claims a job atomically (Lua) with a lease token and JOB_VISIBILITY_TIMEOUT seconds to
+finish it. Jobs whose deadline passes (consumer crashed or hung) are put back on their ready list
+by requeue_expired() until JOB_MAX_ATTEMPTS; a late ack from the old lease holder is ignored.
+Finished jobs keep their result for JOB_RESULT_TTL seconds; queued jobs expire after JOB_PENDING_TTL.
+Any number of API replicas and consumer processes can share one Redis.
+
+Scheduling: lanes (lane_for: tier + decay status) are served in strict priority order, so urgent
+Hero decay briefs never wait behind a bulk Harvest re-audit. Within a lane, categories share the
+consumers by weighted fair queuing: each claim takes the category with the lowest virtual time and
+advances it by 1 / weight (JOB_CATEGORY_WEIGHTS), so one category cannot monopolize a lane.
+
+Completion: when a job completes or finally fails, its id, type and status are published on
+JOB_EVENTS_CHANNEL (see job_events) in the same Lua call, and the consumer delivers the optional
+per-job callback_url webhook.
+
+Deduplication (checked atomically at enqueue): jobs enqueued for a SKU carry an idempotency key
+sha256(job type, sku_id, content hash). Re-enqueueing the same key while its job is queued, running or
+completed (JOB_DEDUPE_TTL) returns the existing job id, as does any enqueue of the same job type for
+the same SKU within JOB_REQUEUE_WINDOW_SECONDS. Failed jobs never block a new enqueue.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Key names are repeated in _LUA_PUSH / _CLAIM; keep them in sync
+JOB_KEY_PREFIX = "job:"
+READY_KEY_PREFIX = "jobs:ready:"
+ACTIVE_KEY_PREFIX = "jobs:active:"
+INFLIGHT_KEY = "jobs:inflight"
+IDEMPOTENCY_KEY_PREFIX = "jobs:idem:"
+RECENT_KEY_PREFIX = "jobs:recent:"
+JOB_EVENTS_CHANNEL = "jobs:done"
+
+# Highest priority first
+LANES = ("urgent", "high", "normal", "bulk")
+DEFAULT_CATEGORY = "default"
+
+JOB_VISIBILITY_TIMEOUT = int(os.getenv('JOB_VISIBILITY_TIMEOUT', '300'))
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+JOB_RESULT_TTL = int(os.getenv('JOB_RESULT_TTL', '86400'))
+JOB_PENDING_TTL = int(os.getenv('JOB_PENDING_TTL', '604800'))
+JOB_DEDUPE_TTL = int(os.getenv('JOB_DEDUPE_TTL', str(JOB_RESULT_TTL)))
+JOB_REQUEUE_WINDOW_SECONDS = int(os.getenv('JOB_REQUEUE_WINDOW_SECONDS', '3600'))
+REQUEUE_BATCH = 100
+
+
+def _parse_weights(raw):
+    weights = {}
+    for item in (raw or "").split(","):
+        name, _, weight = item.partition(":")
+        if name.strip() and weight.strip():
+            weights[name.strip()] = max(0.01, float(weight))
+    return weights
+
+
+# e.g. "cables:2,lighting:1" — categories not listed weigh 1
+JOB_CATEGORY_WEIGHTS = _parse_weights(os.getenv('JOB_CATEGORY_WEIGHTS', ''))
+
+# Append a job id to its category list, activating the category at the lane's current virtual time
+_LUA_PUSH = """
+local function push(job_type, lane, category, id)
+  local active = 'jobs:active:' .. job_type .. ':' .. lane
+  if not redis.call('ZSCORE', active, category) then
+    local clock = tonumber(redis.call('GET', 'jobs:vclock:' .. job_type .. ':' .. lane) or '0')
+    redis.call('ZADD', active, clock, category)
+  end
+  redis.call('RPUSH', 'jobs:ready:' .. job_type .. ':' .. lane .. ':' .. category, id)
+end
+"""
+
+# KEYS: job key, idempotency key, recent key
+# ARGV: id, type, payload, now, pending ttl, dedupe ttl, requeue window, job key prefix, idempotency key,
+#       lane, category, callback url
+_ENQUEUE = _LUA_PUSH + """
+for i = 2, 3 do
+  local existing = redis.call('GET', KEYS[i])
+  if existing then
+    local status = redis.call('HGET', ARGV[8] .. existing, 'status')
+    if status and status ~= 'failed' then return {existing, 0} end
+  end
+end
+redis.call('HSET', KEYS[1], 'id', ARGV[1], 'type', ARGV[2], 'status', 'queued', 'payload', ARGV[3],
+           'attempts', 0, 'created_at', ARGV[4], 'idempotency_key', ARGV[9], 'lane', ARGV[10],
+           'category', ARGV[11], 'callback_url', ARGV[12])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+push(ARGV[2], ARGV[10], ARGV[11], ARGV[1])
+if ARGV[9] ~= '' then
+  redis.call('SET', KEYS[2], ARGV[1], 'EX', ARGV[6])
+  if tonumber(ARGV[7]) > 0 then redis.call('SET', KEYS[3], ARGV[1], 'EX', ARGV[7]) end
+end
+return {ARGV[1], 1}
+"""
+
+# KEYS: inflight   ARGV: now, visibility timeout, lease, category weights (JSON), lane count, lanes..., types...
+_CLAIM = """
+local weights = cjson.decode(ARGV[4])
+local nlanes = tonumber(ARGV[5])
+for l = 6, 5 + nlanes do
+  local lane = ARGV[l]
+  for t = 6 + nlanes, #ARGV do
+    local job_type = ARGV[t]
+    local active = 'jobs:active:' .. job_type .. ':' .. lane
+    while true do
+      local top = redis.call('ZRANGE', active, 0, 0, 'WITHSCORES')
+      if #top == 0 then break end
+      local category, vtime = top[1], tonumber(top[2])
+      local list = 'jobs:ready:' .. job_type .. ':' .. lane .. ':' .. category
+      local id = redis.call('LPOP', list)
+      redis.call('SET', 'jobs:vclock:' .. job_type .. ':' .. lane, vtime)
+      if redis.call('LLEN', list) == 0 then
+        redis.call('ZREM', active, category)
+      else
+        redis.call('ZADD', active, vtime + 1 / (tonumber(weights[category]) or 1), category)
+      end
+      if id and redis.call('EXISTS', 'job:' .. id) == 1 then
+        local key = 'job:' .. id
+        redis.call('ZADD', KEYS[1], tonumber(ARGV[1]) + tonumber(ARGV[2]), id)
+        redis.call('HSET', key, 'status', 'running', 'lease', ARGV[3], 'started_at', ARGV[1])
+        redis.call('HINCRBY', key, 'attempts', 1)
+        return id
+      end
+    end
+  end
+end
+return false
+"""
+
+# KEYS: inflight, job key   ARGV: id, lease, status, result field, result value, ttl, now, events channel
+_FINISH = """
+if redis.call('HGET', KEYS[2], 'lease') ~= ARGV[2] then return 0 end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HSET', KEYS[2], 'status', ARGV[3], ARGV[4], ARGV[5], 'lease', '', 'finished_at', ARGV[7])
+redis.call('EXPIRE', KEYS[2], ARGV[6])
+redis.call('PUBLISH', ARGV[8], cjson.encode({id = ARGV[1], type = redis.call('HGET', KEYS[2], 'type'), status = ARGV[3]}))
+return 1
+"""
+
+# KEYS: inflight, job key   ARGV: id, lease, error
+_RETRY = _LUA_PUSH + """
+if redis.call('HGET', KEYS[2], 'lease') ~= ARGV[2] then return 0 end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HSET', KEYS[2], 'status', 'queued', 'lease', '', 'error', ARGV[3])
+local job = redis.call('HMGET', KEYS[2], 'type', 'lane', 'category')
+push(job[1], job[2] or 'normal', job[3] or 'default', ARGV[1])
+return 1
+"""
+
+# KEYS: inflight   ARGV: now, job key prefix, max attempts, result ttl, batch, events channel
+_REQUEUE_EXPIRED = _LUA_PUSH + """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[5]))
+for _, id in ipairs(ids) do
+  redis.call('ZREM', KEYS[1], id)
+  local key = ARGV[2] .. id
+  local job = redis.call('HMGET', key, 'type', 'lane', 'category', 'attempts')
+  if job[1] then
+    if tonumber(job[4] or '0') >= tonumber(ARGV[3]) then
+      redis.call('HSET', key, 'status', 'failed', 'lease', '', 'error', 'visibility timeout exceeded',
+                 'finished_at', ARGV[1])
+      redis.call('EXPIRE', key, ARGV[4])
+      redis.call('PUBLISH', ARGV[6], cjson.encode({id = id, type = job[1], status = 'failed'}))
+    else
+      redis.call('HSET', key, 'status', 'queued', 'lease', '')
+      push(job[1], job[2] or 'normal', job[3] or 'default', id)
+    end
+  end
+end
+return #ids
+"""
+
+
+def lane_for(tier=None, decay_status=None):
+    """
+    Priority lane for a SKU job: Hero SKUs in citation decay are urgent, other Hero work is high,
+    Harvest / Kill work is bulk, and everything else (Support, or tier unknown) is normal.
+    """
+    tier = (tier or "").strip().upper()
+    decaying = (decay_status or "none").strip().lower() not in ("", "none")
+    if tier == "HERO":
+        return "urgent" if decaying else "high"
+    if tier in ("HARVEST", "KILL"):
+        return "bulk"
+    return "normal"
+
+
+def content_hash(payload):
+    """Stable hash of a job payload, ignoring key order and the sku_id itself."""
+    content = {k: v for k, v in payload.items() if k != "sku_id"}
+    return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def audit_content_digest(title, long_description):
+    """Content digest of an audit job: the SKU text the audit reads (PHP computes the same hash)."""
+    return hashlib.sha256(f"{title or ''}\0{long_description or ''}".encode("utf-8")).hexdigest()
+
+
+def idempotency_key(job_type, sku_id, content_digest):
+    return hashlib.sha256(f"{job_type}\0{sku_id}\0{content_digest}".encode("utf-8")).hexdigest()
+
+
+def _decode(raw):
+    return {
+        (k.decode("utf-8") if isinstance(k, bytes) else k): (v.decode("utf-8") if isinstance(v, bytes) else v)
+        for k, v in raw.items()
+    }
+
+
+class JobQueue:
+    """Async job queue over a redis.asyncio client (see async_redis_client)."""
+
+    def __init__(self, redis_client, visibility_timeout=JOB_VISIBILITY_TIMEOUT, max_attempts=JOB_MAX_ATTEMPTS,
+                 result_ttl=JOB_RESULT_TTL, category_weights=None):
+        self.redis = redis_client
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max(1, max_attempts)
+        self.result_ttl = result_ttl
+        self._weights = json.dumps(JOB_CATEGORY_WEIGHTS if category_weights is None else category_weights)
+        self._enqueue = redis_client.register_script(_ENQUEUE)
+        self._claim = redis_client.register_script(_CLAIM)
+        self._finish = redis_client.register_script(_FINISH)
+        self._retry = redis_client.register_script(_RETRY)
+        self._requeue_expired = redis_client.register_script(_REQUEUE_EXPIRED)
+
+    async def enqueue(self, job_type, payload, sku_id=None, content_digest=None, lane="normal", category=None,
+                      callback_url=None):
+        """
+        Store a job and append it to its lane / category list. With sku_id, duplicates are collapsed
+        (see module docstring); content_digest defaults to content_hash(payload). callback_url is
+        POSTed the finished job by the consumer.
+        Returns (job id, created) — created is False when an existing job id is returned.
+        """
+        if lane not in LANES:
+            raise ValueError(f"Unknown lane {lane!r}; expected one of {LANES}")
+        key = ""
+        if sku_id is not None:
+            key = idempotency_key(job_type, sku_id, content_digest or content_hash(payload))
+        job_id = str(uuid.uuid4())
+        existing_id, created = await self._enqueue(
+            keys=[
+                f"{JOB_KEY_PREFIX}{job_id}",
+                f"{IDEMPOTENCY_KEY_PREFIX}{key}",
+                f"{RECENT_KEY_PREFIX}{job_type}:{sku_id}",
+            ],
+            args=[job_id, job_type, json.dumps(payload), time.time(), JOB_PENDING_TTL, JOB_DEDUPE_TTL,
+                  JOB_REQUEUE_WINDOW_SECONDS, JOB_KEY_PREFIX, key, lane, (category or DEFAULT_CATEGORY).strip(),
+                  callback_url or ""],
+        )
+        if isinstance(existing_id, bytes):
+            existing_id = existing_id.decode("utf-8")
+        return existing_id, bool(created)
+
+    async def get(self, job_id):
+        """The job as a dict (payload / result decoded), or None if unknown or expired."""
+        raw = await self.redis.hgetall(f"{JOB_KEY_PREFIX}{job_id}")
+        if not raw:
+            return None
+        job = _decode(raw)
+        job.pop("lease", None)
+        job["payload"] = json.loads(job.get("payload") or "{}")
+        if "result" in job:
+            job["result"] = json.loads(job["result"])
+        job["attempts"] = int(job.get("attempts") or 0)
+        return job
+
+    async def claim(self, job_types):
+        """
+        Claim the next job of any of `job_types`: highest lane first, fair across categories within a
+        lane. Returns the job dict with its lease, or None.
+        """
+        lease = uuid.uuid4().hex
+        job_id = await self._claim(
+            keys=[INFLIGHT_KEY],
+            args=[time.time(), self.visibility_timeout, lease, self._weights, len(LANES), *LANES, *job_types],
+        )
+        if not job_id:
+            return None
+        job = await self.get(job_id.decode("utf-8") if isinstance(job_id, bytes) else job_id)
+        if job is None:
+            return None
+        job["lease"] = lease
+        return job
+
+    async def complete(self, job, result):
+        """Store the result; False if the lease was lost (the job was re-delivered)."""
+        return await self._finish_job(job, "completed", "result", json.dumps(result, default=str))
+
+    async def fail(self, job, error):
+        """
+        Retry the job if attempts remain, otherwise mark it failed.
+        Returns the job's new status ('queued' or 'failed'), or None if the lease was lost.
+        """
+        if job["attempts"] < self.max_attempts:
+            ok = await self._retry(
+                keys=[INFLIGHT_KEY, f"{JOB_KEY_PREFIX}{job['id']}"],
+                args=[job["id"], job["lease"], str(error)[:1000]],
+            )
+            return "queued" if ok else None
+        return "failed" if await self._finish_job(job, "failed", "error", str(error)[:1000]) else None
+
+    async def _finish_job(self, job, status, field, value):
+        ok = await self._finish(
+            keys=[INFLIGHT_KEY, f"{JOB_KEY_PREFIX}{job['id']}"],
+            args=[job["id"], job["lease"], status, field, value, self.result_ttl, time.time(), JOB_EVENTS_CHANNEL],
+        )
+        if not ok:
+            logger.warning("Job %s lease lost before it finished; result discarded", job["id"])
+        return bool(ok)
+
+    async def requeue_expired(self):
+        """Return jobs whose visibility deadline passed to their ready list. Returns how many were handled."""
+        return int(await self._requeue_expired(
+            keys=[INFLIGHT_KEY],
+            args=[time.time(), JOB_KEY_PREFIX, self.max_attempts, self.result_ttl, REQUEUE_BATCH, JOB_EVENTS_CHANNEL],
+        ))
+
+    async def lane_depths(self, job_types):
+        """{job_type: {lane: queued jobs}} summed over categories."""
+        pipe = self.redis.pipeline(transaction=False)
+        for job_type in job_types:
+            for lane in LANES:
+                pipe.zrange(f"{ACTIVE_KEY_PREFIX}{job_type}:{lane}", 0, -1)
+        categories = await pipe.execute()
+        pipe = self.redis.pipeline(transaction=False)
+        slots = []
+        i = 0
+        for job_type in job_types:
+            for lane in LANES:
+                for category in categories[i]:
+                    category = category.decode("utf-8") if isinstance(category, bytes) else category
+                    pipe.llen(f"{READY_KEY_PREFIX}{job_type}:{lane}:{category}")
+                    slots.append((job_type, lane))
+                i += 1
+        lengths = await pipe.execute() if slots else []
+        depths = {job_type: dict.fromkeys(LANES, 0) for job_type in job_types}
+        for (job_type, lane), length in zip(slots, lengths):
+            depths[job_type][lane] += int(length)
+        return depths
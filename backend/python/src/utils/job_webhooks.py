@@ -0,0 +1,111 @@
+"""
+Completion webhooks for queued jobs (callback_url on /queue/audit and /queue/brief-generation).
+
+The consumer POSTs the finished job as JSON once it is acked, retrying with backoff up to
+JOB_WEBHOOK_ATTEMPTS times. With JOB_WEBHOOK_SECRET set, the body is signed:
+    X-CIE-Signature: sha256=<hex HMAC-SHA256 of the raw body>
+Callbacks are denied unless their host is listed in JOB_WEBHOOK_ALLOWED_HOSTS (comma-separated).
+Before each delivery the host is resolved and refused if any address is loopback, private,
+link-local, multicast, reserved or unspecified (JOB_WEBHOOK_ALLOW_PRIVATE_NETWORKS=true admits
+loopback / private receivers on the internal network; link-local — e.g. cloud metadata — never).
+Redirects are not followed. Delivery is best effort — the job result stays readable via /audits,
+/briefs and the /jobs event streams either way.
+"""
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import socket
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+JOB_WEBHOOK_SECRET = os.getenv('JOB_WEBHOOK_SECRET', '')
+JOB_WEBHOOK_ALLOWED_HOSTS = {h.strip().lower() for h in os.getenv('JOB_WEBHOOK_ALLOWED_HOSTS', '').split(",") if h.strip()}
+JOB_WEBHOOK_TIMEOUT_SECONDS = float(os.getenv('JOB_WEBHOOK_TIMEOUT_SECONDS', '5'))
+JOB_WEBHOOK_ATTEMPTS = int(os.getenv('JOB_WEBHOOK_ATTEMPTS', '3'))
+JOB_WEBHOOK_ALLOW_PRIVATE_NETWORKS = os.getenv('JOB_WEBHOOK_ALLOW_PRIVATE_NETWORKS', 'false').strip().lower() in ('1', 'true', 'yes')
+
+
+def address_allowed(address):
+    """True if a callback may be delivered to this IP address (see module docstring)."""
+    ip = ipaddress.ip_address(address.split("%", 1)[0])  # drop an IPv6 zone id
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    if ip.is_link_local or ip.is_multicast or ip.is_unspecified or ip.is_reserved:
+        return False
+    if ip.is_loopback or ip.is_private:
+        return JOB_WEBHOOK_ALLOW_PRIVATE_NETWORKS
+    return True
+
+
+def callback_url_allowed(url):
+    """True if `url` is an http(s) URL whose host is in JOB_WEBHOOK_ALLOWED_HOSTS (IP literals must also pass address_allowed)."""
+    try:
+        parsed = urlparse(url)
+        host = parsed.hostname
+    except ValueError:
+        return False
+    if parsed.scheme not in ("http", "https") or not host:
+        return False
+    if host.lower() not in JOB_WEBHOOK_ALLOWED_HOSTS:
+        return False
+    try:
+        return address_allowed(host)
+    except ValueError:
+        return True  # a host name; its addresses are checked at delivery
+
+
+async def _resolves_to_allowed(url):
+    """Resolve the callback host now and require every address to pass address_allowed."""
+    parsed = urlparse(url)
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            parsed.hostname, parsed.port or (443 if parsed.scheme == "https" else 80), type=socket.SOCK_STREAM
+        )
+    except OSError as e:
+        logger.warning("Webhook host %s did not resolve: %s", parsed.hostname, e)
+        return False
+    addresses = {info[4][0] for info in infos}
+    blocked = sorted(a for a in addresses if not address_allowed(a))
+    if blocked or not addresses:
+        logger.warning("Webhook %s refused: host resolves to disallowed address(es) %s", url, blocked)
+        return False
+    return True
+
+
+def webhook_body(job, status, result=None, error=None):
+    body = {"job_id": job["id"], "type": job["type"], "status": status, "payload": job["payload"]}
+    if status == "completed":
+        body["result"] = result
+    else:
+        body["error"] = error
+    return json.dumps(body, default=str).encode("utf-8")
+
+
+async def deliver(client, url, body):
+    """POST `body` to `url` with retries; returns True on a 2xx response. Redirects count as failures."""
+    if not callback_url_allowed(url) or not await _resolves_to_allowed(url):
+        return False
+    headers = {"Content-Type": "application/json"}
+    if JOB_WEBHOOK_SECRET:
+        digest = hmac.new(JOB_WEBHOOK_SECRET.encode("utf-8"), body, hashlib.sha256).hexdigest()
+        headers["X-CIE-Signature"] = f"sha256={digest}"
+    attempts = max(1, JOB_WEBHOOK_ATTEMPTS)
+    for attempt in range(1, attempts + 1):
+        try:
+            response = await client.post(
+                url, content=body, headers=headers, timeout=JOB_WEBHOOK_TIMEOUT_SECONDS, follow_redirects=False
+            )
+            if 200 <= response.status_code < 300:
+                return True
+            error = f"HTTP {response.status_code}"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        logger.warning("Webhook %s attempt %d/%d failed: %s", url, attempt, attempts, error)
+        if attempt < attempts:
+            await asyncio.sleep(2 ** (attempt - 1))
+    return False
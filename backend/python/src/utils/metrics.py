@@ -0,0 +1,117 @@
+"""
+Prometheus metrics for the CIE Python worker.
+All worker metrics are defined here so names and labels stay consistent across modules.
+The API serves them on GET /metrics; the job worker on JOB_WORKER_METRICS_PORT.
+"""
+import time
+from contextlib import contextmanager
+
+from prometheus_client import Counter, Gauge, Histogram
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "cie_http_request_duration_seconds",
+    "API request latency per method and route template (streaming responses: time to headers)",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+HTTP_REQUESTS = Counter(
+    "cie_http_requests_total",
+    "API requests per method, route template and status code",
+    ["method", "route", "status"],
+)
+FAIL_SOFT_RESPONSES = Counter(
+    "cie_fail_soft_responses_total",
+    "Fail-soft responses (v2.3.2) per route: degraded results or status 'pending'",
+    ["route", "kind"],
+)
+EMBED_PROVIDER_SECONDS = Histogram(
+    "cie_embedding_provider_duration_seconds",
+    "Embedding provider call latency (one multi-input call), per provider",
+    ["provider"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 10),
+)
+EMBED_PROVIDER_ERRORS = Counter(
+    "cie_embedding_provider_errors_total",
+    "Failed embedding provider calls per provider and exception type",
+    ["provider", "error"],
+)
+CLUSTER_CACHE_LOOKUPS = Counter(
+    "cie_cluster_cache_lookups_total",
+    "Centroid lookups by where they were served: store (mmap file), local, redis, or miss",
+    ["source"],
+)
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "cie_admission_in_flight",
+    "Requests holding an admission slot per route",
+    ["route"],
+)
+ADMISSION_WAITING = Gauge(
+    "cie_admission_waiting",
+    "Requests waiting for an admission slot per route",
+    ["route"],
+)
+ADMISSION_SHED = Counter(
+    "cie_admission_shed_total",
+    "Requests shed by admission control per route and reason (queue_full, wait_timeout)",
+    ["route", "reason"],
+)
+CIRCUIT_BREAKER_STATE = Gauge(
+    "cie_circuit_breaker_state",
+    "Circuit breaker state per dependency: 0 closed, 1 half-open, 2 open",
+    ["breaker"],
+)
+CIRCUIT_BREAKER_TRANSITIONS = Counter(
+    "cie_circuit_breaker_transitions_total",
+    "Circuit breaker state changes per dependency and new state",
+    ["breaker", "state"],
+)
+CIRCUIT_BREAKER_REJECTED = Counter(
+    "cie_circuit_breaker_rejected_total",
+    "Calls failed fast without reaching the dependency because its breaker was open",
+    ["breaker"],
+)
+EMBED_COALESCED_BATCH_SIZE = Histogram(
+    "cie_embedding_coalesced_batch_size",
+    "Texts per provider call sent by the embedding request coalescer",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+EMBED_SINGLEFLIGHT_SHARED = Counter(
+    "cie_embedding_singleflight_shared_total",
+    "Embedding requests served by an identical in-flight request",
+)
+JOB_QUEUE_DEPTH = Gauge(
+    "cie_job_queue_depth",
+    "Queued worker jobs per job type and priority lane",
+    ["job_type", "lane"],
+)
+JOB_WAIT_SECONDS = Histogram(
+    "cie_job_wait_seconds",
+    "Time from enqueue to a consumer claiming the job, per job type and priority lane",
+    ["job_type", "lane"],
+    buckets=(0.1, 0.5, 1, 5, 15, 60, 300, 900, 3600, 14400, 86400),
+)
+GATE_DURATION_SECONDS = Histogram(
+    "cie_gate_duration_seconds",
+    "Time spent evaluating one validation gate (G1–G7, G6.1), per gate and tier; skipped gates are not observed",
+    ["gate", "tier"],
+    buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1),
+)
+GATE_OUTCOMES = Counter(
+    "cie_gate_outcomes_total",
+    "Validation gate outcomes (pass / fail / skip) per gate, tier and error code ('' when passed)",
+    ["gate", "tier", "outcome", "error_code"],
+)
+
+
+@contextmanager
+def provider_call(provider_name):
+    """Time one embedding provider call and count it as an error if it raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        EMBED_PROVIDER_ERRORS.labels(provider_name, type(e).__name__).inc()
+        raise
+    finally:
+        EMBED_PROVIDER_SECONDS.labels(provider_name).observe(time.perf_counter() - started)
@@ -0,0 +1,33 @@
+"""
+Shared asyncio Redis client factory for the worker's async request path.
+Connections come from one blocking pool per URL shared by every caller in the process: at most
+REDIS_MAX_CONNECTIONS per process, and callers wait up to REDIS_POOL_TIMEOUT seconds for a free
+connection instead of opening more.
+"""
+import os
+
+import redis.asyncio
+
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', '64'))
+REDIS_POOL_TIMEOUT = float(os.getenv('REDIS_POOL_TIMEOUT', '2'))
+
+
+_clients = {}
+
+
+def async_redis_client(url=None):
+    """
+    The process's shared client for `url` (default REDIS_URL). Every caller gets the same client and
+    so the same pool; pub/sub subscriptions take their connection from it too.
+    """
+    url = url or REDIS_URL
+    client = _clients.get(url)
+    if client is None:
+        pool = redis.asyncio.BlockingConnectionPool.from_url(
+            url,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            timeout=REDIS_POOL_TIMEOUT,
+        )
+        client = _clients[url] = redis.asyncio.Redis(connection_pool=pool)
+    return client
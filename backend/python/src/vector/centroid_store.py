@@ -0,0 +1,179 @@
+"""
+Memory-mapped centroid store shared by every worker process on a host.
+
+src.jobs.centroid_store_export writes all of cluster_vectors, pre-normalized, to CENTROID_STORE_PATH:
+    header (64 bytes: b"CCS1", max version uint64, n uint32, dims uint32, built_at float64)
+    | n x dims float32 unit vectors | n uint64 versions | newline-separated cluster ids
+The file is written next to the target and renamed over it, so readers see either the old or the new
+file, never a partial one. Each worker maps it read-only: the matrix is a view over the page cache,
+so memory stays flat as workers are added and a new worker is warm from its first request.
+
+Freshness: cluster_cache reports every centroid invalidation here (supersede); a superseded cluster is
+served from Redis until a newer file is mapped. After a gap in invalidations, require_versions() is
+given every centroid's current Redis version stamp: a cluster whose row in the file is older (for
+example one published to Redis only) or missing from it is served from Redis until a file holding it
+at that version is mapped.
+"""
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CENTROID_STORE_PATH = os.getenv(
+    'CENTROID_STORE_PATH', os.path.join(os.getenv('CIE_DATA_DIR', '/var/lib/cie'), 'centroids.bin')
+)
+CHECK_INTERVAL = float(os.getenv('CENTROID_STORE_CHECK_SECONDS', '1'))
+
+_HEADER = struct.Struct("<4sQIId")
+_MAGIC = b"CCS1"
+_DATA_OFFSET = 64
+
+
+def write_store(path, cluster_ids, matrix, versions):
+    """Atomically replace the store file with unit-normalized `matrix` rows for `cluster_ids`."""
+    matrix = np.ascontiguousarray(matrix, dtype="<f4")
+    versions = np.asarray(versions, dtype="<u8")
+    n, dims = matrix.shape if matrix.size else (0, 0)
+    header = _HEADER.pack(_MAGIC, int(versions.max()) if n else 0, n, dims, time.time())
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".centroids.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header.ljust(_DATA_OFFSET, b"\0"))
+            f.write(matrix.tobytes())
+            f.write(versions.tobytes())
+            f.write("\n".join(cluster_ids).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class _Mapping:
+    """One mapped store file. Views stay valid after a swap for as long as they are referenced."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.stat = os.fstat(f.fileno())
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.max_version, n, dims, self.built_at = _HEADER.unpack_from(self._mm)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a centroid store file")
+        self.matrix = np.frombuffer(self._mm, dtype="<f4", count=n * dims, offset=_DATA_OFFSET).reshape(n, dims)
+        versions_at = _DATA_OFFSET + n * dims * 4
+        self.versions = np.frombuffer(self._mm, dtype="<u8", count=n, offset=versions_at)
+        ids = self._mm[versions_at + n * 8:].decode("utf-8")
+        self.ids = ids.split("\n") if n else []
+        self.rows = {cid: i for i, cid in enumerate(self.ids)}
+
+
+class CentroidStore:
+    """Per-process handle on the shared file; remaps at most every CHECK_INTERVAL seconds when it changes."""
+
+    def __init__(self, path=CENTROID_STORE_PATH, check_interval=CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._mapping = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self._superseded = {}  # cluster_id -> minimum row version that is its latest centroid
+
+    def _current(self):
+        if not self.path:
+            return None
+        now = time.monotonic()
+        if now < self._next_check:
+            return self._mapping
+        with self._lock:
+            if now < self._next_check:
+                return self._mapping
+            self._next_check = now + self.check_interval
+            try:
+                st = os.stat(self.path)
+            except OSError:
+                self._mapping = None
+                return None
+            current = self._mapping
+            if current is None or (current.stat.st_ino, current.stat.st_mtime_ns) != (st.st_ino, st.st_mtime_ns):
+                try:
+                    self._mapping = _Mapping(self.path)
+                    self._prune_superseded(self._mapping)
+                    logger.info(f"Mapped centroid store {self.path}: {len(self._mapping.ids)} clusters, "
+                                f"version {self._mapping.max_version}")
+                except Exception as e:
+                    logger.warning(f"Could not map centroid store {self.path}: {e}")
+                    self._mapping = None
+            return self._mapping
+
+    def get(self, cluster_id):
+        """Zero-copy unit vector for `cluster_id`, or None if absent or superseded since the file was built."""
+        mapping = self._current()
+        if mapping is None:
+            return None
+        row = mapping.rows.get(cluster_id)
+        if row is None or int(mapping.versions[row]) < self._superseded.get(cluster_id, 0):
+            return None
+        return mapping.matrix[row]
+
+    def matrix(self):
+        """(cluster_ids, n x d unit matrix) straight from the file, or None while any centroid is newer."""
+        mapping = self._current()
+        if mapping is None or not mapping.ids:
+            return None
+        for cluster_id, version in list(self._superseded.items()):
+            row = mapping.rows.get(cluster_id)
+            if row is None or int(mapping.versions[row]) < version:
+                return None
+        return mapping.ids, mapping.matrix
+
+    def _prune_superseded(self, mapping):
+        """Forget requirements the newly mapped file meets (files only get newer)."""
+        for cluster_id, version in list(self._superseded.items()):
+            row = mapping.rows.get(cluster_id)
+            if row is not None and int(mapping.versions[row]) >= version:
+                self._superseded.pop(cluster_id, None)
+
+    def supersede(self, cluster_id):
+        """A newer centroid than the mapped file holds was published for `cluster_id`."""
+        mapping = self._mapping
+        self._superseded[cluster_id] = (mapping.max_version if mapping is not None else 0) + 1
+
+    def require_versions(self, versions):
+        """
+        {cluster_id: current version stamp}: serve each cluster from the file only from a row at least
+        that new (invalidations may have been missed).
+        """
+        mapping = self._mapping
+        for cluster_id, version in versions.items():
+            version = int(version)
+            if mapping is not None:
+                row = mapping.rows.get(cluster_id)
+                if row is not None and int(mapping.versions[row]) >= version:
+                    continue
+            if version > self._superseded.get(cluster_id, 0):
+                self._superseded[cluster_id] = version
+
+    def stats(self):
+        mapping = self._mapping
+        return {
+            "path": self.path,
+            "mapped": mapping is not None,
+            "clusters": len(mapping.ids) if mapping is not None else 0,
+            "version": mapping.max_version if mapping is not None else None,
+            "superseded": len(self._superseded),
+        }
+
+
+store = CentroidStore()
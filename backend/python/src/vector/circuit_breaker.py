@@ -0,0 +1,141 @@
+"""
+Circuit breaker for remote dependencies on the request path (embedding provider).
+
+- closed    — calls go through; `failure_threshold` consecutive failures open the breaker.
+- open      — calls are rejected at once with CircuitOpenError (callers fail soft) for
+              `open_seconds`, instead of each waiting out the provider timeout.
+- half_open — after the cool-down up to `half_open_probes` calls are let through as probes; a
+              successful probe closes the breaker, a failed one re-opens it for another cool-down.
+State is per worker process and thread-safe (sync provider calls run on worker threads).
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from ..utils.metrics import CIRCUIT_BREAKER_REJECTED, CIRCUIT_BREAKER_STATE, CIRCUIT_BREAKER_TRANSITIONS
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+# CIRCUIT_BREAKER_STATE gauge value per state
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the dependency while the breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker; wrap each dependency call in guard()."""
+
+    def __init__(self, name, failure_threshold=5, open_seconds=30.0, half_open_probes=1, enabled=True):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.open_seconds = max(0.0, open_seconds)
+        self.half_open_probes = max(1, half_open_probes)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self.rejected = 0
+        self.opened = 0
+        CIRCUIT_BREAKER_STATE.labels(name).set(_STATE_VALUES[CLOSED])
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def _transition(self, state):
+        previous, self._state = self._state, state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            self.opened += 1
+        if state != HALF_OPEN:
+            self._probes = 0
+        if state == CLOSED:
+            self._failures = 0
+        CIRCUIT_BREAKER_STATE.labels(self.name).set(_STATE_VALUES[state])
+        CIRCUIT_BREAKER_TRANSITIONS.labels(self.name, state).inc()
+        log = logger.info if state == CLOSED else logger.warning
+        log(f"Circuit breaker '{self.name}': {previous} -> {state}")
+
+    def _acquire(self):
+        """(allowed, probe): whether a call may proceed now, reserving a probe slot when half-open."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True, False
+            if state == HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                return True, True
+            self.rejected += 1
+        CIRCUIT_BREAKER_REJECTED.labels(self.name).inc()
+        return False, False
+
+    def record_success(self, probe=False):
+        with self._lock:
+            if probe:
+                self._probes = max(0, self._probes - 1)
+            if self._state == HALF_OPEN and probe:
+                self._transition(CLOSED)
+            elif self._state == CLOSED:
+                self._failures = 0
+
+    def record_failure(self, probe=False):
+        with self._lock:
+            if probe:
+                self._probes = max(0, self._probes - 1)
+            if self._state == HALF_OPEN and probe:
+                self._transition(OPEN)
+            elif self._state == CLOSED:
+                self._failures += 1
+                if self._failures >= self.failure_threshold:
+                    self._transition(OPEN)
+
+    @contextmanager
+    def guard(self):
+        """Run one dependency call: raises CircuitOpenError while open, records the call's outcome otherwise."""
+        if not self.enabled:
+            yield
+            return
+        allowed, probe = self._acquire()
+        if not allowed:
+            raise CircuitOpenError(f"{self.name} circuit open; failing fast")
+        try:
+            yield
+        except Exception:
+            self.record_failure(probe)
+            raise
+        except BaseException:
+            # Cancelled mid-call: no verdict on the dependency, but free the probe slot
+            if probe:
+                with self._lock:
+                    self._probes = max(0, self._probes - 1)
+            raise
+        self.record_success(probe)
+
+    def stats(self):
+        with self._lock:
+            state = self._current_state() if self.enabled else CLOSED
+            retry_in = max(0.0, self.open_seconds - (time.monotonic() - self._opened_at)) if state == OPEN else 0.0
+            return {
+                "enabled": self.enabled,
+                "state": state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "open_seconds": self.open_seconds,
+                "retry_in_seconds": round(retry_in, 1),
+                "times_opened": self.opened,
+                "rejected": self.rejected,
+            }
@@ -1,24 +1,287 @@
 """
 Cluster intent centroid vectors — cached in Redis (v2.3.1 §8.2.1).
 Vectors are updated only when the SEO Governor updates a cluster's intent statement.
+
+Storage: packed little-endian float32 with a version stamp (see codec.pack_versioned). Values written
+by older workers as JSON lists are still readable. Each worker keeps a pre-normalized copy of
+every centroid it has used; cache_cluster_vector publishes on INVALIDATE_CHANNEL so all workers
+drop their copy, and local copies also expire after LOCAL_TTL seconds as a safety net.
+The same invalidations mark the all-clusters centroid matrix (get_centroid_matrix) for rebuild.
+When the shared memory-mapped centroid file (centroid_store) is present, centroids it holds are read
+from it zero-copy and only centroids published after it was built go to Redis; on (re)subscribe every
+Redis centroid's version stamp is checked against its row in the file.
 """
-import json
+import logging
 import os
+import threading
+import time
 
+import numpy as np
 import redis
 
+from ..utils.metrics import CLUSTER_CACHE_LOOKUPS
+from ..utils.redis_pool import async_redis_client
+from .centroid_store import store as centroid_store
+from .codec import VERSIONED_STAMP_BYTES, versioned_stamp
+from .codec import pack_versioned as pack_vector, unpack_versioned as unpack_vector
+
+logger = logging.getLogger(__name__)
+
 r = redis.from_url(os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+ar = async_redis_client()
 REDIS_KEY_PREFIX = "cluster:"
+VERSION_KEY = "cluster_version"
+INVALIDATE_CHANNEL = "cluster:invalidate"
+LOCAL_TTL = float(os.getenv('CLUSTER_CACHE_LOCAL_TTL', '300'))
+
+_local = {}  # cluster_id -> (expires_at, version, unit float32 vector)
+_local_lock = threading.Lock()
+_listener = None
+_matrix = None  # (expires_at, cluster_ids, n x d unit float32 matrix)
+SCAN_BATCH = 500
+
+
+def _normalize(arr):
+    norm = float(np.linalg.norm(arr))
+    if norm == 0.0:
+        return None
+    return (arr / norm).astype(np.float32)
 
 
 def get_cluster_vector(cluster_id):
     """Load cluster centroid vector from Redis. Returns None if not cached."""
     vec = r.get(f"{REDIS_KEY_PREFIX}{cluster_id}")
     if vec:
-        return json.loads(vec)
+        return unpack_vector(vec)[1].tolist()
     return None
 
 
+def get_cluster_unit_vectors(cluster_ids):
+    """
+    Pre-normalized centroids for the hot path: served from the in-process copy, with one
+    Redis MGET for any cluster not held locally. Returns {cluster_id: unit vector or None}.
+    """
+    out, missing = _lookup_local(cluster_ids)
+    if missing:
+        raw = r.mget([f"{REDIS_KEY_PREFIX}{cid}" for cid in missing])
+        _accept_remote(out, missing, raw)
+    return out
+
+
+async def aget_cluster_unit_vectors(cluster_ids):
+    """Async form of get_cluster_unit_vectors (Redis via the asyncio client)."""
+    out, missing = _lookup_local(cluster_ids)
+    if missing:
+        raw = await ar.mget([f"{REDIS_KEY_PREFIX}{cid}" for cid in missing])
+        _accept_remote(out, missing, raw)
+    return out
+
+
+def get_cluster_unit_vector(cluster_id):
+    """Single-cluster form of get_cluster_unit_vectors."""
+    return get_cluster_unit_vectors([cluster_id]).get(cluster_id)
+
+
+async def aget_cluster_unit_vector(cluster_id):
+    """Async single-cluster form of get_cluster_unit_vectors."""
+    return (await aget_cluster_unit_vectors([cluster_id])).get(cluster_id)
+
+
+def _lookup_local(cluster_ids):
+    _ensure_listener()
+    out = {}
+    missing = []
+    now = time.monotonic()
+    rest = []
+    for cid in dict.fromkeys(cluster_ids):
+        shared = centroid_store.get(cid)
+        if shared is not None:
+            out[cid] = shared
+        else:
+            rest.append(cid)
+    from_store = len(out)
+    with _local_lock:
+        for cid in rest:
+            entry = _local.get(cid)
+            if entry is not None and entry[0] > now:
+                out[cid] = entry[2]
+            else:
+                missing.append(cid)
+    CLUSTER_CACHE_LOOKUPS.labels("store").inc(from_store)
+    CLUSTER_CACHE_LOOKUPS.labels("local").inc(len(out) - from_store)
+    return out, missing
+
+
+def _accept_remote(out, missing, raw):
+    expires_at = time.monotonic() + LOCAL_TTL
+    with _local_lock:
+        for cid, blob in zip(missing, raw):
+            unit = None
+            if blob:
+                version, arr = unpack_vector(blob)
+                unit = _normalize(arr)
+                if unit is not None:
+                    _local[cid] = (expires_at, version, unit)
+            CLUSTER_CACHE_LOOKUPS.labels("redis" if unit is not None else "miss").inc()
+            out[cid] = unit
+
+
+def get_centroid_matrix():
+    """
+    Every cached centroid as one normalized matrix: (cluster_ids, n x d float32 array).
+    Built with SCAN + MGET and kept in-process until a centroid changes or LOCAL_TTL passes.
+    """
+    current = _current_matrix()
+    if current is not None:
+        return current
+    keys = list(r.scan_iter(match=f"{REDIS_KEY_PREFIX}*", count=SCAN_BATCH))
+    blobs = []
+    for start in range(0, len(keys), SCAN_BATCH):
+        blobs.extend(r.mget(keys[start:start + SCAN_BATCH]))
+    return _store_matrix(keys, blobs)
+
+
+async def aget_centroid_matrix():
+    """Async form of get_centroid_matrix."""
+    current = _current_matrix()
+    if current is not None:
+        return current
+    keys = [k async for k in ar.scan_iter(match=f"{REDIS_KEY_PREFIX}*", count=SCAN_BATCH)]
+    blobs = []
+    for start in range(0, len(keys), SCAN_BATCH):
+        blobs.extend(await ar.mget(keys[start:start + SCAN_BATCH]))
+    return _store_matrix(keys, blobs)
+
+
+def _current_matrix():
+    _ensure_listener()
+    shared = centroid_store.matrix()
+    if shared is not None:
+        return shared
+    current = _matrix
+    if current is not None and current[0] > time.monotonic():
+        return current[1], current[2]
+    return None
+
+
+def _store_matrix(keys, blobs):
+    global _matrix
+    ids, matrix = _build_centroid_matrix(keys, blobs)
+    _matrix = (time.monotonic() + LOCAL_TTL, ids, matrix)
+    return ids, matrix
+
+
+def _build_centroid_matrix(keys, blobs):
+    ids = []
+    rows = []
+    dims = None
+    for key, blob in zip(keys, blobs):
+        if not blob:
+            continue
+        cluster_id = key.decode("utf-8") if isinstance(key, bytes) else key
+        cluster_id = cluster_id[len(REDIS_KEY_PREFIX):]
+        try:
+            unit = _normalize(unpack_vector(blob)[1])
+        except Exception as e:
+            logger.warning("Skipping unreadable centroid %s: %s", cluster_id, e)
+            continue
+        if unit is None:
+            continue
+        if dims is None:
+            dims = unit.shape[0]
+        if unit.shape[0] != dims:
+            logger.warning("Skipping centroid %s: %d dims, expected %d", cluster_id, unit.shape[0], dims)
+            continue
+        ids.append(cluster_id)
+        rows.append(unit)
+    if not rows:
+        return [], np.zeros((0, 0), dtype=np.float32)
+    return ids, np.vstack(rows)
+
+
 def cache_cluster_vector(cluster_id, vector):
     """Store cluster centroid vector in Redis. Call when SEO Governor updates cluster intent."""
-    r.set(f"{REDIS_KEY_PREFIX}{cluster_id}", json.dumps(vector))
+    version = next_version()
+    cache_cluster_vectors({cluster_id: vector}, version)
+    return version
+
+
+def next_version():
+    """Allocate a centroid version stamp (monotonic across all writers)."""
+    return r.incr(VERSION_KEY)
+
+
+def cache_cluster_vectors(vectors, version):
+    """
+    Store several centroids under one version stamp in a single MULTI/EXEC, then notify every
+    worker to drop its copies. vectors: {cluster_id: vector}.
+    """
+    if not vectors:
+        return
+    pipe = r.pipeline(transaction=True)
+    for cluster_id, vector in vectors.items():
+        pipe.set(f"{REDIS_KEY_PREFIX}{cluster_id}", pack_vector(vector, version))
+    for cluster_id in vectors:
+        pipe.publish(INVALIDATE_CHANNEL, cluster_id)
+    pipe.execute()
+    for cluster_id in vectors:
+        invalidate_local(cluster_id)
+
+
+def invalidate_local(cluster_id=None):
+    """Drop this worker's copy of one centroid (or all of them when cluster_id is None)."""
+    global _matrix
+    _matrix = None
+    with _local_lock:
+        if cluster_id is None:
+            _local.clear()
+        else:
+            _local.pop(cluster_id, None)
+            centroid_store.supersede(cluster_id)
+
+
+def _listen_for_invalidations():
+    while True:
+        try:
+            pubsub = r.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(INVALIDATE_CHANNEL)
+            # Anything published while we were not subscribed is unknown: start clean, and trust
+            # the shared centroid file per cluster only where its row is as new as Redis
+            invalidate_local()
+            centroid_store.require_versions(_redis_versions())
+            for message in pubsub.listen():
+                data = message.get("data")
+                if isinstance(data, bytes):
+                    data = data.decode("utf-8", "replace")
+                invalidate_local(data or None)
+        except Exception as e:
+            logger.warning("Cluster invalidation listener error, resubscribing: %s", e)
+            invalidate_local()
+            time.sleep(1.0)
+
+
+def _redis_versions():
+    """{cluster_id: version stamp} of every centroid in Redis (reads only each value's header)."""
+    keys = list(r.scan_iter(match=f"{REDIS_KEY_PREFIX}*", count=SCAN_BATCH))
+    versions = {}
+    for start in range(0, len(keys), SCAN_BATCH):
+        batch = keys[start:start + SCAN_BATCH]
+        pipe = r.pipeline(transaction=False)
+        for key in batch:
+            pipe.getrange(key, 0, VERSIONED_STAMP_BYTES - 1)
+        for key, head in zip(batch, pipe.execute()):
+            cluster_id = key.decode("utf-8") if isinstance(key, bytes) else key
+            versions[cluster_id[len(REDIS_KEY_PREFIX):]] = versioned_stamp(head or b"")
+    return versions
+
+
+def _ensure_listener():
+    global _listener
+    if _listener is not None:
+        return
+    with _local_lock:
+        if _listener is None:
+            _listener = threading.Thread(
+                target=_listen_for_invalidations, name="cluster-cache-invalidation", daemon=True
+            )
+            _listener.start()
@@ -0,0 +1,110 @@
+"""
+Embedding request coalescer for the worker's async path.
+Requests arriving within EMBED_COALESCE_WINDOW_MS of each other are sent as one multi-input provider
+call (at most EMBED_COALESCE_MAX_BATCH texts) and the results fanned back out; each call goes through
+the embedding circuit breaker, so while it is open the whole batch fails at once. Identical texts already
+in flight share one future (singleflight), so template-generated descriptions are embedded once.
+"""
+import asyncio
+import logging
+import os
+
+from ..utils.metrics import EMBED_COALESCED_BATCH_SIZE, EMBED_SINGLEFLIGHT_SHARED, provider_call
+
+logger = logging.getLogger(__name__)
+
+EMBED_COALESCE_WINDOW_MS = float(os.getenv('EMBED_COALESCE_WINDOW_MS', '5'))
+EMBED_COALESCE_MAX_BATCH = int(os.getenv('EMBED_COALESCE_MAX_BATCH', '64'))
+
+
+class EmbeddingCoalescer:
+    """Micro-batches concurrent embed requests per model; provider calls share the caller's concurrency slots."""
+
+    def __init__(self, slots, breaker, window_ms=EMBED_COALESCE_WINDOW_MS, max_batch=EMBED_COALESCE_MAX_BATCH):
+        self.slots = slots
+        self.breaker = breaker
+        self.window = max(0.0, window_ms) / 1000.0
+        self.max_batch = max(1, max_batch)
+        self._inflight = {}  # cache key -> Future shared by identical texts
+        self._pending = {}  # model -> [(cache key, text)] waiting for the window to close
+        self._timers = {}  # model -> TimerHandle for the pending flush
+        self._tasks = set()
+        self.batches = 0
+        self.items = 0
+        self.shared = 0
+        self.largest_batch = 0
+
+    async def embed(self, key, text, model, provider):
+        """Embed one text via the current batch; raises the provider's error if its batch fails."""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.shared += 1
+            EMBED_SINGLEFLIGHT_SHARED.inc()
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
+        batch = self._pending.setdefault(model, [])
+        batch.append((key, text))
+        if len(batch) >= self.max_batch or self.window == 0.0:
+            self._flush(model, provider)
+        elif model not in self._timers:
+            self._timers[model] = loop.call_later(self.window, self._flush, model, provider)
+        return await asyncio.shield(future)
+
+    def _flush(self, model, provider):
+        timer = self._timers.pop(model, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(model, None)
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._run(batch, model, provider))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch, model, provider):
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        EMBED_COALESCED_BATCH_SIZE.observe(len(batch))
+        vectors = None
+        error = RuntimeError("Embedding batch cancelled before the provider answered")
+        try:
+            with self.breaker.guard():
+                async with self.slots:
+                    with provider_call(provider.name):
+                        vectors = await provider.aembed([text for _, text in batch], model)
+            error = None
+        except Exception as e:
+            error = e
+        finally:
+            # Runs on cancellation too, so no caller (or later identical text) waits on a dead batch
+            self._resolve(batch, vectors, error)
+
+    def _resolve(self, batch, vectors, error):
+        """Settle and release every future of a batch: its vector, or an error (the batch's, or a missing vector)."""
+        vectors = list(vectors or [])
+        for i, (key, _) in enumerate(batch):
+            future = self._inflight.pop(key, None)
+            if future is None or future.done():
+                continue
+            vector = vectors[i] if i < len(vectors) else None
+            if error is not None:
+                future.set_exception(error)
+            elif vector is None:
+                future.set_exception(RuntimeError("Embedding provider returned no vector for this text"))
+            else:
+                future.set_result(vector)
+
+    def stats(self):
+        return {
+            "window_ms": self.window * 1000.0,
+            "max_batch": self.max_batch,
+            "batches": self.batches,
+            "items": self.items,
+            "shared": self.shared,
+            "largest_batch": self.largest_batch,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
@@ -0,0 +1,95 @@
+"""
+Vector storage codec shared by every Python reader and writer of embeddings.
+
+DB format (sku_vectors.vector_blob / cluster_vectors.vector_blob, migration 036):
+    b"CVB1" | dtype code (uint8: 1 = float32, 2 = float16) | dims (uint32) | little-endian values
+A 1536-dim float32 vector is 6 KB (float16: 3 KB) against ~30 KB as a JSON list. Rows not yet
+migrated still carry the JSON `vector` column; decode_row() reads either.
+
+Redis centroid format (cluster_cache): b"CVF1" | version stamp (uint64) | dims (uint32) | float32 values.
+"""
+import json
+import os
+import struct
+
+import numpy as np
+
+_DB_HEADER = struct.Struct("<4sBI")
+_DB_MAGIC = b"CVB1"
+_DTYPES = {1: "<f4", 2: "<f2"}
+_DTYPE_CODES = {"float32": 1, "float16": 2}
+# dtype names encode() accepts
+DTYPES = tuple(_DTYPE_CODES)
+
+_VERSIONED_HEADER = struct.Struct("<4sQI")
+_VERSIONED_MAGIC = b"CVF1"
+# Leading bytes of a Redis centroid that hold magic + version stamp (read with GETRANGE)
+VERSIONED_STAMP_BYTES = 12
+
+# dtype used by writers of the DB format (float16 halves storage again at ~3 significant digits)
+STORAGE_DTYPE = os.getenv('VECTOR_STORAGE_DTYPE', 'float32').strip().lower()
+
+
+def encode(vector, dtype=None):
+    """Encode a vector in the DB blob format."""
+    dtype = (dtype or STORAGE_DTYPE).lower()
+    if dtype not in _DTYPE_CODES:
+        raise ValueError(f"Unsupported vector storage dtype {dtype!r}; expected float32 or float16")
+    code = _DTYPE_CODES[dtype]
+    arr = np.asarray(vector, dtype=_DTYPES[code])
+    return _DB_HEADER.pack(_DB_MAGIC, code, arr.shape[0]) + arr.tobytes()
+
+
+def decode(blob):
+    """Decode a DB blob (or a legacy JSON list / JSON text) to a float32 array."""
+    if isinstance(blob, (bytes, bytearray, memoryview)):
+        blob = bytes(blob)
+        if blob[:4] == _DB_MAGIC:
+            _, code, dims = _DB_HEADER.unpack_from(blob)
+            if code not in _DTYPES:
+                raise ValueError(f"Unknown vector dtype code {code}")
+            return np.frombuffer(blob, dtype=_DTYPES[code], count=dims, offset=_DB_HEADER.size).astype(np.float32)
+        blob = blob.decode("utf-8")
+    if isinstance(blob, str):
+        blob = json.loads(blob)
+    return np.asarray(blob, dtype=np.float32)
+
+
+def decode_row(vector_blob, vector_json=None):
+    """Decode a (vector_blob, vector) column pair, preferring the binary column."""
+    if vector_blob is not None:
+        return decode(vector_blob)
+    if vector_json is None:
+        return None
+    return decode(vector_json)
+
+
+def pack_versioned(vector, version):
+    """Encode a centroid with its version stamp (Redis format)."""
+    arr = np.asarray(vector, dtype="<f4")
+    return _VERSIONED_HEADER.pack(_VERSIONED_MAGIC, int(version), arr.shape[0]) + arr.tobytes()
+
+
+def versioned_stamp(head):
+    """Version stamp from the first VERSIONED_STAMP_BYTES of a Redis centroid; 0 for legacy JSON values."""
+    if len(head) >= VERSIONED_STAMP_BYTES and head[:4] == _VERSIONED_MAGIC:
+        return struct.unpack_from("<Q", head, 4)[0]
+    return 0
+
+
+def unpack_versioned(blob):
+    """Decode a Redis centroid. Returns (version, float32 array); legacy JSON values get version 0."""
+    if blob[:4] == _VERSIONED_MAGIC:
+        _, version, dims = _VERSIONED_HEADER.unpack_from(blob)
+        return version, np.frombuffer(blob, dtype="<f4", count=dims, offset=_VERSIONED_HEADER.size)
+    return 0, np.asarray(json.loads(blob), dtype="<f4")
+
+
+def to_f32_bytes(vector):
+    """Headerless little-endian float32 bytes (embedding cache values)."""
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+
+def from_f32_bytes(blob):
+    """Inverse of to_f32_bytes, as a list of floats."""
+    return np.frombuffer(blob, dtype="<f4").tolist()
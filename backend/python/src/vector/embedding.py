@@ -1,13 +1,51 @@
 """
-OpenAI text-embedding-3-small (1536 dims) for CIE semantic validation (v2.3.1 §8.1).
+Text embeddings for CIE semantic validation (v2.3.1 §8.1).
+
+The backend is selected per deployment with EMBEDDING_PROVIDER:
+- openai  (default) — OpenAI text-embedding-3-small, 1536 dims, EMBEDDING_TIMEOUT ms (fail-soft).
+- local   — CPU static-embedding model loaded from EMBEDDING_LOCAL_MODEL_DIR (no network).
+- hashing — deterministic hashing vectorizer (tests / offline benchmarks; not semantic).
+Centroids must be built with the same provider that scores against them.
+
+Provider calls go through a circuit breaker (EMBEDDING_BREAKER_*): after repeated failures
+requests fail soft at once instead of each waiting out EMBEDDING_TIMEOUT, until a probe succeeds.
 """
+import asyncio
+import hashlib
+import json
 import os
 import logging
+import re
 
 import numpy as np
 
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .coalescer import EmbeddingCoalescer
+from .embedding_cache import cache, cache_key
+from ..utils.metrics import provider_call
+
 logger = logging.getLogger(__name__)
 _client = None
+_async_client = None
+_provider = None
+
+# Inputs per multi-input embeddings call (OpenAI accepts up to 2048; keep requests well under the 3s timeout)
+EMBED_BATCH_SIZE = int(os.getenv('EMBED_BATCH_SIZE', '100'))
+# v2.3.2: 3s timeout for fail-soft
+EMBEDDING_TIMEOUT_SECONDS = float(os.getenv('EMBEDDING_TIMEOUT', '3000').split()[0]) / 1000.0
+DEFAULT_MODEL = "text-embedding-3-small"
+# Max provider calls in flight per worker process on the async path
+EMBEDDING_MAX_CONCURRENCY = int(os.getenv('EMBEDDING_MAX_CONCURRENCY', '16'))
+_provider_slots = asyncio.Semaphore(EMBEDDING_MAX_CONCURRENCY)
+# Circuit breaker: consecutive failed provider calls that open it, and seconds before a probe call
+breaker = CircuitBreaker(
+    "embedding",
+    failure_threshold=int(os.getenv('EMBEDDING_BREAKER_FAILURES', '5')),
+    open_seconds=float(os.getenv('EMBEDDING_BREAKER_OPEN_SECONDS', '30')),
+    half_open_probes=int(os.getenv('EMBEDDING_BREAKER_PROBES', '1')),
+    enabled=os.getenv('EMBEDDING_BREAKER_ENABLED', 'true').strip().lower() in ('1', 'true', 'yes'),
+)
+coalescer = EmbeddingCoalescer(_provider_slots, breaker)
 
 
 def _get_client():
@@ -20,25 +58,315 @@ def _get_client():
                 "OPENAI_API_KEY is not configured. "
                 "Set it in your .env file or as an environment variable."
             )
-        _client = OpenAI(api_key=api_key, timeout=3.0)  # v2.3.2: 3s timeout for fail-soft
+        _client = OpenAI(api_key=api_key, timeout=EMBEDDING_TIMEOUT_SECONDS)
     return _client
 
 
-def get_embedding(text, model="text-embedding-3-small"):
+def _get_async_client():
+    global _async_client
+    if _async_client is None:
+        from openai import AsyncOpenAI
+        api_key = os.getenv('OPENAI_API_KEY')
+        if not api_key or api_key == 'sk-...':
+            raise RuntimeError(
+                "OPENAI_API_KEY is not configured. "
+                "Set it in your .env file or as an environment variable."
+            )
+        _async_client = AsyncOpenAI(api_key=api_key, timeout=EMBEDDING_TIMEOUT_SECONDS)
+    return _async_client
+
+
+class EmbeddingProvider:
     """
-    Embed text with OpenAI text-embedding-3-small (1536 dimensions).
-    Fails soft on timeout (warns, returns None).
+    Embedding backend interface. embed() returns one vector per text, in order, and raises on
+    failure — fail-soft handling stays in get_embedding / get_embeddings.
     """
+
+    name = "base"
+    model = ""
+    dimensions = 0
+
+    def resolve_model(self, model=None):
+        """Model id used for the call and the cache key. Only remote providers honour a caller override."""
+        return self.model
+
+    def embed(self, texts, model=None):
+        raise NotImplementedError
+
+    async def aembed(self, texts, model=None):
+        """Async embed; CPU-bound providers run embed() on a worker thread."""
+        return await asyncio.to_thread(self.embed, texts, model)
+
+
+class OpenAIProvider(EmbeddingProvider):
+    """OpenAI embeddings API (multi-input calls)."""
+
+    name = "openai"
+    model = DEFAULT_MODEL
+    dimensions = 1536
+
+    def resolve_model(self, model=None):
+        return model or self.model
+
+    def embed(self, texts, model=None):
+        response = _get_client().embeddings.create(input=list(texts), model=self.resolve_model(model))
+        return self._ordered(response, len(texts))
+
+    async def aembed(self, texts, model=None):
+        response = await _get_async_client().embeddings.create(input=list(texts), model=self.resolve_model(model))
+        return self._ordered(response, len(texts))
+
+    @staticmethod
+    def _ordered(response, count):
+        vectors = [None] * count
+        for item in response.data:
+            vectors[item.index] = item.embedding
+        return vectors
+
+
+class LocalProvider(EmbeddingProvider):
+    """
+    CPU static-embedding model (model2vec-style): a `tokenizer.json` plus a vocab x dims token
+    matrix (`embeddings.npy` or `model.safetensors`) in a local directory; text vector = mean of
+    its token vectors, L2-normalized. The directory can be fetched once with huggingface_hub
+    `snapshot_download` and shipped with the image; nothing is downloaded at runtime.
+    """
+
+    name = "local"
+
+    def __init__(self, model_dir):
+        from tokenizers import Tokenizer
+        self.model_dir = model_dir
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.matrix = self._load_matrix(model_dir)
+        self.dimensions = int(self.matrix.shape[1])
+        self.model = f"local:{os.path.basename(os.path.normpath(model_dir))}"
+
+    @staticmethod
+    def _load_matrix(model_dir):
+        npy = os.path.join(model_dir, "embeddings.npy")
+        if os.path.exists(npy):
+            return np.load(npy).astype(np.float32)
+        path = os.path.join(model_dir, "model.safetensors")
+        with open(path, "rb") as f:
+            header_len = int.from_bytes(f.read(8), "little")
+            header = json.loads(f.read(header_len))
+            data = f.read()
+        name = "embeddings" if "embeddings" in header else next(k for k in header if k != "__metadata__")
+        meta = header[name]
+        dtypes = {"F32": "<f4", "F16": "<f2", "F64": "<f8"}
+        if meta["dtype"] not in dtypes:
+            raise RuntimeError(f"Unsupported tensor dtype {meta['dtype']} in {path}")
+        start, end = meta["data_offsets"]
+        return np.frombuffer(data[start:end], dtype=dtypes[meta["dtype"]]).reshape(meta["shape"]).astype(np.float32)
+
+    def embed(self, texts, model=None):
+        vectors = []
+        for encoding in self.tokenizer.encode_batch(list(texts), add_special_tokens=False):
+            ids = [i for i in encoding.ids if i < self.matrix.shape[0]]
+            if not ids:
+                vectors.append([0.0] * self.dimensions)
+                continue
+            vec = self.matrix[ids].mean(axis=0)
+            norm = float(np.linalg.norm(vec))
+            vectors.append((vec / norm if norm else vec).tolist())
+        return vectors
+
+
+class HashingProvider(EmbeddingProvider):
+    """
+    Deterministic hashing vectorizer over lowercase word unigrams and bigrams (signed feature
+    hashing, L2-normalized). Stable across processes and runs; for tests and offline benchmarks.
+    """
+
+    name = "hashing"
+    _TOKEN = re.compile(r"\w+")
+
+    def __init__(self, dimensions=1536):
+        self.dimensions = dimensions
+        self.model = f"hashing-{dimensions}"
+
+    def embed(self, texts, model=None):
+        vectors = []
+        for text in texts:
+            tokens = self._TOKEN.findall(text.lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            vec = np.zeros(self.dimensions, dtype=np.float32)
+            for feature in features:
+                h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+                vec[h % self.dimensions] += 1.0 if (h >> 63) & 1 else -1.0
+            norm = float(np.linalg.norm(vec))
+            vectors.append((vec / norm if norm else vec).tolist())
+        return vectors
+
+
+def _build_provider():
+    name = os.getenv('EMBEDDING_PROVIDER', 'openai').strip().lower()
+    if name == 'local':
+        model_dir = os.getenv('EMBEDDING_LOCAL_MODEL_DIR', '')
+        if not model_dir:
+            raise RuntimeError("EMBEDDING_PROVIDER=local requires EMBEDDING_LOCAL_MODEL_DIR.")
+        return LocalProvider(model_dir)
+    if name == 'hashing':
+        return HashingProvider(int(os.getenv('EMBEDDING_HASHING_DIMS', '1536')))
+    if name != 'openai':
+        logger.warning(f"Unknown EMBEDDING_PROVIDER '{name}', using openai")
+    return OpenAIProvider()
+
+
+def get_provider():
+    """The deployment's embedding provider (EMBEDDING_PROVIDER), built on first use."""
+    global _provider
+    if _provider is None:
+        _provider = _build_provider()
+    return _provider
+
+
+def set_provider(provider):
+    """Swap the embedding provider (tests, offline benchmarks). Returns the previous one."""
+    global _provider
+    previous, _provider = _provider, provider
+    return previous
+
+
+def get_embedding(text, model=None):
+    """
+    Embed text with the configured provider (default OpenAI text-embedding-3-small, 1536 dimensions).
+    Served from the content-addressed embedding cache when the normalized text is unchanged.
+    Fails soft on timeout (warns, returns None) and returns None at once while the provider breaker is open.
+    """
+    provider = get_provider()
+    model = provider.resolve_model(model)
+    key = cache_key(text, model)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    text = text.replace("\n", " ")
+    try:
+        with breaker.guard(), provider_call(provider.name):
+            vector = provider.embed([text], model)[0]
+    except CircuitOpenError:
+        return None
+    except Exception as e:
+        # Fail-soft: log warning, return None (don't block request)
+        logger.warning(f"Embedding API error (fail-soft): {str(e)[:100]}")
+        return None
+    return cache.set(key, vector)
+
+
+def get_embeddings(texts, model=None, batch_size=None):
+    """
+    Embed many texts with chunked multi-input provider calls (batch_size inputs per call).
+    Cached and duplicate texts are resolved before any provider call.
+    Returns one vector per input, in input order. A failed chunk yields None for each
+    of its texts (fail-soft, same as get_embedding) without affecting other chunks.
+    """
+    model = get_provider().resolve_model(model)
+    keys = [cache_key(t, model) for t in texts]
+    found = cache.get_many(list(dict.fromkeys(keys)))
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in missing:
+            missing[key] = text
+    if missing:
+        vectors = _embed_uncached(list(missing.values()), model, batch_size)
+        fresh = dict(zip(missing.keys(), vectors))
+        found.update(cache.set_many(fresh))
+    return [found.get(key) for key in keys]
+
+
+def _embed_uncached(texts, model, batch_size=None):
+    """Provider calls for get_embeddings: chunked multi-input requests, None per text of a failed chunk."""
+    provider = get_provider()
+    size = max(1, batch_size or EMBED_BATCH_SIZE)
+    cleaned = [t.replace("\n", " ") for t in texts]
+    vectors = [None] * len(cleaned)
+    for start in range(0, len(cleaned), size):
+        chunk = cleaned[start:start + size]
+        try:
+            with breaker.guard(), provider_call(provider.name):
+                vectors[start:start + len(chunk)] = provider.embed(chunk, model)
+        except CircuitOpenError:
+            continue
+        except Exception as e:
+            logger.warning(
+                f"Embedding API error for batch {start}-{start + len(chunk)} (fail-soft): {str(e)[:100]}"
+            )
+    return vectors
+
+
+async def get_embedding_async(text, model=None):
+    """
+    Async form of get_embedding for the worker's request path (non-blocking client, bounded concurrency).
+    Cache misses go through the coalescer: concurrent requests share multi-input calls and identical
+    in-flight texts share one result.
+    """
+    provider = get_provider()
+    model = provider.resolve_model(model)
+    key = cache_key(text, model)
+    cached = await cache.aget(key)
+    if cached is not None:
+        return cached
     text = text.replace("\n", " ")
     try:
-        response = _get_client().embeddings.create(input=[text], model=model)
-        return response.data[0].embedding
+        vector = await coalescer.embed(key, text, model, provider)
+    except CircuitOpenError:
+        return None
     except Exception as e:
         # Fail-soft: log warning, return None (don't block request)
         logger.warning(f"Embedding API error (fail-soft): {str(e)[:100]}")
         return None
+    return await cache.aset(key, vector)
+
+
+async def get_embeddings_async(texts, model=None, batch_size=None):
+    """Async form of get_embeddings; chunks are sent concurrently within EMBEDDING_MAX_CONCURRENCY."""
+    provider = get_provider()
+    model = provider.resolve_model(model)
+    keys = [cache_key(t, model) for t in texts]
+    found = await cache.aget_many(list(dict.fromkeys(keys)))
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in missing:
+            missing[key] = text
+    if missing:
+        size = max(1, batch_size or EMBED_BATCH_SIZE)
+        cleaned = [t.replace("\n", " ") for t in missing.values()]
+        chunks = [cleaned[start:start + size] for start in range(0, len(cleaned), size)]
+        results = await asyncio.gather(*(_aembed_chunk(provider, chunk, model) for chunk in chunks))
+        vectors = [v for chunk_vectors in results for v in chunk_vectors]
+        fresh = dict(zip(missing.keys(), vectors))
+        found.update(await cache.aset_many(fresh))
+    return [found.get(key) for key in keys]
+
+
+async def _aembed_chunk(provider, chunk, model):
+    try:
+        with breaker.guard():
+            async with _provider_slots:
+                with provider_call(provider.name):
+                    return await provider.aembed(chunk, model)
+    except CircuitOpenError:
+        return [None] * len(chunk)
+    except Exception as e:
+        logger.warning(f"Embedding API error for batch of {len(chunk)} (fail-soft): {str(e)[:100]}")
+        return [None] * len(chunk)
 
 
 def cosine_similarity(v1, v2):
     """Cosine similarity between two vectors."""
-    return float(np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2)))
\ No newline at end of file
+    return float(np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2)))
+
+
+def cosine_similarity_to_unit(v, unit):
+    """Cosine similarity against an already-normalized vector (e.g. a cached centroid)."""
+    v = np.asarray(v, dtype=np.float32)
+    norm = float(np.linalg.norm(v))
+    return float(np.dot(v, unit) / norm) if norm else 0.0
+
+
+def cosine_similarities_to_unit(matrix, unit):
+    """Cosine similarity of each row of matrix against an already-normalized vector, as one matrix-vector product."""
+    m = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(m, axis=1)
+    return np.divide(m @ unit, norms, out=np.zeros(m.shape[0], dtype=np.float32), where=norms > 0)
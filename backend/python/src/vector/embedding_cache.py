@@ -0,0 +1,187 @@
+"""
+Content-addressed embedding cache in front of the embedding provider.
+Key = sha256(model + normalized text); an in-process LRU backed by Redis (packed float32, with TTL),
+so unchanged descriptions skip the provider round trip entirely.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import redis
+
+from ..utils.redis_pool import async_redis_client
+from .codec import from_f32_bytes, to_f32_bytes
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "embed:"
+EMBED_CACHE_TTL = int(os.getenv('EMBED_CACHE_TTL', os.getenv('VECTOR_CACHE_TTL', '86400').split()[0]))
+EMBED_CACHE_MAX_ITEMS = int(os.getenv('EMBED_CACHE_MAX_ITEMS', '10000'))
+
+
+def normalize_text(text):
+    """Normalization applied before hashing: newlines and runs of whitespace collapse to one space."""
+    return " ".join((text or "").split())
+
+
+def cache_key(text, model):
+    """Content address for (normalized text, model)."""
+    digest = hashlib.sha256(f"{model}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+    return f"{model}:{digest}"
+
+
+class EmbeddingCache:
+    """In-process LRU (size + TTL bounded) with Redis as the shared second level. Redis errors count as misses."""
+
+    def __init__(self, redis_client=None, max_items=EMBED_CACHE_MAX_ITEMS, ttl=EMBED_CACHE_TTL, async_redis_client=None):
+        self.redis = redis_client
+        self.async_redis = async_redis_client
+        self.max_items = max_items
+        self.ttl = ttl
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits_memory = 0
+        self.hits_redis = 0
+        self.misses = 0
+        self.stores = 0
+
+    def get_many(self, keys):
+        """Return {key: vector} for every key found in memory or Redis."""
+        found, remote = self._lookup_memory(keys)
+        if remote and self.redis is not None:
+            try:
+                raw = self.redis.mget([f"{REDIS_KEY_PREFIX}{k}" for k in remote])
+            except Exception as e:
+                logger.warning("Embedding cache Redis read failed (treated as miss): %s", e)
+                raw = [None] * len(remote)
+            self._accept_remote(found, remote, raw)
+        self._count_misses(keys, found)
+        return found
+
+    async def aget_many(self, keys):
+        """Async form of get_many (Redis via the asyncio client)."""
+        found, remote = self._lookup_memory(keys)
+        if remote and self.async_redis is not None:
+            try:
+                raw = await self.async_redis.mget([f"{REDIS_KEY_PREFIX}{k}" for k in remote])
+            except Exception as e:
+                logger.warning("Embedding cache Redis read failed (treated as miss): %s", e)
+                raw = [None] * len(remote)
+            self._accept_remote(found, remote, raw)
+        self._count_misses(keys, found)
+        return found
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    async def aget(self, key):
+        return (await self.aget_many([key])).get(key)
+
+    def set_many(self, items):
+        """
+        Store {key: vector} in memory and Redis and return the stored (float32-rounded) vectors.
+        None vectors (fail-soft results) are never cached.
+        """
+        items = self._accept_local(items)
+        if not items or self.redis is None:
+            return items
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, vector in items.items():
+                pipe.set(f"{REDIS_KEY_PREFIX}{key}", to_f32_bytes(vector), ex=self.ttl)
+            pipe.execute()
+        except Exception as e:
+            logger.warning("Embedding cache Redis write failed: %s", e)
+        return items
+
+    async def aset_many(self, items):
+        """Async form of set_many."""
+        items = self._accept_local(items)
+        if not items or self.async_redis is None:
+            return items
+        try:
+            pipe = self.async_redis.pipeline(transaction=False)
+            for key, vector in items.items():
+                pipe.set(f"{REDIS_KEY_PREFIX}{key}", to_f32_bytes(vector), ex=self.ttl)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("Embedding cache Redis write failed: %s", e)
+        return items
+
+    def set(self, key, vector):
+        return self.set_many({key: vector}).get(key)
+
+    async def aset(self, key, vector):
+        return (await self.aset_many({key: vector})).get(key)
+
+    def _lookup_memory(self, keys):
+        found = {}
+        remote = []
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._lru.get(key)
+                if entry is not None and entry[0] > now:
+                    self._lru.move_to_end(key)
+                    found[key] = entry[1]
+                    self.hits_memory += 1
+                else:
+                    if entry is not None:
+                        del self._lru[key]
+                    remote.append(key)
+        return found, remote
+
+    def _accept_remote(self, found, remote, raw):
+        redis_hits = 0
+        for key, blob in zip(remote, raw):
+            if blob:
+                vector = from_f32_bytes(blob)
+                found[key] = vector
+                self._remember(key, vector)
+                redis_hits += 1
+        with self._lock:
+            self.hits_redis += redis_hits
+
+    def _count_misses(self, keys, found):
+        with self._lock:
+            self.misses += len(keys) - len(found)
+
+    def _accept_local(self, items):
+        # Round through float32 so the LRU holds exactly what a Redis hit would return
+        items = {k: from_f32_bytes(to_f32_bytes(v)) for k, v in items.items() if v is not None}
+        for key, vector in items.items():
+            self._remember(key, vector)
+        with self._lock:
+            self.stores += len(items)
+        return items
+
+    def _remember(self, key, vector):
+        if self.max_items <= 0:
+            return
+        with self._lock:
+            self._lru[key] = (time.monotonic() + self.ttl, vector)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_items:
+                self._lru.popitem(last=False)
+
+    def stats(self):
+        lookups = self.hits_memory + self.hits_redis + self.misses
+        return {
+            "size": len(self._lru),
+            "max_items": self.max_items,
+            "ttl_seconds": self.ttl,
+            "hits_memory": self.hits_memory,
+            "hits_redis": self.hits_redis,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": round((self.hits_memory + self.hits_redis) / lookups, 4) if lookups else 0.0,
+        }
+
+
+cache = EmbeddingCache(
+    redis.from_url(os.getenv('REDIS_URL', 'redis://localhost:6379/0')),
+    async_redis_client=async_redis_client(),
+)
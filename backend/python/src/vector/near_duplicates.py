@@ -0,0 +1,319 @@
+"""
+Near-duplicate SKU descriptions over sku_vectors (colour / length variants with near-identical copy).
+
+Random-projection LSH: each of LSH_TABLES tables hashes a unit vector to LSH_BITS sign bits against
+random hyperplanes, so vectors with high cosine similarity share a bucket in at least one table with
+high probability. Only SKUs sharing a bucket are compared (one small matrix product per bucket), which
+keeps the catalog scan near-linear instead of the n^2 all-pairs product.
+
+The nightly job (src.jobs.near_duplicate_scan) builds the index, stores pairs in sku_near_duplicates
+and saves hyperplanes + signatures to NEAR_DUP_INDEX_PATH; query_near_duplicates() uses that file to
+answer ad-hoc lookups, fetching only the candidate vectors from MySQL.
+"""
+import logging
+import os
+import threading
+
+import numpy as np
+
+from .codec import decode_row
+
+logger = logging.getLogger(__name__)
+
+NEAR_DUP_THRESHOLD = float(os.getenv('NEAR_DUP_THRESHOLD', '0.95'))
+# 12 bits x 16 tables finds ~99% of pairs at cosine 0.95 with ~n/4096 SKUs per bucket
+LSH_BITS = int(os.getenv('NEAR_DUP_LSH_BITS', '12'))
+LSH_TABLES = int(os.getenv('NEAR_DUP_LSH_TABLES', '16'))
+# Buckets larger than this usually mean a template description: they are split and their work capped
+MAX_BUCKET = int(os.getenv('NEAR_DUP_MAX_BUCKET', '2000'))
+BLOCK_SIZE = 256
+# Ad-hoc lookups fetch and score at most k x this many candidates (those sharing the most tables)
+CANDIDATE_FACTOR = int(os.getenv('NEAR_DUP_CANDIDATE_FACTOR', '20'))
+NEAR_DUP_INDEX_PATH = os.getenv(
+    'NEAR_DUP_INDEX_PATH', os.path.join(os.getenv('CIE_DATA_DIR', '/var/lib/cie'), 'near_dup_index.npz')
+)
+
+_loaded = None  # (mtime, LSHIndex)
+_loaded_lock = threading.Lock()
+
+
+def normalize_rows(matrix):
+    """L2-normalize the rows of a matrix; zero rows stay zero."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+class LSHIndex:
+    """Random-hyperplane LSH over unit vectors; `ids[i]` is the SKU id of row i."""
+
+    def __init__(self, planes, ids=None, signatures=None):
+        self.planes = np.asarray(planes, dtype=np.float32)  # tables x bits x dims
+        self.tables, self.bits, self.dims = self.planes.shape
+        self.ids = list(ids or [])
+        self.signatures = signatures  # n x tables int64
+        self._buckets = None
+
+    @classmethod
+    def create(cls, dims, bits=LSH_BITS, tables=LSH_TABLES, seed=0):
+        if not 1 <= bits <= 62:
+            raise ValueError("LSH bits must be between 1 and 62")
+        rng = np.random.default_rng(seed)
+        return cls(rng.standard_normal((tables, bits, dims)).astype(np.float32))
+
+    def signatures_for(self, matrix):
+        """n x tables bucket keys for the rows of `matrix`."""
+        matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+        flat = self.planes.reshape(self.tables * self.bits, self.dims)
+        bits = (matrix @ flat.T > 0).reshape(matrix.shape[0], self.tables, self.bits)
+        weights = np.left_shift(np.int64(1), np.arange(self.bits, dtype=np.int64))
+        return bits.astype(np.int64) @ weights
+
+    def build(self, ids, matrix):
+        self.ids = list(ids)
+        self.signatures = self.signatures_for(matrix)
+        self._buckets = None
+        return self
+
+    def buckets(self):
+        """Per table, {signature: row indices}."""
+        if self._buckets is None:
+            self._buckets = []
+            for t in range(self.tables):
+                column = self.signatures[:, t]
+                order = np.argsort(column, kind="stable")
+                cuts = np.flatnonzero(np.diff(column[order])) + 1
+                self._buckets.append({int(column[group[0]]): group for group in np.split(order, cuts)})
+        return self._buckets
+
+    def candidates(self, vector, limit=None):
+        """
+        Row indices sharing a bucket with `vector` in any table, most shared tables first.
+        With `limit`, only that many rows (ties keep row order).
+        """
+        signature = self.signatures_for(vector)[0]
+        groups = []
+        for t, table in enumerate(self.buckets()):
+            group = table.get(int(signature[t]))
+            if group is not None:
+                groups.append(group)
+        if not groups:
+            return []
+        rows, counts = np.unique(np.concatenate(groups), return_counts=True)
+        order = np.argsort(-counts, kind="stable")
+        if limit is not None:
+            order = order[:limit]
+        return rows[order].tolist()
+
+    def save(self, path):
+        tmp = f"{path}.tmp.npz"
+        np.savez(tmp, planes=self.planes, ids=np.asarray(self.ids, dtype=str), signatures=self.signatures)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(data["planes"], data["ids"].tolist(), data["signatures"])
+
+
+def find_pairs(index, matrix, threshold=NEAR_DUP_THRESHOLD):
+    """
+    All pairs (i, j, similarity), i < j, with cosine >= threshold among rows that share an LSH bucket.
+    `matrix` must hold the unit vectors the index was built from.
+
+    Each pair is scored once, in the first table where the two rows share a bucket compared in full.
+    Buckets over MAX_BUCKET (usually a template description) are split by the rows' signatures across
+    all tables, and a part still over MAX_BUCKET compares each row with only the next MAX_BUCKET rows;
+    the same oversized bucket recurring in later tables is scanned once.
+    """
+    signatures = index.signatures
+    compared = np.zeros(signatures.shape, dtype=bool)  # [row, table]: row's bucket was compared in full
+    pairs = []
+    oversized_pairs = set()  # found in split / capped buckets, which the first-table rule does not cover
+    oversized_seen = set()
+    for t, table in enumerate(index.buckets()):
+        for signature, group in table.items():
+            if len(group) < 2:
+                continue
+            group = np.sort(group)
+            if len(group) <= MAX_BUCKET:
+                compared[group, t] = True
+                for i, j, sim in _score_group(matrix, signatures, compared, t, group, threshold):
+                    if (i, j) not in oversized_pairs:
+                        pairs.append((i, j, sim))
+                continue
+            key = group.tobytes()
+            if key in oversized_seen:
+                continue
+            oversized_seen.add(key)
+            logger.warning(
+                f"LSH table {t} bucket {signature} holds {len(group)} SKUs; splitting by full signature "
+                f"and comparing each SKU with at most {MAX_BUCKET} others"
+            )
+            for part in _split_by_signature(signatures, group):
+                window = MAX_BUCKET if len(part) > MAX_BUCKET else None
+                for i, j, sim in _score_group(matrix, signatures, compared, t, part, threshold, window):
+                    if (i, j) not in oversized_pairs:
+                        oversized_pairs.add((i, j))
+                        pairs.append((i, j, sim))
+    return pairs
+
+
+def _split_by_signature(signatures, group):
+    """Sub-groups (size >= 2) of `group` whose rows share their bucket in every table."""
+    _, inverse = np.unique(signatures[group], axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    order = np.argsort(inverse, kind="stable")
+    cuts = np.flatnonzero(np.diff(inverse[order])) + 1
+    return [group[part] for part in np.split(order, cuts) if len(part) > 1]
+
+
+def _score_group(matrix, signatures, compared, t, group, threshold, window=None):
+    """
+    (i, j, similarity) at or above threshold for pairs of the sorted rows `group` that no earlier table
+    compared; with `window`, each row is compared only with the next `window` rows of the group.
+    Pairs already compared are dropped before the matrix product.
+    """
+    earlier = signatures[group, :t]
+    earlier_compared = compared[group, :t]
+    n = len(group)
+    for start in range(0, n, BLOCK_SIZE):
+        stop = min(start + BLOCK_SIZE, n)
+        end = n if window is None else min(n, stop + window)
+        rows = np.arange(start, stop)
+        cols = np.arange(start, end)
+        offset = cols[None, :] - rows[:, None]
+        mask = offset > 0
+        if window is not None:
+            mask &= offset <= window
+        if t:
+            shared = (earlier[rows][:, None, :] == earlier[cols][None, :, :]) & earlier_compared[rows][:, None, :]
+            mask &= ~shared.any(axis=2)
+        need_rows = np.flatnonzero(mask.any(axis=1))
+        if not len(need_rows):
+            continue
+        need_cols = np.flatnonzero(mask.any(axis=0))
+        sims = matrix[group[rows[need_rows]]] @ matrix[group[cols[need_cols]]].T
+        hit_rows, hit_cols = np.nonzero(mask[np.ix_(need_rows, need_cols)] & (sims >= threshold))
+        for r, c in zip(hit_rows.tolist(), hit_cols.tolist()):
+            yield int(group[rows[need_rows[r]]]), int(group[cols[need_cols[c]]]), float(sims[r, c])
+
+
+def load_sku_vectors(cursor, batch_size=1000):
+    """
+    Read (sku ids, unit-vector matrix) from sku_vectors through `cursor`, streaming batch_size rows into
+    one preallocated float32 matrix that is normalized in place.
+    """
+    cursor.execute("SELECT COUNT(*) FROM sku_vectors")
+    capacity = int(cursor.fetchone()[0])
+    cursor.execute("SELECT sku_id, vector_blob, vector FROM sku_vectors")
+    ids = []
+    matrix = None
+    skipped = 0
+    while True:
+        chunk = cursor.fetchmany(batch_size)
+        if not chunk:
+            break
+        start = len(ids)
+        for sku_id, blob, legacy in chunk:
+            try:
+                vector = decode_row(blob, legacy)
+            except Exception as e:
+                logger.warning(f"Skipping unreadable vector for SKU {sku_id}: {e}")
+                continue
+            if vector is None:
+                continue
+            if matrix is None:
+                matrix = np.empty((max(capacity, 1), vector.shape[0]), dtype=np.float32)
+            if vector.shape[0] != matrix.shape[1]:
+                skipped += 1
+                continue
+            if len(ids) == matrix.shape[0]:
+                # Rows added since the count: grow by half
+                matrix = np.concatenate([matrix, np.empty((len(ids) // 2 + 1, matrix.shape[1]), np.float32)])
+            matrix[len(ids)] = vector
+            ids.append(sku_id)
+        if matrix is not None and len(ids) > start:
+            block = matrix[start:len(ids)]
+            norms = np.linalg.norm(block, axis=1, keepdims=True)
+            np.divide(block, norms, out=block, where=norms > 0)
+    if skipped:
+        logger.warning(f"Skipping {skipped} SKU vectors with mismatched dims")
+    if matrix is None:
+        return [], np.zeros((0, 0), dtype=np.float32)
+    return ids, matrix[:len(ids)]
+
+
+def get_index(path=NEAR_DUP_INDEX_PATH):
+    """The saved index, reloaded when the nightly job replaces the file. None if not built yet."""
+    global _loaded
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _loaded_lock:
+        if _loaded is None or _loaded[0] != mtime:
+            _loaded = (mtime, LSHIndex.load(path))
+        return _loaded[1]
+
+
+def query_near_duplicates(db, vector, k=10, threshold=NEAR_DUP_THRESHOLD, exclude_sku_id=None):
+    """
+    Top-k SKUs whose stored vector has cosine >= threshold with `vector`, using the saved LSH index for
+    candidates and MySQL for their vectors. At most k x CANDIDATE_FACTOR candidates are fetched, those
+    sharing a bucket in the most tables. Returns None when no index has been built yet.
+    """
+    index = get_index()
+    if index is None:
+        return None
+    unit = normalize_rows(np.atleast_2d(vector))
+    limit = max(1, k) * CANDIDATE_FACTOR + (exclude_sku_id is not None)
+    candidate_ids = [index.ids[i] for i in index.candidates(unit, limit)]
+    candidate_ids = [sku_id for sku_id in candidate_ids if sku_id != exclude_sku_id]
+    if not candidate_ids:
+        return []
+    cur = db.cursor()
+    try:
+        cur.execute(
+            f"""
+            SELECT sv.sku_id, s.sku_code, sv.vector_blob, sv.vector
+            FROM sku_vectors sv
+            JOIN skus s ON s.id = sv.sku_id
+            WHERE sv.sku_id IN ({','.join(['%s'] * len(candidate_ids))})
+            """,
+            tuple(candidate_ids),
+        )
+        rows = cur.fetchall()
+    finally:
+        cur.close()
+    matches = []
+    for sku_id, sku_code, blob, legacy in rows:
+        stored = decode_row(blob, legacy)
+        if stored is None or stored.shape[0] != unit.shape[1]:
+            continue
+        similarity = float(normalize_rows(np.atleast_2d(stored))[0] @ unit[0])
+        if similarity >= threshold:
+            matches.append({'sku_id': sku_id, 'sku_code': sku_code, 'similarity': round(similarity, 4)})
+    matches.sort(key=lambda m: m['similarity'], reverse=True)
+    return matches[:k]
+
+
+def stored_near_duplicates(db, sku_id, k=10):
+    """Pairs recorded for `sku_id` by the last nightly scan, most similar first."""
+    cur = db.cursor()
+    try:
+        cur.execute(
+            """
+            SELECT s.id, s.sku_code, d.similarity
+            FROM sku_near_duplicates d
+            JOIN skus s ON s.id = IF(d.sku_id = %s, d.duplicate_sku_id, d.sku_id)
+            WHERE d.sku_id = %s OR d.duplicate_sku_id = %s
+            ORDER BY d.similarity DESC
+            LIMIT %s
+            """,
+            (sku_id, sku_id, sku_id, k),
+        )
+        rows = cur.fetchall()
+    finally:
+        cur.close()
+    return [{'sku_id': r[0], 'sku_code': r[1], 'similarity': float(r[2])} for r in rows]
@@ -1,4 +1,7 @@
 import logging
+
+import numpy as np
+
 from . import cluster_cache
 from . import embedding
 
@@ -6,44 +9,37 @@ logger = logging.getLogger(__name__)
 SIMILARITY_THRESHOLD = 0.72
 
 
-def validate_cluster_match(request_vector, cluster_id):
-    """
-    Validate request vector against cluster centroid.
-    Fails soft if embedding API times out (allows request through with warning).
-    """
-    # Check if cluster vector exists
-    cluster_vec = cluster_cache.get_cluster_vector(cluster_id)
-    if not cluster_vec:
-        logger.warning(f"Cluster {cluster_id} vectors not initialized")
-        return {
-            'valid': False,
-            'similarity': 0.0,
-            'reason': f'Cluster {cluster_id} vectors not initialized. Run cluster embedding initialization first.'
-        }
-    
-    # Fail-soft: if request vector is None (embedding timeout), allow through
-    if request_vector is None:
-        logger.warning(f"Request embedding failed (timeout) - bypassing validation (fail-soft)")
-        return {
-            'valid': True,  # ALLOW REQUEST (fail-soft)
-            'similarity': None,
-            'reason': 'Embedding API timeout - validation bypassed (fail-soft mode)'
-        }
-    
-    # Compute similarity
-    try:
-        similarity = embedding.cosine_similarity(request_vector, cluster_vec)
-    except Exception as e:
-        logger.error(f"Cosine similarity computation failed: {e}")
-        return {
-            'valid': False,
-            'similarity': 0.0,
-            'reason': f'Similarity computation error: {str(e)}'
-        }
-    
+def _not_initialized_result(cluster_id):
+    logger.warning(f"Cluster {cluster_id} vectors not initialized")
+    return {
+        'valid': False,
+        'similarity': 0.0,
+        'reason': f'Cluster {cluster_id} vectors not initialized. Run cluster embedding initialization first.'
+    }
+
+
+def _bypassed_result():
+    logger.warning(f"Request embedding failed (timeout) - bypassing validation (fail-soft)")
+    return {
+        'valid': True,  # ALLOW REQUEST (fail-soft)
+        'similarity': None,
+        'reason': 'Embedding API timeout - validation bypassed (fail-soft mode)'
+    }
+
+
+def _similarity_error_result(e):
+    logger.error(f"Cosine similarity computation failed: {e}")
+    return {
+        'valid': False,
+        'similarity': 0.0,
+        'reason': f'Similarity computation error: {str(e)}'
+    }
+
+
+def _threshold_result(similarity, cluster_id):
     # Audit log (required by CIE v2.3.2)
     logger.info(f"AUDIT: cluster_id={cluster_id} similarity={similarity:.4f}")
-    
+
     # Check threshold
     if similarity < SIMILARITY_THRESHOLD:
         return {
@@ -55,5 +51,118 @@ def validate_cluster_match(request_vector, cluster_id):
                 f'Ensure request content aligns with cluster {cluster_id} intent.'
             )
         }
-    
-    return {'valid': True, 'similarity': similarity, 'reason': 'Passed validation'}
\ No newline at end of file
+
+    return {'valid': True, 'similarity': similarity, 'reason': 'Passed validation'}
+
+
+def validate_cluster_match(request_vector, cluster_id):
+    """
+    Validate request vector against cluster centroid.
+    Fails soft if embedding API times out (allows request through with warning).
+    """
+    # Check if cluster vector exists (pre-normalized in-process copy)
+    cluster_vec = cluster_cache.get_cluster_unit_vector(cluster_id)
+    return _score_match(request_vector, cluster_id, cluster_vec)
+
+
+async def avalidate_cluster_match(request_vector, cluster_id):
+    """Async form of validate_cluster_match (centroid lookup via the asyncio Redis client)."""
+    cluster_vec = await cluster_cache.aget_cluster_unit_vector(cluster_id)
+    return _score_match(request_vector, cluster_id, cluster_vec)
+
+
+def _score_match(request_vector, cluster_id, cluster_vec):
+    if cluster_vec is None:
+        return _not_initialized_result(cluster_id)
+
+    # Fail-soft: if request vector is None (embedding timeout), allow through
+    if request_vector is None:
+        return _bypassed_result()
+
+    # Compute similarity
+    try:
+        similarity = embedding.cosine_similarity_to_unit(request_vector, cluster_vec)
+    except Exception as e:
+        return _similarity_error_result(e)
+
+    return _threshold_result(similarity, cluster_id)
+
+
+def validate_cluster_matches(request_vectors, cluster_ids):
+    """
+    Batch form of validate_cluster_match: one result per (vector, cluster_id) pair, in order.
+    Centroids are loaded once per distinct cluster and each cluster's vectors are scored
+    with a single matrix-vector product. Per-item fail-soft semantics are unchanged.
+    """
+    centroids = cluster_cache.get_cluster_unit_vectors(cluster_ids)
+    return _score_matches(request_vectors, cluster_ids, centroids)
+
+
+async def avalidate_cluster_matches(request_vectors, cluster_ids):
+    """Async form of validate_cluster_matches."""
+    centroids = await cluster_cache.aget_cluster_unit_vectors(cluster_ids)
+    return _score_matches(request_vectors, cluster_ids, centroids)
+
+
+def _score_matches(request_vectors, cluster_ids, centroids):
+    results = [None] * len(request_vectors)
+    groups = {}
+    for i, (request_vector, cluster_id) in enumerate(zip(request_vectors, cluster_ids)):
+        if centroids.get(cluster_id) is None:
+            results[i] = _not_initialized_result(cluster_id)
+        elif request_vector is None:
+            results[i] = _bypassed_result()
+        else:
+            groups.setdefault(cluster_id, []).append(i)
+
+    for cluster_id, indices in groups.items():
+        try:
+            similarities = embedding.cosine_similarities_to_unit(
+                [request_vectors[i] for i in indices], centroids[cluster_id]
+            )
+        except Exception as e:
+            for i in indices:
+                results[i] = _similarity_error_result(e)
+            continue
+        for i, similarity in zip(indices, similarities):
+            results[i] = _threshold_result(float(similarity), cluster_id)
+
+    return results
+
+
+def nearest_clusters(request_vector, k=5):
+    """
+    Top-k most similar clusters for a request vector, from one product against the
+    all-clusters centroid matrix. Returns [{'cluster_id', 'similarity', 'passes_threshold'}], best first.
+    """
+    cluster_ids, matrix = cluster_cache.get_centroid_matrix()
+    return _top_k(request_vector, k, cluster_ids, matrix)
+
+
+async def anearest_clusters(request_vector, k=5):
+    """Async form of nearest_clusters."""
+    cluster_ids, matrix = await cluster_cache.aget_centroid_matrix()
+    return _top_k(request_vector, k, cluster_ids, matrix)
+
+
+def _top_k(request_vector, k, cluster_ids, matrix):
+    if not cluster_ids:
+        return []
+    # The centroid rows are unit length; normalize the request so the product is the cosine
+    v = np.asarray(request_vector, dtype=np.float32)
+    norm = float(np.linalg.norm(v))
+    if norm:
+        similarities = embedding.cosine_similarities_to_unit(matrix, v / norm)
+    else:
+        similarities = np.zeros(len(cluster_ids), dtype=np.float32)
+    k =max(1, min(k, len(cluster_ids)))
+    top = np.argpartition(-similarities, k - 1)[:k]
+    top = top[np.argsort(-similarities[top])]
+    return [
+        {
+            'cluster_id': cluster_ids[i],
+            'similarity': round(float(similarities[i]), 4),
+            'passes_threshold': bool(similarities[i] >= SIMILARITY_THRESHOLD),
+        }
+        for i in top
+    ]
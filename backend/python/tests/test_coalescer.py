@@ -0,0 +1,117 @@
+"""
+EmbeddingCoalescer: micro-batching, singleflight, and error fan-out (provider failure, missing vectors,
+open breaker, cancelled batch) with a stub provider.
+"""
+import asyncio
+
+import pytest
+
+from src.vector.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.vector.coalescer import EmbeddingCoalescer
+
+
+class StubProvider:
+    name = "stub"
+
+    def __init__(self, fail=None, drop=(), gate=None):
+        self.calls = []
+        self.fail = fail
+        self.drop = set(drop)
+        self.gate = gate
+
+    async def aembed(self, texts, model=None):
+        self.calls.append(list(texts))
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.fail is not None:
+            raise self.fail
+        return [None if t in self.drop else [float(len(t)), 1.0] for t in texts]
+
+
+def _coalescer(window_ms=20, max_batch=64, breaker=None):
+    return EmbeddingCoalescer(
+        asyncio.Semaphore(4), breaker or CircuitBreaker("test-coalescer", enabled=False), window_ms, max_batch
+    )
+
+
+async def _embed_all(coalescer, provider, texts):
+    return await asyncio.gather(
+        *(coalescer.embed(f"k:{t}", t, "m", provider) for t in texts), return_exceptions=True
+    )
+
+
+def test_concurrent_texts_share_one_call():
+    async def main():
+        coalescer, provider = _coalescer(), StubProvider()
+        results = await _embed_all(coalescer, provider, ["a", "bb", "ccc"])
+        assert provider.calls == [["a", "bb", "ccc"]]
+        assert results == [[1.0, 1.0], [2.0, 1.0], [3.0, 1.0]]
+        assert coalescer.stats()["batches"] == 1
+    asyncio.run(main())
+
+
+def test_max_batch_splits_calls():
+    async def main():
+        coalescer, provider = _coalescer(max_batch=2), StubProvider()
+        await _embed_all(coalescer, provider, ["a", "b", "c", "d", "e"])
+        assert sorted(len(call) for call in provider.calls) == [1, 2, 2]
+    asyncio.run(main())
+
+
+def test_identical_texts_in_flight_are_embedded_once():
+    async def main():
+        coalescer, provider = _coalescer(), StubProvider()
+        results = await _embed_all(coalescer, provider, ["same", "same", "same", "other"])
+        assert provider.calls == [["same", "other"]]
+        assert results[0] == results[1] == results[2] == [4.0, 1.0]
+        assert coalescer.shared == 2
+    asyncio.run(main())
+
+
+def test_provider_error_fans_out_and_releases_texts():
+    async def main():
+        coalescer, provider = _coalescer(), StubProvider(fail=ValueError("provider down"))
+        results = await _embed_all(coalescer, provider, ["a", "a", "b"])
+        assert all(isinstance(r, ValueError) for r in results)
+        assert coalescer._inflight == {}
+        provider.fail = None
+        assert await coalescer.embed("k:a", "a", "m", provider) == [1.0, 1.0]
+    asyncio.run(main())
+
+
+def test_missing_vector_fails_only_its_text():
+    async def main():
+        coalescer, provider = _coalescer(), StubProvider(drop={"b"})
+        ok, missing = await _embed_all(coalescer, provider, ["a", "b"])
+        assert ok == [1.0, 1.0]
+        assert isinstance(missing, RuntimeError)
+        assert coalescer._inflight == {}
+    asyncio.run(main())
+
+
+def test_open_breaker_fails_whole_batch():
+    async def main():
+        breaker = CircuitBreaker("test-coalescer-open", failure_threshold=1, open_seconds=60)
+        coalescer, provider = _coalescer(breaker=breaker), StubProvider(fail=ValueError("boom"))
+        await _embed_all(coalescer, provider, ["a"])
+        results = await _embed_all(coalescer, provider, ["b", "c"])
+        assert all(isinstance(r, CircuitOpenError) for r in results)
+        assert len(provider.calls) == 1
+    asyncio.run(main())
+
+
+def test_cancelled_batch_fails_waiters_instead_of_hanging():
+    async def main():
+        gate = asyncio.Event()
+        coalescer, provider = _coalescer(window_ms=0), StubProvider(gate=gate)
+        waiters = [asyncio.ensure_future(coalescer.embed("k:a", "a", "m", provider)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        assert provider.calls == [["a"]]
+        for task in list(coalescer._tasks):
+            task.cancel()
+        results = await asyncio.wait_for(asyncio.gather(*waiters, return_exceptions=True), timeout=1)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert coalescer._inflight == {}
+        gate.set()
+        assert await asyncio.wait_for(coalescer.embed("k:a", "a", "m", provider), timeout=1) == [1.0, 1.0]
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+"""
+Parity of the columnar gate engine (api.gates_frame) with run_all_gates over tier × intent × edge-case
+records, with and without a master cluster list.
+"""
+import itertools
+
+import numpy as np
+import pytest
+
+from api.gates_frame import FRAME_COLUMNS, GATE_ORDER, check_parity, failure_codes, frame_from_records, run_gates_frame
+from api.gates_validate import INTENT_KEYWORDS, run_all_gates
+from api.schemas_validate import VALID_PRIMARY_INTENTS, SkuValidateRequest
+
+MASTER_CLUSTER_IDS = {"CL-001", "CL-002"}
+
+TIERS = ["hero", "support", "harvest", "kill", "HERO ", " Harvest", "bogus", "", None]
+INTENTS = sorted(VALID_PRIMARY_INTENTS) + ["problem-solving", "SPECIFICATION", "Unknown Intent", "  ", "", None]
+
+
+def _answer(primary_intent, length=270):
+    norm = (primary_intent or "").strip().lower().replace(" ", "_").replace("-", "_")
+    keyword = INTENT_KEYWORDS.get(norm, norm.replace("_", "")[:6])
+    return (f"{keyword} " + "x" * length)[:length]
+
+
+def _others(primary_intent, n):
+    others = [i for i in sorted(VALID_PRIMARY_INTENTS) if i.lower() != (primary_intent or "").strip().lower()]
+    return others[:n]
+
+
+def _base(tier, primary_intent):
+    return {
+        "cluster_id": "CL-001",
+        "tier": tier,
+        "primary_intent": primary_intent,
+        "secondary_intents": _others(primary_intent, 1),
+        "answer_block": _answer(primary_intent),
+        "best_for": ["Living rooms", "Reading corners"],
+        "not_for": ["Bathrooms"],
+        "expert_authority": "Reviewed by a lighting designer.",
+    }
+
+
+EDGE_CASES = {
+    "complete": {},
+    "missing_fields": {"drop": FRAME_COLUMNS},
+    "empty_strings": {"cluster_id": "", "answer_block": "", "expert_authority": "", "primary_intent": ""},
+    "none_strings": {"cluster_id": None, "answer_block": None, "expert_authority": None},
+    "whitespace": {"cluster_id": "   ", "answer_block": "   ", "expert_authority": " \t"},
+    "unknown_cluster": {"cluster_id": "CL-999"},
+    "blank_list_entries": {"secondary_intents": ["", "  "], "best_for": ["", "Hallways"], "not_for": [" "]},
+    "empty_lists": {"secondary_intents": [], "best_for": [], "not_for": []},
+    "two_secondaries": {"secondaries": 2},
+    "three_secondaries": {"secondaries": 3},
+    "four_secondaries": {"secondaries": 4},
+    "secondary_matches_primary": {"secondary_matches_primary": True},
+    "invalid_secondary": {"secondary_intents": ["Not An Intent", "Comparison"]},
+    "answer_too_short": {"answer_length": 249},
+    "answer_at_bounds": {"answer_length": 250},
+    "answer_too_long": {"answer_length": 301},
+    "keyword_missing": {"answer_block": "y" * 270},
+}
+
+
+def _record(tier, primary_intent, case):
+    record = _base(tier, primary_intent)
+    spec = dict(EDGE_CASES[case])
+    for column in spec.pop("drop", []):
+        if column not in ("tier", "primary_intent"):
+            record.pop(column, None)
+    if "secondaries" in spec:
+        record["secondary_intents"] = _others(primary_intent, spec.pop("secondaries"))
+    if spec.pop("secondary_matches_primary", False):
+        record["secondary_intents"] = [primary_intent or "", *_others(primary_intent, 1)]
+    if "answer_length" in spec:
+        record["answer_block"] = _answer(primary_intent, spec.pop("answer_length"))
+    record.update(spec)
+    return record
+
+
+RECORDS = [_record(*combo) for combo in itertools.product(TIERS, INTENTS, EDGE_CASES)]
+
+
+@pytest.mark.parametrize("master_cluster_ids", [MASTER_CLUSTER_IDS, set()], ids=["master", "no_master"])
+def test_check_parity_over_tier_intent_edge_cases(master_cluster_ids):
+    assert check_parity(RECORDS, master_cluster_ids) == []
+
+
+def test_records_cover_every_gate():
+    frame = run_gates_frame(frame_from_records(RECORDS), MASTER_CLUSTER_IDS)
+    for gate in GATE_ORDER:
+        assert frame[gate].notna().any(), gate
+    assert frame[GATE_ORDER].isna().all(axis=1).any()
+
+
+def test_nan_and_none_cells_match_missing_values():
+    records = [_record(tier, intent, "complete") for tier, intent in itertools.product(TIERS, INTENTS)]
+    frame = frame_from_records(records)
+    for column in ("cluster_id", "answer_block", "expert_authority"):
+        frame[column] = np.nan
+    for column in ("secondary_intents", "best_for", "not_for"):
+        frame[column] = None
+    expected = []
+    for record in records:
+        missing = dict(record, cluster_id=None, answer_block=None, expert_authority=None,
+                       secondary_intents=[], best_for=[], not_for=[])
+        request = SkuValidateRequest.model_validate(missing)
+        expected.append([f.error_code for f in run_all_gates(request, MASTER_CLUSTER_IDS)])
+    assert failure_codes(run_gates_frame(frame, MASTER_CLUSTER_IDS)) == expected
+
+
+def test_matrix_keeps_frame_index():
+    frame = frame_from_records(RECORDS[:5])
+    frame.index = [10, 20, 30, 40, 50]
+    assert list(run_gates_frame(frame, MASTER_CLUSTER_IDS).index) == [10, 20, 30, 40, 50]
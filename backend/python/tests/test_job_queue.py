@@ -0,0 +1,125 @@
+"""
+Smoke tests for the job queue's Lua scripts (enqueue dedupe, claim order, finish / retry, lease loss)
+against fakeredis with Lua scripting.
+"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("lupa")
+fakeredis = pytest.importorskip("fakeredis")
+
+from src.utils import job_queue
+from src.utils.job_queue import JobQueue, audit_content_digest
+
+
+def _run(test):
+    async def main():
+        redis = fakeredis.FakeAsyncRedis()
+        try:
+            await test(JobQueue(redis, max_attempts=2, category_weights={"lamps": 2}), redis)
+        finally:
+            await redis.aclose()
+    asyncio.run(main())
+
+
+def test_same_digest_returns_existing_job():
+    async def check(queue, redis):
+        digest = audit_content_digest("Title", "Description")
+        first, created = await queue.enqueue("audit", {"sku_id": "SKU-1"}, sku_id="SKU-1", content_digest=digest)
+        again, created_again = await queue.enqueue("audit", {"sku_id": "SKU-1"}, sku_id="SKU-1", content_digest=digest)
+        assert created and not created_again
+        assert again == first
+        assert (await queue.lane_depths(["audit"]))["audit"]["normal"] == 1
+    _run(check)
+
+
+def test_new_digest_within_requeue_window_returns_existing_job():
+    async def check(queue, redis):
+        first, _ = await queue.enqueue("audit", {}, sku_id="SKU-1", content_digest=audit_content_digest("A", "x"))
+        again, created = await queue.enqueue("audit", {}, sku_id="SKU-1", content_digest=audit_content_digest("B", "x"))
+        assert (again, created) == (first, False)
+    _run(check)
+
+
+def test_new_digest_creates_job_outside_requeue_window(monkeypatch):
+    monkeypatch.setattr(job_queue, "JOB_REQUEUE_WINDOW_SECONDS", 0)
+
+    async def check(queue, redis):
+        first, _ = await queue.enqueue("audit", {}, sku_id="SKU-1", content_digest=audit_content_digest("A", "x"))
+        second, created = await queue.enqueue("audit", {}, sku_id="SKU-1", content_digest=audit_content_digest("B", "x"))
+        assert created and second != first
+        same, created_again = await queue.enqueue("audit", {}, sku_id="SKU-1", content_digest=audit_content_digest("A", "x"))
+        assert (same, created_again) == (first, False)
+    _run(check)
+
+
+def test_digest_defaults_to_payload_hash():
+    async def check(queue, redis):
+        first, _ = await queue.enqueue("brief", {"sku_id": "SKU-1", "k": 1}, sku_id="SKU-1")
+        again, created = await queue.enqueue("brief", {"k": 1, "sku_id": "SKU-1"}, sku_id="SKU-1")
+        assert (again, created) == (first, False)
+    _run(check)
+
+
+def test_claim_complete_and_dedupe_after_completion():
+    async def check(queue, redis):
+        job_id, _ = await queue.enqueue("audit", {"sku_id": "SKU-1"}, sku_id="SKU-1", content_digest="d1")
+        job = await queue.claim(["audit"])
+        assert job["id"] == job_id and job["status"] == "running" and job["attempts"] == 1
+        assert await queue.claim(["audit"]) is None
+        assert await queue.complete(job, {"score": 90})
+        stored = await queue.get(job_id)
+        assert stored["status"] == "completed" and stored["result"] == {"score": 90}
+        assert await queue.enqueue("audit", {"sku_id": "SKU-1"}, sku_id="SKU-1", content_digest="d1") == (job_id, False)
+    _run(check)
+
+
+def test_failed_job_retries_then_stops_blocking_enqueue():
+    async def check(queue, redis):
+        job_id, _ = await queue.enqueue("audit", {}, sku_id="SKU-1", content_digest="d1")
+        assert await queue.fail(await queue.claim(["audit"]), "boom") == "queued"
+        retried = await queue.claim(["audit"])
+        assert retried["id"] == job_id and retried["attempts"] == 2
+        assert await queue.fail(retried, "boom again") == "failed"
+        assert (await queue.get(job_id))["status"] == "failed"
+        new_id, created = await queue.enqueue("audit", {}, sku_id="SKU-1", content_digest="d1")
+        assert created and new_id != job_id
+    _run(check)
+
+
+def test_lanes_claimed_in_priority_order():
+    async def check(queue, redis):
+        bulk, _ = await queue.enqueue("audit", {}, lane="bulk")
+        normal, _ = await queue.enqueue("audit", {}, lane="normal")
+        urgent, _ = await queue.enqueue("audit", {}, lane="urgent")
+        claimed = [(await queue.claim(["audit"]))["id"] for _ in range(3)]
+        assert claimed == [urgent, normal, bulk]
+        with pytest.raises(ValueError):
+            await queue.enqueue("audit", {}, lane="someday")
+    _run(check)
+
+
+def test_categories_share_a_lane_by_weight():
+    async def check(queue, redis):
+        for i in range(4):
+            await queue.enqueue("audit", {"n": i}, category="lamps")
+            await queue.enqueue("audit", {"n": i}, category="shades")
+        order = [(await queue.claim(["audit"]))["category"] for _ in range(6)]
+        assert order.count("lamps") == 4 and order.count("shades") == 2
+    _run(check)
+
+
+def test_late_ack_after_requeue_is_ignored():
+    async def check(queue, redis):
+        queue.visibility_timeout = -1
+        job_id, _ = await queue.enqueue("audit", {})
+        stale = await queue.claim(["audit"])
+        assert await queue.requeue_expired() == 1
+        assert (await queue.get(job_id))["status"] == "queued"
+        queue.visibility_timeout = 300
+        fresh = await queue.claim(["audit"])
+        assert not await queue.complete(stale, {"late": True})
+        assert await queue.complete(fresh, {"late": False})
+        assert (await queue.get(job_id))["result"] == {"late": False}
+    _run(check)
@@ -0,0 +1,149 @@
+"""
+LSH near-duplicate scan (find_pairs) against brute force, oversized template buckets, and streaming
+sku_vectors rows into the scan matrix.
+"""
+import numpy as np
+import pytest
+
+from src.vector import near_duplicates
+from src.vector.codec import encode
+from src.vector.near_duplicates import LSHIndex, find_pairs, load_sku_vectors, normalize_rows
+
+THRESHOLD = 0.9
+
+
+def _catalog(rng, bases=40, variants=5, dims=48, noise=0.05):
+    """Clusters of near-identical variants around random base vectors."""
+    base = rng.normal(size=(bases, dims))
+    rows = np.repeat(base, variants, axis=0) + noise * rng.normal(size=(bases * variants, dims))
+    return normalize_rows(rows)
+
+
+def _bucket_pairs(index, matrix, threshold):
+    """Brute force: every pair sharing a bucket in some table, at or above threshold."""
+    sims = matrix @ matrix.T
+    shared = (index.signatures[:, None, :] == index.signatures[None, :, :]).any(axis=2)
+    i, j = np.nonzero(np.triu(shared & (sims >= threshold), k=1))
+    return {(int(a), int(b)): float(sims[a, b]) for a, b in zip(i, j)}
+
+
+def test_find_pairs_matches_brute_force_once_per_pair():
+    rng = np.random.default_rng(1)
+    matrix = _catalog(rng)
+    index = LSHIndex.create(matrix.shape[1], bits=6, tables=8).build(range(len(matrix)), matrix)
+    pairs = find_pairs(index, matrix, THRESHOLD)
+    found = {(i, j): sim for i, j, sim in pairs}
+    assert len(found) == len(pairs)
+    assert all(i < j for i, j in found)
+    expected = _bucket_pairs(index, matrix, THRESHOLD)
+    assert expected and found.keys() == expected.keys()
+    for pair, sim in found.items():
+        assert sim == pytest.approx(expected[pair], abs=1e-5)
+
+
+def test_oversized_bucket_is_scanned_once_and_capped(monkeypatch):
+    monkeypatch.setattr(near_duplicates, "MAX_BUCKET", 50)
+    rng = np.random.default_rng(2)
+    template = rng.normal(size=48)
+    matrix = normalize_rows(template + 1e-4 * rng.normal(size=(400, 48)))
+    index = LSHIndex.create(48, bits=8, tables=16).build(range(len(matrix)), matrix)
+    calls = []
+    score_group = near_duplicates._score_group
+    monkeypatch.setattr(
+        near_duplicates, "_score_group", lambda *args, **kw: calls.append(len(args[4])) or score_group(*args, **kw)
+    )
+    pairs = find_pairs(index, matrix, THRESHOLD)
+    assert sum(calls) <= len(matrix)
+    keys = {(i, j) for i, j, _ in pairs}
+    assert len(keys) == len(pairs)
+    assert all(0 < j - i <= 50 for i, j in keys)
+    assert len(pairs) == sum(min(50, len(matrix) - 1 - i) for i in range(len(matrix)))
+
+
+class _Cursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.result = []
+
+    def execute(self, sql):
+        self.result = [(len(self.rows),)] if "COUNT" in sql else list(self.rows)
+
+    def fetchone(self):
+        return self.result.pop(0)
+
+    def fetchmany(self, size):
+        chunk, self.result = self.result[:size], self.result[size:]
+        return chunk
+
+
+def test_load_sku_vectors_streams_into_one_unit_matrix():
+    rng = np.random.default_rng(3)
+    vectors = rng.normal(size=(7, 16)).astype(np.float32) * 3
+    rows = [(f"SKU-{i}", encode(v), None) for i, v in enumerate(vectors)]
+    rows.insert(2, ("SKU-empty", None, None))
+    rows.insert(4, ("SKU-short", encode(np.ones(8, dtype=np.float32)), None))
+    ids, matrix = load_sku_vectors(_Cursor(rows), batch_size=3)
+    assert ids == [f"SKU-{i}" for i in range(7)]
+    assert matrix.dtype == np.float32 and matrix.shape == (7, 16)
+    np.testing.assert_allclose(matrix, normalize_rows(vectors), atol=1e-6)
+
+
+class _GrowingCursor(_Cursor):
+    """Rows inserted between the COUNT and the streaming SELECT."""
+
+    def execute(self, sql):
+        super().execute(sql)
+        if "COUNT" in sql:
+            self.result = [(2,)]
+
+
+def test_load_sku_vectors_grows_past_the_count():
+    cursor = _GrowingCursor([(f"SKU-{i}", encode(np.full(4, i + 1, dtype=np.float32)), None) for i in range(5)])
+    ids, matrix = load_sku_vectors(cursor, batch_size=2)
+    assert ids == [f"SKU-{i}" for i in range(5)] and matrix.shape == (5, 4)
+    np.testing.assert_allclose(np.linalg.norm(matrix, axis=1), 1.0, rtol=1e-6)
+
+
+def test_candidates_rank_by_shared_tables_and_cap():
+    rng = np.random.default_rng(4)
+    matrix = _catalog(rng, bases=10, variants=30, noise=0.3)
+    index = LSHIndex.create(matrix.shape[1], bits=4, tables=8).build(range(len(matrix)), matrix)
+    query = matrix[:1]
+    every = index.candidates(query)
+    shared = (index.signatures == index.signatures_for(query)[0]).sum(axis=1)
+    assert sorted(every) == np.flatnonzero(shared).tolist()
+    assert [shared[r] for r in every] == sorted((shared[r] for r in every), reverse=True)
+    assert index.candidates(query, 5) == every[:5]
+
+
+class _Db:
+    def __init__(self, rows):
+        self.rows = rows
+        self.params = None
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params):
+        self.params = params
+
+    def fetchall(self):
+        return [row for row in self.rows if row[0] in self.params]
+
+    def close(self):
+        pass
+
+
+def test_query_near_duplicates_fetches_capped_candidates(monkeypatch):
+    rng = np.random.default_rng(5)
+    template = rng.normal(size=48)
+    matrix = normalize_rows(template + 1e-3 * rng.normal(size=(500, 48)))
+    ids = [f"SKU-{i}" for i in range(len(matrix))]
+    index = LSHIndex.create(48, bits=8, tables=16).build(ids, matrix)
+    monkeypatch.setattr(near_duplicates, "get_index", lambda: index)
+    monkeypatch.setattr(near_duplicates, "CANDIDATE_FACTOR", 4)
+    db = _Db([(sku_id, sku_id.lower(), encode(v), None) for sku_id, v in zip(ids, matrix)])
+    matches = near_duplicates.query_near_duplicates(db, matrix[0], k=5, threshold=THRESHOLD, exclude_sku_id="SKU-0")
+    assert len(db.params) <= 5 * 4 and "SKU-0" not in db.params
+    assert len(matches) == 5
+    assert all(m["similarity"] >= THRESHOLD for m in matches)
@@ -0,0 +1,109 @@
+"""
+Bulk title validation (validate_titles) against per-title validate_title, and the compiled rule set
+against the plain keyword tables it is built from.
+"""
+import itertools
+
+import pytest
+
+from src.title.validation import (
+    INTENT_TITLE_KEYWORDS,
+    _get_intent_keywords,
+    reload_title_rules,
+    title_rules,
+    validate_title,
+    validate_titles,
+)
+
+INTENTS = [
+    "Problem Solving", "problem-solving", "Comparison", "Compatibility", "Specification", "Installation",
+    "Troubleshooting", "Inspiration", "Regulatory", "Replacement", "REPLACEMENT ", "Unknown", "", None,
+]
+TITLES = [
+    "Warm Glare-Free Lighting for Living Rooms | 30cm Taupe Drum Shade E27",
+    "How to Replace a Pendant Shade | Fabric Drum 40cm",
+    "Compare Drum Shades vs Empire Shades | 35cm Linen",
+    "Compatible Ceiling Rose for E27 | White Plastic",
+    "Bathroom Safe IP44 Rated Light | Chrome 4W",
+    "Fix Flickering Lights | Dimmer Module",
+    "Modern Style Ideas for Kitchen | Brass Pendant",
+    "Blue Fabric Shade | 30cm",
+    "30cm Drum Shade | Grey Linen",
+    "4W LED Bulb | Warm White",
+    "Acme Lighting Solution | Pendant",
+    "No pipe in this title at all",
+    "| Attributes only",
+    "Intent only |",
+    "Lighting for low ceilings | " + "x" * 240,
+    "   ",
+    "",
+    None,
+]
+BRAND_PREFIXES = [None, set(), {"acme"}, {"blue", "warm"}]
+
+
+def _items():
+    return [
+        {"title": title, "primary_intent": intent, "cluster_id": "CL-001"}
+        for title, intent in itertools.product(TITLES, INTENTS)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_rules(monkeypatch):
+    monkeypatch.delenv("CIE_TITLE_BRAND_PREFIXES", raising=False)
+    reload_title_rules()
+    yield
+    monkeypatch.delenv("CIE_TITLE_BRAND_PREFIXES", raising=False)
+    reload_title_rules()
+
+
+@pytest.mark.parametrize("brand_prefixes", BRAND_PREFIXES, ids=repr)
+def test_validate_titles_matches_validate_title(brand_prefixes):
+    items = _items()
+    expected = [
+        validate_title(item["title"], item["primary_intent"], item["cluster_id"], brand_prefixes)
+        for item in items
+    ]
+    assert validate_titles(items, brand_prefixes) == expected
+
+
+def test_validate_titles_follows_brand_prefix_env(monkeypatch):
+    items = _items()
+    before = validate_titles(items)
+    monkeypatch.setenv("CIE_TITLE_BRAND_PREFIXES", "Acme, Warm")
+    after = validate_titles(items)
+    assert title_rules().brand_prefixes == {"acme", "warm"}
+    assert after == [
+        validate_title(item["title"], item["primary_intent"], item["cluster_id"]) for item in items
+    ]
+    assert after != before
+
+
+def test_validate_titles_preserves_order_and_length():
+    assert validate_titles([]) == []
+    items = _items()
+    results = validate_titles(reversed(items))
+    assert len(results) == len(items)
+    assert results[0] == validate_title(items[-1]["title"], items[-1]["primary_intent"], "CL-001")
+
+
+def test_intent_patterns_match_keyword_substrings():
+    texts = [t.split("|", 1)[0].strip().lower() for t in TITLES if t] + [
+        kw for keywords in INTENT_TITLE_KEYWORDS.values() for kw in keywords
+    ]
+    rules = title_rules()
+    for intent in INTENTS:
+        keywords = _get_intent_keywords(intent or "")
+        pattern = rules.intent_pattern(intent or "")
+        for text in texts:
+            found = pattern.search(text) is not None if pattern else False
+            assert found == any(kw in text for kw in keywords), (intent, text)
+
+
+def test_reload_title_rules_picks_up_table_changes(monkeypatch):
+    monkeypatch.setitem(INTENT_TITLE_KEYWORDS, "comparison", ["head-to-head"])
+    assert title_rules().intent_pattern("Comparison").search("head-to-head") is None
+    assert reload_title_rules().intent_pattern("Comparison").search("head-to-head") is not None
+    monkeypatch.undo()
+    assert reload_title_rules().intent_pattern("Comparison").search("compare") is not None
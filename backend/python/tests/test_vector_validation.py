@@ -0,0 +1,48 @@
+"""
+Top-k cluster ranking (nearest_clusters) against the in-process centroid matrix.
+"""
+import numpy as np
+import pytest
+
+from src.vector import cluster_cache, validation
+from src.vector.validation import SIMILARITY_THRESHOLD, nearest_clusters
+
+
+def _unit_rows(rows):
+    m = np.asarray(rows, dtype=np.float32)
+    return m / np.linalg.norm(m, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def centroids(monkeypatch):
+    rng = np.random.default_rng(7)
+    cluster_ids = [f"CL-{i:03d}" for i in range(20)]
+    matrix = _unit_rows(rng.normal(size=(20, 32)))
+    monkeypatch.setattr(cluster_cache, "get_centroid_matrix", lambda: (cluster_ids, matrix))
+    return cluster_ids, matrix
+
+
+def test_similarities_do_not_depend_on_query_length(centroids):
+    cluster_ids, matrix = centroids
+    query = matrix[3] + 0.1 * matrix[5]
+    base = nearest_clusters(query, k=5)
+    for scale in (2.0, 0.5, 37.0):
+        assert nearest_clusters(query * scale, k=5) == base
+
+
+def test_similarity_is_cosine_and_threshold_uses_it(centroids):
+    cluster_ids, matrix = centroids
+    top = nearest_clusters(matrix[3] * 4.0, k=3)
+    assert top[0]["cluster_id"] == "CL-003"
+    assert top[0]["similarity"] == pytest.approx(1.0, abs=1e-4)
+    assert top[0]["passes_threshold"]
+    expected = matrix @ matrix[3]
+    for item in top:
+        i = cluster_ids.index(item["cluster_id"])
+        assert item["similarity"] == pytest.approx(float(expected[i]), abs=1e-4)
+        assert item["passes_threshold"] == bool(expected[i] >= SIMILARITY_THRESHOLD)
+
+
+def test_zero_query_and_empty_matrix(centroids):
+    assert all(item["similarity"] == 0.0 for item in nearest_clusters(np.zeros(32), k=3))
+    assert validation._top_k([1.0, 0.0], 5, [], np.zeros((0, 2), dtype=np.float32)) == []
@@ -0,0 +1,10 @@
+-- CIE: centroid rebuild pipeline (backend/python/src/jobs/centroid_rebuild.py)
+-- version matches the Redis centroid version stamp; member_count / built_at drive incremental rebuilds.
+
+ALTER TABLE cluster_vectors
+  ADD COLUMN version BIGINT NOT NULL DEFAULT 0 AFTER vector,
+  ADD COLUMN member_count INT NOT NULL DEFAULT 0 AFTER version,
+  ADD COLUMN built_at TIMESTAMP NULL AFTER member_count;
+
+ALTER TABLE sku_vectors
+  ADD INDEX idx_sku_vectors_updated_at (updated_at);
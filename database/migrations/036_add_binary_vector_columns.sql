@@ -0,0 +1,12 @@
+-- CIE: compact binary vector storage (backend/python/src/vector/codec.py)
+-- vector_blob holds header + packed float32/float16 (~6 KB for 1536 dims vs ~30 KB as JSON).
+-- Existing rows are converted by backend/python/src/jobs/vector_storage_migration.py, which clears
+-- the JSON column; readers fall back to vector while vector_blob is NULL.
+
+ALTER TABLE sku_vectors
+  ADD COLUMN vector_blob MEDIUMBLOB NULL AFTER vector,
+  MODIFY COLUMN vector JSON NULL;
+
+ALTER TABLE cluster_vectors
+  ADD COLUMN vector_blob MEDIUMBLOB NULL AFTER vector,
+  MODIFY COLUMN vector JSON NULL;
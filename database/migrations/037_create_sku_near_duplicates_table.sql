@@ -0,0 +1,14 @@
+-- CIE: near-duplicate SKU descriptions (backend/python/src/jobs/near_duplicate_scan.py)
+-- Replaced wholesale by each nightly scan; one row per pair (either SKU may appear in either column).
+
+CREATE TABLE sku_near_duplicates (
+ id BIGINT AUTO_INCREMENT PRIMARY KEY,
+ sku_id CHAR(36) NOT NULL,
+ duplicate_sku_id CHAR(36) NOT NULL,
+ similarity DECIMAL(5,4) NOT NULL,
+ detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+ FOREIGN KEY (sku_id) REFERENCES skus(id) ON DELETE CASCADE,
+ FOREIGN KEY (duplicate_sku_id) REFERENCES skus(id) ON DELETE CASCADE,
+ INDEX idx_sku_near_duplicates_sku (sku_id),
+ INDEX idx_sku_near_duplicates_duplicate (duplicate_sku_id)
+);
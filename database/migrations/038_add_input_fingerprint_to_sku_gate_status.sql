@@ -0,0 +1,7 @@
+-- CIE: incremental gate evaluation (backend/python/api/gates_validate.py evaluate_gates)
+-- input_fingerprint hashes the fields a gate read when it produced this row's outcome; a save whose
+-- fingerprint matches reuses the stored outcome instead of re-running the gate.
+
+ALTER TABLE sku_gate_status
+ADD COLUMN user_message VARCHAR(500) NULL AFTER error_message,
+ADD COLUMN input_fingerprint CHAR(64) NULL AFTER user_message;
@@ -1,2 +1,2 @@
 #!/bin/bash
-python3 backend/python/src/jobs/vector_retry_queue.py
+cd backend/python && python3 -m src.jobs.vector_retry_queue
@@ -0,0 +1,2 @@
+#!/bin/bash
+cd backend/python && python3 -m src.jobs.centroid_rebuild --mode "${1:-incremental}"
@@ -0,0 +1,2 @@
+#!/bin/bash
+cd backend/python && python3 -m src.jobs.gate_compliance_report "$@"
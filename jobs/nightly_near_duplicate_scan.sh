@@ -0,0 +1,2 @@
+#!/bin/bash
+cd backend/python && python3 -m src.jobs.near_duplicate_scan "$@"